@@ -183,4 +183,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # Download workers are spawned processes; required for frozen builds
+    import multiprocessing
+
+    multiprocessing.freeze_support()
     main()
@@ -1,11 +1,14 @@
 """Models exposed by the Nobody package."""
 
 from .settings import AppSettings
+from .formats import FormatRecord, SearchResult
 from .queue import DownloadQueue, QueueItem, DownloadStatus
 from .bookmarks import BookmarkManager, Bookmark
 
 __all__ = [
     "AppSettings",
+    "FormatRecord",
+    "SearchResult",
     "DownloadQueue",
     "QueueItem",
     "DownloadStatus",
@@ -0,0 +1,178 @@
+"""Persistent record of completed downloads used to skip repeats."""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from ..utils.cache import resolve_writable_cache_dir
+from ..utils.logging import logger
+
+# Completed downloads within this many seconds are saved together
+SAVE_DELAY = 1.0
+# Output of an MP3-conversion record under the "original" audio policy
+ORIGINAL_AUDIO_OUTPUT = "original-audio"
+
+
+def archive_output(conversion: Optional[str], audio_output_policy: str = "mp3") -> Optional[str]:
+    """Return what a download actually produces, for use in archive keys.
+
+    An MP3-conversion record only yields an MP3 under the "mp3" policy;
+    under "original" the source audio is remuxed, which must not satisfy a
+    later request for a real MP3.
+    """
+    if conversion == "mp3" and audio_output_policy == "original":
+        return ORIGINAL_AUDIO_OUTPUT
+    return conversion or None
+
+
+class DownloadArchive:
+    """Map ``"<extractor> <id> <format>[ <output>]"`` to the file it produced.
+
+    Keys use the same layout as yt_dlp's ``--download-archive`` (plus the
+    format and the effective output, see archive_output()), so a URL can be
+    looked up offline via canonical_video_id(). An entry only counts while
+    its file still exists on disk. Additions are saved in the background,
+    batched over SAVE_DELAY; call flush() before exiting.
+    """
+
+    def __init__(self, path: Optional[str] = None, save_delay: float = SAVE_DELAY):
+        """Load the archive.
+
+        Args:
+            path: JSON file; defaults to the application cache directory
+            save_delay: Seconds to collect additions before saving them
+        """
+        self.path = path or self._get_archive_file_path()
+        self.save_delay = save_delay
+        self.entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self.load()
+
+    def _get_archive_file_path(self) -> str:
+        """Return the filesystem path for the archive JSON file."""
+        cache_dir = resolve_writable_cache_dir("Nobody 3")
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir, exist_ok=True)
+        return os.path.join(cache_dir, "download_archive.json")
+
+    @staticmethod
+    def make_key(video_key: str, format_id: str, output: Optional[str] = None) -> str:
+        """Return the archive key for a video/format pair."""
+        key = f"{video_key} {format_id}"
+        return f"{key} {output}" if output else key
+
+    def load(self) -> None:
+        """Load entries from disk."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f).get("entries", {})
+            with self._lock:
+                self.entries = entries
+        except (OSError, ValueError, AttributeError) as exc:
+            logger.error(f"Failed to load download archive: {exc}")
+
+    def find(self, url: str, format_id: str, output: Optional[str] = None) -> Optional[Dict]:
+        """Return the entry for ``url`` if its file is still present.
+
+        Uses only local extractor matching; no network access.
+
+        Args:
+            url: Video page URL
+            format_id: Selected format ID
+            output: Effective output from archive_output(), if converted
+
+        Returns:
+            Entry dict with ``path``, ``size`` and ``title``, or None
+        """
+        # Imported here: utils.metadata_cache depends on models.formats
+        from ..utils.metadata_cache import canonical_video_id
+
+        video_key = canonical_video_id(url)
+        if not video_key:
+            return None
+        with self._lock:
+            entry = self.entries.get(self.make_key(video_key, format_id, output))
+        path = (entry or {}).get("path") or ""
+        if output == "mp3" and not path.lower().endswith(".mp3"):
+            # Older archives recorded remuxed audio under the MP3 key
+            return None
+        if os.path.exists(path):
+            return entry
+        return None
+
+    def add(
+        self,
+        video_key: Optional[str],
+        format_id: str,
+        path: str,
+        title: str = "",
+        size: Optional[int] = None,
+        output: Optional[str] = None,
+    ) -> None:
+        """Record a completed download and schedule a save.
+
+        Args:
+            video_key: Canonical ``"<extractor> <id>"`` key
+            format_id: Downloaded format ID
+            path: Final output path
+            title: Video title
+            size: File size in bytes
+            output: Effective output from archive_output(), if converted
+        """
+        if not video_key or not path:
+            return
+        with self._lock:
+            self.entries[self.make_key(video_key, format_id, output)] = {
+                "path": path,
+                "size": size,
+                "title": title,
+                "completed_at": time.time(),
+            }
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self) -> None:
+        """Save pending additions now."""
+        with self._flush_lock:
+            with self._lock:
+                timer, self._save_timer = self._save_timer, None
+                if not self._dirty:
+                    return
+                self._dirty = False
+                data = {"version": 1, "entries": dict(self.entries)}
+            if timer is not None:
+                timer.cancel()
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except (OSError, TypeError, ValueError) as exc:
+                logger.warning(f"Failed to save download archive: {exc}")
+
+    def __len__(self):
+        with self._lock:
+            return len(self.entries)
+
+
+_shared_archive: Optional[DownloadArchive] = None
+_shared_lock = threading.Lock()
+
+
+def get_download_archive() -> DownloadArchive:
+    """Return the process-wide download archive, loading it on first use."""
+    global _shared_archive
+    with _shared_lock:
+        if _shared_archive is None:
+            _shared_archive = DownloadArchive()
+        return _shared_archive
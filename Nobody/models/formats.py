@@ -0,0 +1,198 @@
+"""Structured format and search result records shared across the app."""
+
+from typing import Dict, List, NamedTuple, Optional
+
+
+class FormatRecord:
+    """Compact description of one downloadable format.
+
+    Records are created once by the Searcher and carried unchanged through
+    the table into the Downloader, so filtering and default selection can
+    compare fields instead of parsing display text.
+    """
+
+    __slots__ = (
+        "format_id",
+        "ext",
+        "type_label",
+        "width",
+        "height",
+        "fps",
+        "vcodec",
+        "acodec",
+        "vbr",
+        "abr",
+        "filesize",
+        "filesize_estimated",
+        "conversion",
+    )
+
+    def __init__(
+        self,
+        format_id: str,
+        ext: str = "",
+        type_label: str = "Unknown",
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        fps: Optional[float] = None,
+        vcodec: Optional[str] = None,
+        acodec: Optional[str] = None,
+        vbr: Optional[float] = None,
+        abr: Optional[float] = None,
+        filesize: int = 0,
+        filesize_estimated: bool = False,
+        conversion: Optional[str] = None,
+    ):
+        """Initialize record.
+
+        Args:
+            format_id: yt_dlp format selector passed to the downloader
+            ext: Container extension
+            type_label: "Video", "Video-only", "Audio-only" or "Unknown"
+            width: Frame width in pixels
+            height: Frame height in pixels
+            fps: Frame rate
+            vcodec: Video codec (None for audio-only)
+            acodec: Audio codec (None for video-only)
+            vbr: Video bitrate in kbit/s
+            abr: Audio bitrate in kbit/s
+            filesize: Size in bytes (0 if unknown)
+            filesize_estimated: True if filesize is derived from bitrate
+            conversion: Target codec when the download is post-processed
+                (e.g. "mp3"), None for a plain download
+        """
+        self.format_id = format_id
+        self.ext = ext
+        self.type_label = type_label
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.vcodec = vcodec
+        self.acodec = acodec
+        self.vbr = vbr
+        self.abr = abr
+        self.filesize = filesize
+        self.filesize_estimated = filesize_estimated
+        self.conversion = conversion
+
+    @classmethod
+    def from_yt_dlp(cls, fmt: Dict) -> Optional["FormatRecord"]:
+        """Build a record from a yt_dlp format dict.
+
+        Returns:
+            FormatRecord, or None for unusable entries (storyboards etc.)
+        """
+        format_id = fmt.get("format_id")
+        ext = fmt.get("ext")
+        if not format_id or not ext or "storyboard" in format_id.lower():
+            return None
+
+        vcodec = fmt.get("vcodec", "none")
+        acodec = fmt.get("acodec", "none")
+        if vcodec != "none" and acodec != "none":
+            type_label = "Video"
+        elif vcodec != "none":
+            type_label = "Video-only"
+        elif acodec != "none":
+            type_label = "Audio-only"
+        else:
+            type_label = "Unknown"
+
+        filesize = fmt.get("filesize") or 0
+        return cls(
+            format_id=format_id,
+            ext=ext,
+            type_label=type_label,
+            width=fmt.get("width"),
+            height=fmt.get("height"),
+            fps=fmt.get("fps"),
+            vcodec=None if vcodec == "none" else vcodec,
+            acodec=None if acodec == "none" else acodec,
+            vbr=fmt.get("vbr"),
+            abr=fmt.get("abr"),
+            filesize=filesize or fmt.get("filesize_approx") or 0,
+            filesize_estimated=not filesize and bool(fmt.get("filesize_approx")),
+        )
+
+    @property
+    def is_video(self) -> bool:
+        """True for formats carrying a video stream."""
+        return self.type_label in ("Video", "Video-only")
+
+    @property
+    def display_text(self) -> str:
+        """Human readable label used in the format dropdown."""
+        return self.display_label()
+
+    def display_label(self, audio_output_policy: str = "mp3") -> str:
+        """Return the dropdown label for the given audio output policy.
+
+        Under the "original" policy conversion records are only remuxed, so
+        they are labelled by the source codec instead of the conversion.
+        """
+        if self.conversion:
+            quality = f"A:{round(min(320, self.abr or 0))}k"
+            if self.conversion == "mp3" and audio_output_policy == "original":
+                return f"[{self.type_label}] Best audio (original codec / {quality}) - {self._size_text()}"
+            return (
+                f"[{self.type_label}] {self.conversion.upper()} bestaudio "
+                f"({self.conversion.upper()} Conversion / {quality}) - {self._size_text()}"
+            )
+        quality_desc = []
+        if self.is_video:
+            if self.width and self.height:
+                quality_desc.append(f"{self.width}x{self.height}")
+            if self.fps:
+                quality_desc.append(f"{self.fps}fps")
+            if self.vbr:
+                quality_desc.append(f"V:{round(self.vbr)}k")
+            elif self.type_label == "Video" and self.abr:
+                quality_desc.append(f"A:{round(self.abr)}k")
+        elif self.type_label == "Audio-only" and self.abr:
+            quality_desc.append(f"A:{round(self.abr)}k")
+        quality_str = " / ".join(quality_desc)
+        return (
+            f"[{self.type_label}] {self.ext.upper()} {self.format_id} "
+            f"({quality_str if quality_str else 'data'}) - {self._size_text()}"
+        )
+
+    def _size_text(self) -> str:
+        if self.filesize <= 0:
+            return "N/A"
+        prefix = "~" if self.filesize_estimated else ""
+        return f"{prefix}{self.filesize // 1024 // 1024}MB"
+
+    def to_dict(self) -> Dict:
+        """Convert to a JSON-serializable dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FormatRecord":
+        """Create from dictionary."""
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+    def __eq__(self, other):
+        if not isinstance(other, FormatRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"FormatRecord({self.format_id!r}, {self.type_label!r}, height={self.height}, filesize={self.filesize})"
+
+
+class SearchResult(NamedTuple):
+    """One table row produced by the Searcher.
+
+    ``formats`` is None for placeholder rows whose formats are resolved on
+    demand, and an empty list when nothing could be extracted.
+    """
+
+    title: str
+    thumbnail: str
+    webpage_url: str
+    formats: Optional[List[FormatRecord]]
+
+    @property
+    def is_placeholder(self) -> bool:
+        """True if the row's formats still have to be resolved."""
+        return self.formats is None
@@ -1,15 +1,31 @@
 """Download queue management."""
 
-from typing import List, Dict, Optional
+import bisect
+import json
+import os
+import threading
+from typing import Callable, List, Dict, Optional
 from enum import Enum
 from dataclasses import dataclass
 
+from ..utils.cache import resolve_writable_cache_dir
+from ..utils.logging import logger
+from .formats import FormatRecord
+
+# Items in these states are restored from the journal after a restart
+RESUMABLE_STATUSES = frozenset({"pending", "queued", "downloading", "processing", "paused"})
+# Items in these states never change again
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+# Changes within this many seconds are written to the journal together
+JOURNAL_FLUSH_DELAY = 0.5
+
 
 class DownloadStatus(Enum):
     """Download status enumeration."""
     PENDING = "pending"
     QUEUED = "queued"
     DOWNLOADING = "downloading"
+    PROCESSING = "processing"  # downloaded, waiting for/in the transcode stage
     PAUSED = "paused"
     COMPLETED = "completed"
     FAILED = "failed"
@@ -30,15 +46,196 @@ class QueueItem:
     eta: str = "N/A"
     file_path: Optional[str] = None
     file_size: Optional[int] = None
+    format_record: Optional[FormatRecord] = None
+    download_directory: Optional[str] = None
+    partial_path: Optional[str] = None  # yt_dlp .part file while downloading
+    attempts: int = 0  # throttled attempts, requeued by the engine
+    item_id: int = -1
+
+    @property
+    def finished(self) -> bool:
+        """True once the item completed, failed or was cancelled."""
+        return self.status.value in TERMINAL_STATUSES
+
+    def to_dict(self) -> Dict:
+        """Convert to a JSON-serializable dictionary for the journal."""
+        return {
+            "item_id": self.item_id,
+            "title": self.title,
+            "url": self.url,
+            "format_id": self.format_id,
+            "status": self.status.value,
+            "priority": self.priority,
+            "progress": self.progress,
+            "file_path": self.file_path,
+            "file_size": self.file_size,
+            "partial_path": self.partial_path,
+            "attempts": self.attempts,
+            "download_directory": self.download_directory,
+            "format_record": self.format_record.to_dict() if self.format_record else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "QueueItem":
+        """Create from a journal entry; the row is unknown until re-added."""
+        record = data.get("format_record")
+        return cls(
+            title=data["title"],
+            url=data["url"],
+            format_id=data["format_id"],
+            row_index=-1,
+            status=DownloadStatus(data.get("status", "pending")),
+            priority=data.get("priority", 0),
+            progress=data.get("progress", 0.0),
+            file_path=data.get("file_path"),
+            file_size=data.get("file_size"),
+            partial_path=data.get("partial_path"),
+            attempts=data.get("attempts", 0),
+            download_directory=data.get("download_directory"),
+            format_record=FormatRecord.from_dict(record) if record else None,
+            item_id=data.get("item_id", -1),
+        )
 
 
 class DownloadQueue:
-    """Manages download queue with priority and status tracking."""
+    """Manages download queue with priority and status tracking.
+
+    The queue is shared between the GUI thread and download workers, so
+    every method holds an internal lock. When a journal path is given,
+    structural and status changes mark the journal dirty and a background
+    timer writes unfinished items to disk atomically, once per burst of
+    changes, so an interrupted batch can be restored with load_journal().
+    Progress updates are never journaled. Call flush_journal() before
+    exiting.
+    """
+
+    def __init__(self, journal_path: Optional[str] = None, journal_delay: float = JOURNAL_FLUSH_DELAY):
+        """Initialize empty queue.
 
-    def __init__(self):
-        """Initialize empty queue."""
+        Args:
+            journal_path: JSON file to journal the queue to; None keeps the
+                queue in memory only
+            journal_delay: Seconds to collect changes before writing them
+        """
         self.items: List[QueueItem] = []
         self._next_id = 0
+        self._lock = threading.RLock()
+        self.journal_path = journal_path
+        self.journal_delay = journal_delay
+        self._journal_dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
+
+    @staticmethod
+    def default_journal_path() -> str:
+        """Return the journal location inside the app cache directory."""
+        cache_dir = resolve_writable_cache_dir("Nobody 3")
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir, exist_ok=True)
+        return os.path.join(cache_dir, "download_queue.json")
+
+    def load_journal(self) -> List[QueueItem]:
+        """Restore unfinished items from the journal.
+
+        Items that were downloading or transcoding when the app stopped are
+        queued again; yt_dlp continues them from their ``.part`` files (or
+        finds the finished download and hands it to the transcoder).
+
+        Returns:
+            Restored items, highest priority first
+        """
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return []
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            entries = [e for e in data.get("items", []) if e.get("status") in RESUMABLE_STATUSES]
+            restored = [QueueItem.from_dict(entry) for entry in entries]
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.error(f"Failed to load download queue journal: {exc}")
+            return []
+
+        with self._lock:
+            for item in restored:
+                if item.status in (DownloadStatus.DOWNLOADING, DownloadStatus.PROCESSING):
+                    item.status = DownloadStatus.QUEUED
+                item.item_id = self._next_id
+                self._next_id += 1
+                self.items.append(item)
+            self._sort_by_priority()
+            self._mark_journal_dirty()
+        resumable = sum(1 for item in restored if item.partial_path and os.path.exists(item.partial_path))
+        logger.info(
+            f"Restored {len(restored)} queued download(s) "
+            f"({resumable} with partial files to resume)"
+        )
+        return restored
+
+    def update_item(self, item: QueueItem, **changes) -> None:
+        """Set fields on ``item`` and journal the change.
+
+        Args:
+            item: Item owned by this queue
+            **changes: QueueItem attributes to set
+        """
+        with self._lock:
+            for name, value in changes.items():
+                setattr(item, name, value)
+            self._mark_journal_dirty()
+
+    def set_item_progress(
+        self, item: QueueItem, progress: float, speed: str = "N/A", eta: str = "N/A"
+    ) -> None:
+        """Record download progress on ``item`` (not journaled).
+
+        Args:
+            item: Item owned by this queue
+            progress: Progress percentage (0-100)
+            speed: Download speed string
+            eta: Estimated time remaining
+        """
+        with self._lock:
+            item.progress = progress
+            item.speed = speed
+            item.eta = eta
+
+    def flush_journal(self) -> None:
+        """Write pending changes to the journal now."""
+        if not self.journal_path:
+            return
+        # Serializes writers; the queue lock is only held for the snapshot
+        with self._flush_lock:
+            with self._lock:
+                timer, self._flush_timer = self._flush_timer, None
+                if not self._journal_dirty:
+                    return
+                self._journal_dirty = False
+                data = {
+                    "version": 1,
+                    "items": [item.to_dict() for item in self.items if not item.finished],
+                }
+            if timer is not None:
+                timer.cancel()
+            tmp_path = f"{self.journal_path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.journal_path)
+            except (OSError, TypeError, ValueError) as exc:
+                logger.warning(f"Failed to write download queue journal: {exc}")
+
+    def _mark_journal_dirty(self) -> None:
+        """Schedule a journal write for the current burst of changes."""
+        if not self.journal_path:
+            return
+        with self._lock:
+            self._journal_dirty = True
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.journal_delay, self.flush_journal)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
 
     def add_item(
         self,
@@ -46,7 +243,9 @@ class DownloadQueue:
         url: str,
         format_id: str,
         row_index: int,
-        priority: int = 0
+        priority: int = 0,
+        format_record: Optional[FormatRecord] = None,
+        download_directory: Optional[str] = None,
     ) -> QueueItem:
         """Add item to queue.
         
@@ -56,6 +255,8 @@ class DownloadQueue:
             format_id: Format identifier
             row_index: Table row index
             priority: Priority (higher = more priority)
+            format_record: Structured format selected in the table
+            download_directory: Target directory for this item
             
         Returns:
             Created QueueItem
@@ -66,10 +267,16 @@ class DownloadQueue:
             format_id=format_id,
             row_index=row_index,
             priority=priority,
-            status=DownloadStatus.PENDING
+            status=DownloadStatus.PENDING,
+            format_record=format_record,
+            download_directory=download_directory,
         )
-        self.items.append(item)
-        self._sort_by_priority()
+        with self._lock:
+            item.item_id = self._next_id
+            self._next_id += 1
+            self.items.append(item)
+            self._sort_by_priority()
+            self._mark_journal_dirty()
         return item
 
     def remove_item(self, row_index: int) -> bool:
@@ -81,37 +288,123 @@ class DownloadQueue:
         Returns:
             True if item was removed, False otherwise
         """
-        for i, item in enumerate(self.items):
-            if item.row_index == row_index:
-                self.items.pop(i)
-                return True
+        with self._lock:
+            for i, item in enumerate(self.items):
+                if item.row_index == row_index:
+                    self.items.pop(i)
+                    self._mark_journal_dirty()
+                    return True
         return False
 
     def get_item(self, row_index: int) -> Optional[QueueItem]:
-        """Get queue item by row index.
-        
+        """Get the unfinished queue item shown in a table row.
+
+        Finished items are skipped, so a row that was downloaded before and
+        queued again resolves to the new item.
+
         Args:
             row_index: Table row index
             
         Returns:
             QueueItem or None
         """
-        for item in self.items:
-            if item.row_index == row_index:
-                return item
+        with self._lock:
+            for item in self.items:
+                if item.row_index == row_index and not item.finished:
+                    return item
+        return None
+
+    def get_item_by_id(self, item_id: int) -> Optional[QueueItem]:
+        """Get queue item by its ``item_id``.
+
+        Args:
+            item_id: ID assigned by add_item() or load_journal()
+
+        Returns:
+            QueueItem or None
+        """
+        with self._lock:
+            for item in self.items:
+                if item.item_id == item_id:
+                    return item
         return None
 
+    def remove_rows(self, rows: List[int]) -> None:
+        """Follow table rows being removed.
+
+        Finished items on removed rows are dropped; unfinished ones (e.g.
+        a cancelled download whose process is still exiting) lose their
+        row. Items below a removed row move up with it.
+
+        Args:
+            rows: Removed table row indices
+        """
+        removed = sorted(set(rows))
+        if not removed:
+            return
+        with self._lock:
+            kept = []
+            for item in self.items:
+                if item.row_index in removed:
+                    if item.finished:
+                        continue
+                    item.row_index = -1
+                elif item.row_index >= 0:
+                    item.row_index -= bisect.bisect_left(removed, item.row_index)
+                kept.append(item)
+            self.items = kept
+            self._mark_journal_dirty()
+
     def get_next_item(self) -> Optional[QueueItem]:
         """Get next item to download (highest priority, pending/queued).
         
         Returns:
             Next QueueItem or None
         """
-        for item in self.items:
-            if item.status in (DownloadStatus.PENDING, DownloadStatus.QUEUED):
+        with self._lock:
+            for item in self.items:
+                if item.status in (DownloadStatus.PENDING, DownloadStatus.QUEUED):
+                    return item
+        return None
+
+    def claim_next_item(
+        self, admit: Optional[Callable[[QueueItem], bool]] = None
+    ) -> Optional[QueueItem]:
+        """Atomically take the next item and mark it as downloading.
+
+        Unlike get_next_item(), two workers calling this concurrently never
+        receive the same item.
+
+        Args:
+            admit: Optional check called (under the queue lock) for each
+                waiting item in priority order; items it rejects are left
+                waiting and the next one is tried
+
+        Returns:
+            Claimed QueueItem or None if nothing is waiting (or admitted)
+        """
+        with self._lock:
+            for item in self.items:
+                if item.status not in (DownloadStatus.PENDING, DownloadStatus.QUEUED):
+                    continue
+                if admit is not None and not admit(item):
+                    continue
+                item.status = DownloadStatus.DOWNLOADING
+                self._mark_journal_dirty()
                 return item
         return None
 
+    def has_active_item(self, url: str) -> bool:
+        """Return True if ``url`` is waiting, downloading or transcoding."""
+        active = (
+            DownloadStatus.PENDING,
+            DownloadStatus.QUEUED,
+            DownloadStatus.DOWNLOADING,
+            DownloadStatus.PROCESSING,
+        )
+        with self._lock:
+            return any(item.url == url and item.status in active for item in self.items)
+
     def update_item_status(
         self,
         row_index: int,
@@ -126,10 +419,12 @@ class DownloadQueue:
         Returns:
             True if updated, False otherwise
         """
-        item = self.get_item(row_index)
-        if item:
-            item.status = status
-            return True
+        with self._lock:
+            item = self.get_item(row_index)
+            if item:
+                item.status = status
+                self._mark_journal_dirty()
+                return True
         return False
 
     def update_item_progress(
@@ -150,12 +445,13 @@ class DownloadQueue:
         Returns:
             True if updated, False otherwise
         """
-        item = self.get_item(row_index)
-        if item:
-            item.progress = progress
-            item.speed = speed
-            item.eta = eta
-            return True
+        with self._lock:
+            item = self.get_item(row_index)
+            if item:
+                item.progress = progress
+                item.speed = speed
+                item.eta = eta
+                return True
         return False
 
     def set_priority(self, row_index: int, priority: int) -> bool:
@@ -168,11 +464,13 @@ class DownloadQueue:
         Returns:
             True if updated, False otherwise
         """
-        item = self.get_item(row_index)
-        if item:
-            item.priority = priority
-            self._sort_by_priority()
-            return True
+        with self._lock:
+            item = self.get_item(row_index)
+            if item:
+                item.priority = priority
+                self._sort_by_priority()
+                self._mark_journal_dirty()
+                return True
         return False
 
     def _sort_by_priority(self):
@@ -185,10 +483,11 @@ class DownloadQueue:
         Returns:
             Count of pending items
         """
-        return sum(
-            1 for item in self.items
-            if item.status in (DownloadStatus.PENDING, DownloadStatus.QUEUED)
-        )
+        with self._lock:
+            return sum(
+                1 for item in self.items
+                if item.status in (DownloadStatus.PENDING, DownloadStatus.QUEUED)
+            )
 
     def get_downloading_count(self) -> int:
         """Get count of currently downloading items.
@@ -196,14 +495,31 @@ class DownloadQueue:
         Returns:
             Count of downloading items
         """
-        return sum(
-            1 for item in self.items
-            if item.status == DownloadStatus.DOWNLOADING
-        )
+        with self._lock:
+            return sum(
+                1 for item in self.items
+                if item.status == DownloadStatus.DOWNLOADING
+            )
 
     def clear_completed(self):
         """Remove all completed items from queue."""
-        self.items = [
-            item for item in self.items
-            if item.status != DownloadStatus.COMPLETED
-        ]
+        with self._lock:
+            self.items = [
+                item for item in self.items
+                if item.status != DownloadStatus.COMPLETED
+            ]
+            self._mark_journal_dirty()
+
+    def prune_finished(self) -> int:
+        """Remove completed, failed and cancelled items.
+
+        Returns:
+            Number of items removed
+        """
+        with self._lock:
+            before = len(self.items)
+            self.items = [item for item in self.items if not item.finished]
+            removed = before - len(self.items)
+            if removed:
+                self._mark_journal_dirty()
+        return removed
@@ -5,6 +5,12 @@ import json
 from ..utils.cache import resolve_writable_cache_dir
 from ..utils.logging import logger
 
+# How the MP3 (audio-only) entry is produced:
+#   "mp3"      - encode to MP3 320k
+#   "original" - stream-copy the source audio into the container matching
+#                its codec (AAC -> .m4a, Opus -> .opus, ...); no re-encode
+AUDIO_OUTPUT_POLICIES = ("mp3", "original")
+
 
 class AppSettings:
     """Manage user preferences for the application."""
@@ -20,6 +26,16 @@ class AppSettings:
         self.auto_open_folder = False  # Auto-open folder after download
         self.auto_play = False  # Auto-play after download
         self.show_notifications = True  # Show download notifications
+        # Search settings
+        self.search_workers = 4  # concurrent playlist entry extractions (1 = sequential)
+        self.metadata_cache_ttl_hours = 24  # reuse searched formats for this long (0 = disabled)
+        self.lazy_format_resolution = False  # list playlists first, fetch formats per row on demand
+        self.max_concurrent_searches = 3  # URLs of a pasted batch extracted at the same time
+        self.max_concurrent_downloads = 4  # download engine worker threads (upper bound if adaptive)
+        self.min_concurrent_downloads = 1  # lower bound for adaptive concurrency
+        self.adaptive_concurrency = True  # steer worker count by measured throughput
+        self.audio_output_policy = "mp3"  # see AUDIO_OUTPUT_POLICIES
+        self.segmented_connections = 1  # range requests per progressive file (1 = off)
 
     def get_settings_file_path(self):
         """Return the filesystem path for the JSON settings file."""
@@ -40,6 +56,15 @@ class AppSettings:
             "auto_open_folder": getattr(self, 'auto_open_folder', False),
             "auto_play": getattr(self, 'auto_play', False),
             "show_notifications": getattr(self, 'show_notifications', True),
+            "search_workers": self.search_workers,
+            "metadata_cache_ttl_hours": self.metadata_cache_ttl_hours,
+            "lazy_format_resolution": self.lazy_format_resolution,
+            "max_concurrent_searches": self.max_concurrent_searches,
+            "max_concurrent_downloads": self.max_concurrent_downloads,
+            "min_concurrent_downloads": self.min_concurrent_downloads,
+            "adaptive_concurrency": self.adaptive_concurrency,
+            "audio_output_policy": self.audio_output_policy,
+            "segmented_connections": self.segmented_connections,
         }
         try:
             settings_file = self.get_settings_file_path()
@@ -61,6 +86,16 @@ class AppSettings:
                     self.show_audio_formats = settings.get("show_audio_formats", True)
                     self.show_audio_only = settings.get("show_audio_only", True)
                     self.max_quality = settings.get("max_quality", 720)
+                    self.search_workers = settings.get("search_workers", 4)
+                    self.metadata_cache_ttl_hours = settings.get("metadata_cache_ttl_hours", 24)
+                    self.lazy_format_resolution = settings.get("lazy_format_resolution", False)
+                    self.max_concurrent_searches = settings.get("max_concurrent_searches", 3)
+                    self.max_concurrent_downloads = settings.get("max_concurrent_downloads", 4)
+                    self.min_concurrent_downloads = settings.get("min_concurrent_downloads", 1)
+                    self.adaptive_concurrency = settings.get("adaptive_concurrency", True)
+                    policy = settings.get("audio_output_policy", "mp3")
+                    self.audio_output_policy = policy if policy in AUDIO_OUTPUT_POLICIES else "mp3"
+                    self.segmented_connections = settings.get("segmented_connections", 1)
                 logger.info("Loaded settings: %s", settings_file)
             else:
                 logger.info("No settings file found; using defaults (%s)", settings_file)
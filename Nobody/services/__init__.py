@@ -2,11 +2,28 @@
 
 from .searcher import Searcher
 from .downloader import Downloader
+from .download_engine import DownloadEngine
 from .ffmpeg_checker import FFmpegChecker
+from .format_resolver import FormatResolver
+from .extractor_session import ExtractorSession, get_extractor_session
+from .host_health import HostHealth
+from .progress import ProgressAggregator
+from .segmented_download import SegmentedDownloader
+from .thumbnail_loader import ThumbnailLoader
+from .transcoder import Transcoder
 
 __all__ = [
     "Searcher",
     "Downloader",
+    "DownloadEngine",
     "FFmpegChecker",
+    "FormatResolver",
+    "ExtractorSession",
+    "get_extractor_session",
+    "HostHealth",
+    "ProgressAggregator",
+    "SegmentedDownloader",
+    "ThumbnailLoader",
+    "Transcoder",
 ]
 
@@ -0,0 +1,147 @@
+"""Adaptive download concurrency (AIMD) driven by measured throughput."""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from ..utils.logging import logger
+from .host_health import OUTCOME_THROTTLED
+from .progress import progress_fields
+
+
+class ConcurrencyController:
+    """Steer the number of parallel downloads toward the best total throughput.
+
+    Download hooks feed byte counts through record_progress(). Once per
+    window, adjust() compares the aggregate bytes/second with the previous
+    window:
+
+    * throttling seen          -> halve (multiplicative decrease)
+    * last step up did not pay -> step back down and hold for a while
+    * all slots busy           -> add one (additive increase)
+    """
+
+    def __init__(
+        self,
+        min_workers: int = 1,
+        max_workers: int = 4,
+        window_seconds: float = 5.0,
+        min_gain: float = 0.05,
+        hold_windows: int = 6,
+    ):
+        """Initialize controller.
+
+        Args:
+            min_workers: Lower bound for parallel downloads
+            max_workers: Upper bound for parallel downloads
+            window_seconds: Measurement window between decisions
+            min_gain: Relative throughput gain an increase must bring
+            hold_windows: Windows to wait after a failed probe before
+                probing upward again
+        """
+        self.min_workers = max(1, int(min_workers))
+        self.max_workers = max(self.min_workers, int(max_workers))
+        self.window_seconds = window_seconds
+        self.min_gain = min_gain
+        self.hold_windows = hold_windows
+        self._lock = threading.Lock()
+        self._row_bytes: Dict[int, int] = {}
+        self._window_bytes = 0
+        self._window_rows = set()
+        self._window_started = time.monotonic()
+        self._throttled = False
+        self._last_throughput: Optional[float] = None
+        self._last_action = "hold"
+        self._hold = 0
+
+    def set_bounds(self, min_workers: int, max_workers: int) -> None:
+        """Change the user-set bounds."""
+        with self._lock:
+            self.min_workers = max(1, int(min_workers))
+            self.max_workers = max(self.min_workers, int(max_workers))
+
+    def clamp(self, workers: int) -> int:
+        """Return ``workers`` limited to the bounds."""
+        return min(self.max_workers, max(self.min_workers, workers))
+
+    def initial_workers(self) -> int:
+        """Return the worker count to start a batch with."""
+        return min(self.max_workers, max(self.min_workers, 2))
+
+    def record_progress(self, row: int, data: Dict) -> None:
+        """Account the bytes of a ``downloading`` hook; safe from any thread."""
+        downloaded = progress_fields(data)[0]
+        with self._lock:
+            previous = self._row_bytes.get(row, 0)
+            # A restarted or resumed download may report fewer bytes
+            self._window_bytes += max(0, downloaded - previous)
+            self._row_bytes[row] = downloaded
+            self._window_rows.add(row)
+
+    def record_outcome(self, row: int, outcome: str) -> None:
+        """Note how a download ended; throttling forces a decrease."""
+        with self._lock:
+            self._row_bytes.pop(row, None)
+            if outcome == OUTCOME_THROTTLED:
+                self._throttled = True
+
+    def adjust(self, current: int, busy: int) -> int:
+        """Return the worker count for the next window.
+
+        Args:
+            current: Current worker count
+            busy: Downloads currently running
+
+        Returns:
+            ``current`` until a window has elapsed, then the new count
+        """
+        now = time.monotonic()
+        with self._lock:
+            elapsed = now - self._window_started
+            if elapsed < self.window_seconds:
+                return current
+            throughput = self._window_bytes / elapsed
+            rows = len(self._window_rows) or 1
+            throttled = self._throttled
+            self._window_bytes = 0
+            self._window_rows = set()
+            self._window_started = now
+            self._throttled = False
+
+            previous = self._last_throughput
+            target = current
+            if throttled:
+                target = max(self.min_workers, current // 2)
+                action = "decrease (throttled)"
+                self._hold = self.hold_windows
+            elif (
+                self._last_action == "increase"
+                and previous is not None
+                and throughput < previous * (1 + self.min_gain)
+            ):
+                target = max(self.min_workers, current - 1)
+                action = "revert (no gain)"
+                self._hold = self.hold_windows
+            elif self._hold > 0:
+                self._hold -= 1
+                action = "hold"
+            elif busy >= current and current < self.max_workers:
+                target = current + 1
+                action = "increase"
+            else:
+                action = "hold"
+            self._last_action = action.split()[0]
+            self._last_throughput = throughput
+
+        logger.info(
+            "Concurrency %s: %d -> %d worker(s); %.0f KiB/s total, %.0f KiB/s per item "
+            "(%d busy, previous %s)",
+            action,
+            current,
+            target,
+            throughput / 1024,
+            throughput / rows / 1024,
+            busy,
+            f"{previous / 1024:.0f} KiB/s" if previous is not None else "n/a",
+        )
+        return target
@@ -0,0 +1,501 @@
+"""Parallel download engine fed by the shared DownloadQueue."""
+
+import functools
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Set
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from ..models.formats import FormatRecord
+from ..models.queue import DownloadQueue, DownloadStatus, QueueItem
+from ..utils.logging import logger
+from .concurrency import ConcurrencyController
+from .download_worker import DownloadInterrupted, WorkerProcess
+from .downloader import DownloadMixin
+from .host_health import (
+    OUTCOME_CANCELLED,
+    OUTCOME_OK,
+    OUTCOME_THROTTLED,
+    HostHealth,
+    classify_failure,
+    host_of,
+)
+from .progress import format_eta, format_speed, percent_of, progress_fields
+from .transcoder import StageStats, Transcoder
+
+
+class DownloadEngine(DownloadMixin, QObject):
+    """Run queued downloads on a pool of worker threads.
+
+    Workers claim the highest-priority waiting item from the DownloadQueue,
+    so items may be enqueued at any time, including while others are
+    downloading. The engine emits the same signals as Downloader, but item
+    signals carry the QueueItem's ``item_id`` rather than a row: rows move
+    when others are deleted, so receivers look the current row up with
+    DownloadQueue.get_item_by_id(). Item operations take the ``item_id``
+    for the same reason.
+
+    MP3 jobs are pipelined: a worker downloads the audio, hands the file to
+    the Transcoder and claims the next item while ffmpeg encodes.
+
+    Items are admitted per host through HostHealth: a throttled or failing
+    host is backed off (and eventually paused) while workers keep claiming
+    items for other hosts. With a ConcurrencyController attached, the worker
+    count follows measured throughput instead of staying fixed.
+
+    Each worker thread drives its own download process (WorkerProcess), so
+    yt_dlp never competes with the GUI for the GIL and a running item can
+    be cancelled, paused or abandoned at shutdown by killing its process.
+    """
+
+    updated_status = pyqtSignal(str)
+    download_failed = pyqtSignal(str)
+    updated_progress = pyqtSignal(float)
+    item_progress = pyqtSignal(int, float, str, str)  # item_id, percent, speed, eta
+    item_completed = pyqtSignal(int)  # item_id
+    item_started = pyqtSignal(int, str)  # item_id, title
+    history_added = pyqtSignal(str, str, str, str, object)  # title, url, format, path, size
+    queue_drained = pyqtSignal()  # every enqueued item has finished
+
+    # Throttled items are requeued this many times before they fail
+    MAX_THROTTLED_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        queue: DownloadQueue,
+        download_directory: str = "",
+        max_workers: int = 4,
+        session=None,
+        transcoder: Optional[Transcoder] = None,
+        host_health: Optional[HostHealth] = None,
+        use_processes: bool = True,
+    ):
+        """Initialize engine.
+
+        Args:
+            queue: Queue shared with the view's status bar
+            download_directory: Fallback directory for items without one
+            max_workers: Number of concurrent downloads
+            session: ExtractorSession providing warm yt_dlp clients;
+                defaults to the process-wide session
+            transcoder: MP3 transcode stage; defaults to one slot per CPU
+            host_health: Per-host rate limits and circuit breakers; its
+                per-host cap is independent of ``max_workers`` so one host
+                cannot take every worker
+            use_processes: Run yt_dlp in worker processes (False runs it
+                in the worker threads)
+        """
+        super().__init__()
+        self._init_downloads(download_directory, session)
+        self.queue = queue
+        self.max_workers = max(1, int(max_workers or 1))
+        self.transcoder = transcoder or Transcoder()
+        self.host_health = host_health or HostHealth()
+        self.controller: Optional[ConcurrencyController] = None
+        self.use_processes = use_processes
+        self._processes: List[WorkerProcess] = []
+        self._running: Dict[int, WorkerProcess] = {}  # item_id -> process
+        self._interrupts: Dict[int, DownloadStatus] = {}  # item_id -> status to set
+        self._starting: Set[int] = set()  # claimed item_ids not yet running
+        self.download_stats = StageStats("download", self.max_workers)
+        self._cond = threading.Condition()
+        self._workers = []
+        self._active = 0
+        self._transcoding = 0
+        self._stopping = False
+        self._batch_started: Optional[float] = None
+        self._local = threading.local()
+        self.completed_count = 0
+        self.failed_count = 0
+
+    def enqueue(
+        self,
+        title: str,
+        url: str,
+        record: FormatRecord,
+        row_index: int,
+        download_directory: Optional[str] = None,
+        priority: int = 0,
+    ) -> Optional[QueueItem]:
+        """Add a download; workers pick it up immediately if one is idle.
+
+        Returns:
+            The new QueueItem, or None if ``url`` is already queued or
+            downloading
+        """
+        if self.queue.has_active_item(url):
+            return None
+        item = self.queue.add_item(
+            title,
+            url,
+            record.format_id,
+            row_index,
+            priority=priority,
+            format_record=record,
+            download_directory=download_directory or self.download_directory,
+        )
+        with self._cond:
+            if self._batch_started is None:
+                self._batch_started = time.monotonic()
+            self._cond.notify()
+        self._ensure_workers()
+        return item
+
+    def resume_pending(self) -> int:
+        """Start workers for items restored from the queue journal.
+
+        Returns:
+            Number of items waiting to download
+        """
+        pending = self.queue.get_pending_count()
+        if pending:
+            with self._cond:
+                if self._batch_started is None:
+                    self._batch_started = time.monotonic()
+                self._cond.notify_all()
+            self._ensure_workers()
+        return pending
+
+    def set_max_workers(self, max_workers: int) -> None:
+        """Change the number of concurrent downloads while running.
+
+        Extra workers exit once their current download finishes.
+        """
+        with self._cond:
+            self.max_workers = max(1, int(max_workers or 1))
+            self.download_stats.capacity = self.max_workers
+            self._cond.notify_all()
+        self._ensure_workers()
+
+    def cancel_item(self, item_id: int) -> bool:
+        """Cancel a waiting or running download (running ones are killed)."""
+        return self._stop_item(item_id, DownloadStatus.CANCELLED)
+
+    def pause_item(self, item_id: int) -> bool:
+        """Pause a download; its ``.part`` file is kept for resume_item()."""
+        return self._stop_item(item_id, DownloadStatus.PAUSED)
+
+    def resume_item(self, item_id: int) -> bool:
+        """Queue a paused download again."""
+        item = self.queue.get_item_by_id(item_id)
+        if item is None or item.status != DownloadStatus.PAUSED:
+            return False
+        self.queue.update_item(item, status=DownloadStatus.QUEUED)
+        self.resume_pending()
+        return True
+
+    def _stop_item(self, item_id: int, status: DownloadStatus) -> bool:
+        item = self.queue.get_item_by_id(item_id)
+        if item is None or item.finished:
+            return False
+        with self._cond:
+            if item.status in (DownloadStatus.PENDING, DownloadStatus.QUEUED, DownloadStatus.PAUSED):
+                self.queue.update_item(item, status=status)
+                return True
+            process = self._running.get(item.item_id)
+            if process is None:
+                if item.item_id in self._starting:
+                    # Claimed but not started: _run_download() stops it
+                    self._interrupts[item.item_id] = status
+                    return True
+                return False
+            self._interrupts[item.item_id] = status
+            process.kill()
+        return True
+
+    def set_controller(self, controller: Optional[ConcurrencyController]) -> None:
+        """Let ``controller`` steer the worker count (None = fixed count)."""
+        self.controller = controller
+        if controller is not None:
+            self.set_max_workers(controller.initial_workers())
+
+    def is_busy(self) -> bool:
+        """Return True while any item is waiting, downloading or transcoding."""
+        with self._cond:
+            return (
+                self._active > 0 or self._transcoding > 0 or self.queue.get_pending_count() > 0
+            )
+
+    def host_diagnostics(self) -> Dict[str, Dict]:
+        """Return per-host counters and circuit state."""
+        return self.host_health.snapshot()
+
+    def stage_stats(self) -> List[Dict]:
+        """Return utilisation of the download and transcode stages."""
+        return [self.download_stats.snapshot(), self.transcoder.stats.snapshot()]
+
+    def shutdown(self, timeout: float = 0) -> None:
+        """Stop claiming new items and kill running download processes.
+
+        Killed items go back to QUEUED in the journal and resume from their
+        ``.part`` files on the next start.
+
+        Args:
+            timeout: Seconds to wait for worker threads (0 = do not wait)
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            workers = list(self._workers)
+            for item_id in self._running:
+                self._interrupts[item_id] = DownloadStatus.QUEUED
+            running = list(self._running.values())
+            idle = [process for process in self._processes if process not in running]
+        for process in running:
+            process.kill()
+        for process in idle:
+            process.close()
+        self.transcoder.shutdown(wait=False)
+        deadline = time.monotonic() + timeout
+        for worker in workers:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            worker.join(remaining)
+
+    # Worker pool -------------------------------------------------------
+
+    def _ensure_workers(self) -> None:
+        with self._cond:
+            self._workers = [worker for worker in self._workers if worker.is_alive()]
+            while not self._stopping and len(self._workers) < self.max_workers:
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"download-worker-{len(self._workers)}",
+                    daemon=True,
+                )
+                self._workers.append(worker)
+                worker.start()
+
+    def _worker_loop(self) -> None:
+        me = threading.current_thread()
+        while True:
+            with self._cond:
+                item = None
+                while not self._stopping:
+                    if len(self._workers) > self.max_workers:
+                        # Shrinking: retire this worker
+                        self._workers.remove(me)
+                        self._retire_process()
+                        return
+                    item = self.queue.claim_next_item(self._admit)
+                    if item is not None:
+                        self._active += 1
+                        self._starting.add(item.item_id)
+                        break
+                    self._cond.wait(self._admission_timeout())
+                if self._stopping:
+                    if me in self._workers:
+                        self._workers.remove(me)
+                    self._retire_process()
+                    return
+            try:
+                self._run_item(item)
+            finally:
+                with self._cond:
+                    self._active -= 1
+                self._check_drained()
+
+    def _admit(self, item: QueueItem) -> bool:
+        return self.host_health.acquire(host_of(item.url))
+
+    def _admission_timeout(self) -> Optional[float]:
+        """Wake up when a rate-limited or paused host can take work again."""
+        if not self.queue.get_pending_count():
+            return None
+        wait = self.host_health.next_ready_in()
+        return None if wait is None else min(max(wait, 0.05), 5.0)
+
+    def _check_drained(self) -> None:
+        with self._cond:
+            drained = (
+                self._active == 0
+                and self._transcoding == 0
+                and self._batch_started is not None
+                and self.queue.get_pending_count() == 0
+            )
+            if drained:
+                elapsed = time.monotonic() - self._batch_started
+                self._batch_started = None
+        if drained:
+            self._report_drained(elapsed)
+
+    def _run_item(self, item: QueueItem) -> None:
+        record = item.format_record or FormatRecord(item.format_id)
+        self._local.item = item
+        self._local.handoff = None
+        try:
+            with self.download_stats.busy():
+                ok = self.download_video(
+                    item.item_id,
+                    item.title,
+                    item.url,
+                    record,
+                    item.download_directory or self.download_directory,
+                )
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Download worker error for %s: %s", item.url, exc, exc_info=True)
+            ok = False
+        finally:
+            self._local.item = None
+        with self._cond:
+            self._starting.discard(item.item_id)
+            interrupted = self._interrupts.pop(item.item_id, None)
+        if interrupted is not None:
+            self.host_health.release(host_of(item.url), OUTCOME_CANCELLED)
+            self.queue.update_item(item, status=interrupted)
+            with self._cond:
+                self._cond.notify_all()
+            return
+        outcome = OUTCOME_OK if ok else classify_failure(self.last_error())
+        self.host_health.release(host_of(item.url), outcome)
+        if self.controller is not None:
+            self.controller.record_outcome(item.item_id, outcome)
+        with self._cond:
+            self._cond.notify_all()
+        handoff = self._local.handoff
+        self._local.handoff = None
+        if outcome == OUTCOME_THROTTLED and item.attempts < self.MAX_THROTTLED_ATTEMPTS:
+            logger.warning(
+                "%s throttled %s; requeued (attempt %d)",
+                host_of(item.url), item.title, item.attempts + 1,
+            )
+            self.queue.update_item(item, status=DownloadStatus.QUEUED, attempts=item.attempts + 1)
+            return
+        if ok and handoff is not None:
+            self.queue.update_item(item, status=DownloadStatus.PROCESSING, partial_path=None)
+            with self._cond:
+                self._transcoding += 1
+            handoff.add_done_callback(functools.partial(self._transcode_finished, item))
+            return
+        self._finish_item(item, ok)
+
+    def _run_download(self, options, url, info, on_progress, on_output) -> bool:
+        process = None
+        if self.use_processes:
+            process = getattr(self._local, "process", None)
+            if process is None:
+                process = self._local.process = WorkerProcess()
+                with self._cond:
+                    self._processes.append(process)
+        item = getattr(self._local, "item", None)
+        item_id = item.item_id if item is not None else -1
+        with self._cond:
+            self._starting.discard(item_id)
+            if self._stopping:
+                self._interrupts[item_id] = DownloadStatus.QUEUED
+            if item_id in self._interrupts:
+                # Stopped between claim and start
+                raise DownloadInterrupted(url)
+            if process is not None:
+                process.arm()
+                self._running[item_id] = process
+        if process is None:
+            return super()._run_download(options, url, info, on_progress, on_output)
+        try:
+            return process.run(options, url, info, on_progress, on_output)
+        finally:
+            with self._cond:
+                self._running.pop(item_id, None)
+
+    def _retire_process(self) -> None:
+        """Close the calling worker thread's download process (holding _cond)."""
+        process = getattr(self._local, "process", None)
+        if process is not None:
+            self._local.process = None
+            if process in self._processes:
+                self._processes.remove(process)
+            process.close()
+
+    def _start_transcode(self, *args) -> Future:
+        future = super()._start_transcode(*args)
+        self._local.handoff = future
+        return future
+
+    def _transcode_finished(self, item: QueueItem, future: Future) -> None:
+        ok = not future.cancelled() and future.exception() is None
+        self._finish_item(item, ok)
+        with self._cond:
+            self._transcoding -= 1
+        self._check_drained()
+
+    def _finish_item(self, item: QueueItem, ok: bool) -> None:
+        if ok:
+            self.queue.update_item(
+                item, status=DownloadStatus.COMPLETED, progress=100.0, partial_path=None
+            )
+            self.completed_count += 1
+        else:
+            self.queue.update_item(item, status=DownloadStatus.FAILED)
+            self.failed_count += 1
+
+    def _handle_progress(self, item_id: int, data: dict) -> None:
+        item = getattr(self._local, "item", None)
+        if item is not None:
+            self._record_paths(item, data)
+            if data.get("status") == "downloading":
+                downloaded, total, speed, eta = progress_fields(data)
+                self.queue.set_item_progress(
+                    item, percent_of(downloaded, total), format_speed(speed), format_eta(eta)
+                )
+        if data.get("status") == "downloading" and self.controller is not None:
+            self.controller.record_progress(item_id, data)
+            self._steer()
+        super()._handle_progress(item_id, data)
+
+    def _steer(self) -> None:
+        """Apply the controller's decision once per measurement window."""
+        with self._cond:
+            current, busy = self.max_workers, self._active
+        target = self.controller.adjust(current, busy)
+        if target != current:
+            self.set_max_workers(target)
+
+    def _record_paths(self, item: QueueItem, data: dict) -> None:
+        """Journal the output and ``.part`` paths once yt_dlp reports them."""
+        partial = data.get("tmpfilename") if data.get("status") == "downloading" else None
+        final = data.get("filename")
+        if (partial and partial != item.partial_path) or (final and final != item.file_path):
+            self.queue.update_item(
+                item,
+                partial_path=partial or item.partial_path,
+                file_path=final or item.file_path,
+            )
+
+    def _report_drained(self, elapsed: float) -> None:
+        logger.info(
+            "Download queue drained in %.1f s: %d completed, %d failed "
+            "(%d worker(s); %d extraction(s), %d reused search result(s))",
+            elapsed,
+            self.completed_count,
+            self.failed_count,
+            self.max_workers,
+            self.extractions,
+            self.reused_infos,
+        )
+        for stats in self.stage_stats():
+            if stats["jobs"]:
+                logger.info(
+                    "Stage %s: %d job(s), %.1f s busy, %.0f%% of %d slot(s) utilised",
+                    stats["stage"],
+                    stats["jobs"],
+                    stats["busy_seconds"],
+                    stats["utilisation"] * 100,
+                    stats["capacity"],
+                )
+        for host, counters in self.host_diagnostics().items():
+            logger.info(
+                "Host %s: %s, %d started, %d ok, %d failed (%d throttled), %d circuit trip(s)",
+                host,
+                counters["state"],
+                counters["started"],
+                counters["succeeded"],
+                counters["failed"],
+                counters["throttled"],
+                counters["circuit_trips"],
+            )
+        self.download_stats.reset()
+        self.transcoder.stats.reset()
+        self.queue_drained.emit()
@@ -0,0 +1,271 @@
+"""yt_dlp downloads executed in disposable worker processes.
+
+The GUI process keeps scheduling, signals and post-download bookkeeping;
+a worker process only runs yt_dlp and streams compact progress tuples back
+over a pipe. Stopping a download is a ``kill()`` of its process tree
+(including ffmpeg children yt_dlp started for merging or post-processing),
+which takes effect immediately even while an extractor or ffmpeg call hangs.
+"""
+
+import multiprocessing
+import os
+import pickle
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import yt_dlp
+
+from ..utils.logging import logger
+
+# Minimum seconds between "downloading" messages sent from a worker
+PROGRESS_INTERVAL = 0.1
+
+# Message kinds on the pipe (worker -> GUI process)
+MSG_PROGRESS = "p"  # (kind, status, downloaded, total, estimate, speed, eta, filename, tmpfilename)
+MSG_OUTPUT = "o"  # (kind, filepath, extractor_key, id)
+MSG_DONE = "d"  # (kind, reused_info)
+MSG_ERROR = "e"  # (kind, exception type name, message)
+
+
+class DownloadInterrupted(Exception):
+    """Raised when a running download was stopped on purpose."""
+
+
+class WorkerDownloadError(Exception):
+    """A download failed inside a worker process."""
+
+
+def execute_download(session, options: Dict, url: str, info: Optional[Dict]) -> bool:
+    """Run one download with a pooled client of ``session``.
+
+    Args:
+        session: ExtractorSession to borrow the client from
+        options: yt_dlp options including hooks
+        url: Video page URL
+        info: Resolved info dict from the search, or None to extract again
+
+    Returns:
+        True if ``info`` was used instead of extracting the page again
+    """
+    with session.client(options) as ydl:
+        if info is not None:
+            try:
+                ydl.process_ie_result(info, download=True)
+                return True
+            except (yt_dlp.utils.DownloadError, yt_dlp.utils.ReExtractInfo) as exc:
+                logger.warning("Stored metadata failed for %s (%s); extracting again", url, exc)
+        ydl.download([url])
+        return False
+
+
+def picklable_info(info: Optional[Dict]) -> Optional[Dict]:
+    """Return ``info`` if it can be sent to a worker, else None."""
+    if info is None:
+        return None
+    try:
+        pickle.dumps(info, protocol=pickle.HIGHEST_PROTOCOL)
+        return info
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def _kill_tree(process) -> None:
+    """Kill ``process`` together with every process it started."""
+    if sys.platform == "win32":
+        try:
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                capture_output=True,
+                timeout=5,
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            )
+        except (OSError, subprocess.SubprocessError) as exc:
+            logger.warning("taskkill failed for download process %s: %s", process.pid, exc)
+    else:
+        try:
+            # Workers lead their own process group, see _worker_main()
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+    if process.is_alive():
+        process.kill()
+
+
+def _worker_main(conn) -> None:
+    """Worker process loop: receive ``(options, url, info)`` jobs until None."""
+    if hasattr(os, "setsid"):
+        # Own process group, so kill() also reaches ffmpeg children
+        try:
+            os.setsid()
+        except OSError:
+            pass
+    from .extractor_session import get_extractor_session
+
+    session = get_extractor_session()
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        options, url, info = job
+        last_sent = [0.0]
+
+        def send_progress(data):
+            status = data.get("status")
+            now = time.monotonic()
+            if status == "downloading" and now - last_sent[0] < PROGRESS_INTERVAL:
+                return
+            last_sent[0] = now
+            conn.send((
+                MSG_PROGRESS,
+                status,
+                data.get("downloaded_bytes"),
+                data.get("total_bytes"),
+                data.get("total_bytes_estimate"),
+                data.get("speed"),
+                data.get("eta"),
+                data.get("filename"),
+                data.get("tmpfilename"),
+            ))
+
+        def send_output(data):
+            info_dict = data.get("info_dict") or {}
+            if data.get("status") == "finished" and info_dict.get("filepath"):
+                conn.send((
+                    MSG_OUTPUT,
+                    info_dict["filepath"],
+                    info_dict.get("extractor_key"),
+                    info_dict.get("id"),
+                ))
+
+        options = dict(options, progress_hooks=[send_progress], postprocessor_hooks=[send_output])
+        try:
+            reused = execute_download(session, options, url, info)
+            conn.send((MSG_DONE, reused))
+        except Exception as exc:  # noqa: BLE001
+            conn.send((MSG_ERROR, type(exc).__name__, str(exc)))
+    session.close()
+
+
+class WorkerProcess:
+    """One long-lived download process, restarted after it is killed."""
+
+    def __init__(self, context=None):
+        self._context = context or multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._killed = False
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._killed:
+                raise DownloadInterrupted("killed before start")
+            if self.alive:
+                return
+            parent_conn, child_conn = self._context.Pipe()
+            process = self._context.Process(
+                target=_worker_main, args=(child_conn,), name="nobody-download", daemon=True
+            )
+            process.start()
+            child_conn.close()
+            self._process, self._conn = process, parent_conn
+
+    def run(
+        self,
+        options: Dict,
+        url: str,
+        info: Optional[Dict],
+        on_progress: Callable[[Dict], None],
+        on_output: Callable[[Dict], None],
+    ) -> bool:
+        """Run a download in the worker and relay its messages.
+
+        Hooks are called in the calling thread with yt_dlp-shaped dicts.
+
+        Returns:
+            True if the search's info dict was reused
+
+        Raises:
+            DownloadInterrupted: If kill() was called meanwhile
+            WorkerDownloadError: If yt_dlp failed in the worker
+        """
+        self._ensure_started()
+        self._conn.send((options, url, picklable_info(info)))
+        return self._relay(url, on_progress, on_output)
+
+    def _relay(self, url: str, on_progress, on_output) -> bool:
+        while True:
+            try:
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                self._reset()
+                if self._killed:
+                    raise DownloadInterrupted(url)
+                raise WorkerDownloadError("Download process exited unexpectedly")
+            kind = message[0]
+            if kind == MSG_PROGRESS:
+                _, status, downloaded, total, estimate, speed, eta, filename, tmpfilename = message
+                on_progress({
+                    "status": status,
+                    "downloaded_bytes": downloaded,
+                    "total_bytes": total,
+                    "total_bytes_estimate": estimate,
+                    "speed": speed,
+                    "eta": eta,
+                    "filename": filename,
+                    "tmpfilename": tmpfilename,
+                })
+            elif kind == MSG_OUTPUT:
+                _, filepath, extractor_key, video_id = message
+                on_output({
+                    "status": "finished",
+                    "info_dict": {"filepath": filepath, "extractor_key": extractor_key, "id": video_id},
+                })
+            elif kind == MSG_DONE:
+                return message[1]
+            elif kind == MSG_ERROR:
+                raise WorkerDownloadError(f"{message[1]}: {message[2]}")
+
+    def arm(self) -> None:
+        """Clear an earlier kill() so the next run() may start."""
+        with self._lock:
+            self._killed = False
+
+    def kill(self) -> None:
+        """Stop the worker immediately; run() raises DownloadInterrupted."""
+        with self._lock:
+            self._killed = True
+            process = self._process
+            if process is not None and process.is_alive():
+                _kill_tree(process)
+
+    def _reset(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+        if self._process is not None:
+            self._process.join(1)
+        self._process = self._conn = None
+
+    def close(self) -> None:
+        """Ask an idle worker to exit; kill it if it does not."""
+        if self.alive:
+            try:
+                self._conn.send(None)
+                self._process.join(0.5)
+            except OSError:
+                pass
+        if self.alive:
+            _kill_tree(self._process)
+        self._process = self._conn = None
+
@@ -1,16 +1,316 @@
-"""Background downloader thread using yt_dlp."""
+"""Background downloader thread using yt_dlp.
 
+DownloadMixin holds the per-item download steps shared by the Downloader
+thread and the DownloadEngine worker pool; each host class declares the
+signals the mixin emits.
+"""
+
+import functools
 import os
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
 import yt_dlp
 from PyQt5.QtCore import QThread, pyqtSignal
-from typing import List, Tuple
 
+from ..models.download_archive import archive_output
+from ..models.formats import FormatRecord
 from ..utils.ffmpeg import find_ffmpeg_executable
 from ..utils.logging import logger
+from ..utils.metadata_cache import canonical_video_id, info_cache_key
 from ..utils.sanitize import sanitize_filename
+from .download_worker import DownloadInterrupted, WorkerDownloadError, execute_download
+from .extractor_session import get_extractor_session
+from .progress import ProgressAggregator
+
+
+class DownloadMixin:
+    """Download single items with yt_dlp for a QObject host class.
+
+    The host declares ``updated_status``, ``download_failed``,
+    ``updated_progress``, ``item_progress``, ``item_completed``,
+    ``item_started`` and ``history_added`` and calls
+    ``_init_downloads()`` from its ``__init__``.
+    """
+
+    def _init_downloads(self, download_directory: str, session=None) -> None:
+        """Set up state shared by every download_video() call.
+
+        Args:
+            download_directory: Target directory for downloads
+            session: ExtractorSession providing warm yt_dlp clients;
+                defaults to the process-wide session
+        """
+        self.download_directory = download_directory
+        self.session = session or get_extractor_session()
+        # Per-batch counters: full page extractions vs. reused search results
+        self.extractions = 0
+        self.reused_infos = 0
+        self._counter_lock = threading.Lock()
+        # Last failure message of the calling thread, see last_error()
+        self._errors = threading.local()
+        # Transcoder for MP3 jobs; None runs FFmpegExtractAudio inline
+        self.transcoder = None
+        # "mp3" encodes audio-only jobs; "original" stream-copies the source codec
+        self.audio_output_policy = "mp3"
+        # DownloadArchive recording finished files; None disables recording
+        self.archive = None
+        # Range requests per progressive file (1 = yt_dlp's single connection)
+        self.segmented_connections = 1
+        # Chunk-level hooks are coalesced here and re-emitted at a fixed rate
+        self.progress = ProgressAggregator(self)
+        self.progress.item_progress.connect(self.item_progress)
+        self.progress.overall_progress.connect(self.updated_progress)
+        self.progress.status.connect(self.updated_status)
+
+    def download_video(
+        self, row_idx: int, title: str, url: str, record: FormatRecord, directory: str
+    ) -> bool:
+        """Download a single video and emit its started/progress/completed signals.
+
+        Safe to call from several threads at once; progress is reported per
+        row rather than through ``current_row``.
+
+        Returns:
+            True if yt_dlp finished without raising
+        """
+        # Emit started signal
+        self.item_started.emit(row_idx, title)
+        self._errors.message = None
+
+        # Use improved filename sanitization
+        safe_title = sanitize_filename(title)
+        is_mp3_conversion = record.conversion == "mp3"
+        keep_source_audio = is_mp3_conversion and self.audio_output_policy == "original"
+        transcode_later = is_mp3_conversion and not keep_source_audio and self.transcoder is not None
+
+        ffmpeg_path = find_ffmpeg_executable()
+        if ffmpeg_path != "ffmpeg" and os.path.exists(ffmpeg_path):
+            logger.info("Using FFmpeg at: %s", ffmpeg_path)
+        else:
+            logger.warning("FFmpeg fallback to PATH (resolved value: %s)", ffmpeg_path)
+
+        download_options = {
+            "format": record.format_id,
+            "outtmpl": os.path.join(directory, f"{safe_title}.%(ext)s"),
+            "nocheckcertificate": True,
+            "prefer_insecure": True,
+            "geo_bypass": True,
+            "geo_verification_proxy": None,
+            "socket_timeout": 30,
+            "retries": 10,
+            "fragment_retries": 10,
+            "file_access_retries": 10,
+            # Throttled hosts are backed off by the engine's HostHealth rather
+            # than retried in place
+            "extractor_retries": 3,
+            "continuedl": True,  # resume from .part files left by an interrupted run
+            # Single videos: surface failures so they can be classified
+            "ignoreerrors": False,
+            "no_color": True,
+            "logtostderr": True,
+            "verbose": True,
+            "ffmpeg_location": ffmpeg_path,
+        }
+        if self.segmented_connections > 1:
+            download_options["segmented_connections"] = self.segmented_connections
+
+        if keep_source_audio:
+            # Remux only: the container follows the source codec
+            download_options["postprocessors"] = [
+                {"key": "FFmpegExtractAudio", "preferredcodec": "best"}
+            ]
+        elif transcode_later:
+            pass  # encoded by the transcode stage once the download is done
+        elif is_mp3_conversion:
+            download_options["postprocessors"] = [
+                {
+                    "key": "FFmpegExtractAudio",
+                    "preferredcodec": "mp3",
+                    "preferredquality": "320",
+                }
+            ]
+        else:
+            download_options["merge_output_format"] = "mp4"
 
+        try:
+            self.updated_status.emit(f"Starting download: {title}")
+            downloaded_file, output = self._execute(row_idx, url, download_options)
+            video_key = info_cache_key(output) or canonical_video_id(url)
+            downloaded_file = output.get("filepath") or downloaded_file
+            if (
+                transcode_later
+                and downloaded_file
+                and os.path.exists(downloaded_file)
+                and not downloaded_file.endswith(".mp3")
+            ):
+                target = os.path.join(directory, f"{safe_title}.mp3")
+                self._start_transcode(
+                    row_idx, title, url, record, downloaded_file, target, video_key=video_key
+                )
+                return True
+            self.updated_status.emit(f"Download complete: {title}")
+            # Emit completion signal
+            self.item_completed.emit(row_idx)
+
+            file_size = None
+            if downloaded_file and os.path.exists(downloaded_file):
+                file_size = os.path.getsize(downloaded_file)
+                self._archive_download(video_key, record, downloaded_file, title, file_size)
+            self.history_added.emit(
+                title, url, record.format_id,
+                downloaded_file or "",
+                file_size
+            )
+            return True
+        except DownloadInterrupted:
+            self.progress.finish(row_idx)
+            self._errors.message = "interrupted"
+            self.updated_status.emit(f"Stopped: {title}")
+            return False
+        except (yt_dlp.utils.DownloadError,
+                yt_dlp.utils.ExtractorError,
+                WorkerDownloadError,
+                OSError,
+                IOError) as exc:
+            error_msg = f"Download failed ({title}): {exc}"
+            logger.error(error_msg, exc_info=True)
+            self._errors.message = str(exc)
+            self.download_failed.emit(error_msg)
+            return False
+        except Exception as exc:  # noqa: BLE001
+            # Catch-all for unexpected errors
+            error_msg = f"Unexpected error downloading {title}: {exc}"
+            logger.error(error_msg, exc_info=True)
+            self._errors.message = str(exc)
+            self.download_failed.emit(error_msg)
+            return False
+
+    def _execute(self, row_idx: int, url: str, options: Dict) -> Tuple[Optional[str], Dict]:
+        """Download ``url``, reusing the info dict resolved during search.
+
+        The page is extracted again only when no stored info exists, its
+        stream URLs have expired, or downloading from it fails.
+
+        Returns:
+            Tuple of (last file yt_dlp finished downloading, info of the
+            final post-processing step or an empty dict)
+        """
+        downloaded_paths: List[str] = []
+        outputs: List[Dict] = []
+
+        def on_progress(data):
+            self._handle_progress(row_idx, data)
+            if data.get("status") == "finished" and data.get("filename"):
+                downloaded_paths.append(data["filename"])
+
+        def on_output(data):
+            # MoveFiles runs last, so its info_dict holds the final path
+            info = data.get("info_dict") or {}
+            if data.get("status") == "finished" and info.get("filepath"):
+                outputs.append(info)
+
+        info = self.session.resolved.take(url)
+        reused = self._run_download(options, url, info, on_progress, on_output)
+        with self._counter_lock:
+            if reused:
+                self.reused_infos += 1
+            else:
+                self.extractions += 1
+        return (downloaded_paths[-1] if downloaded_paths else None), (outputs[-1] if outputs else {})
+
+    def _run_download(self, options: Dict, url: str, info: Optional[Dict], on_progress, on_output) -> bool:
+        """Run yt_dlp in this thread; returns True if ``info`` was reused."""
+        options = dict(options, progress_hooks=[on_progress], postprocessor_hooks=[on_output])
+        return execute_download(self.session, options, url, info)
+
+    def last_error(self) -> str:
+        """Return the failure message of this thread's last download_video() call."""
+        return getattr(self._errors, "message", None) or ""
+
+    def _start_transcode(
+        self,
+        row_idx: int,
+        title: str,
+        url: str,
+        record: FormatRecord,
+        source: str,
+        target: str,
+        video_key: str = None,
+    ) -> Future:
+        """Hand a finished download to the transcode stage.
+
+        Completion and history signals are emitted once the encode is done.
+
+        Returns:
+            Future of the encode
+        """
+        self.updated_status.emit(f"Converting to MP3: {title}")
+        future = self.transcoder.submit(source, target)
+        future.add_done_callback(
+            functools.partial(self._transcode_done, row_idx, title, url, record, target, video_key)
+        )
+        return future
+
+    def _transcode_done(
+        self,
+        row_idx: int,
+        title: str,
+        url: str,
+        record: FormatRecord,
+        target: str,
+        video_key: str,
+        future: Future,
+    ) -> None:
+        try:
+            file_size = future.result()
+        except Exception as exc:  # noqa: BLE001
+            error_msg = f"MP3 conversion failed ({title}): {exc}"
+            logger.error(error_msg)
+            self.download_failed.emit(error_msg)
+            return
+        self.updated_status.emit(f"Download complete: {title}")
+        self.item_completed.emit(row_idx)
+        self._archive_download(video_key or canonical_video_id(url), record, target, title, file_size)
+        self.history_added.emit(title, url, record.format_id, target, file_size)
+
+    def _archive_download(
+        self, video_key: str, record: FormatRecord, path: str, title: str, file_size: int
+    ) -> None:
+        if self.archive is not None:
+            self.archive.add(
+                video_key,
+                record.format_id,
+                path,
+                title=title,
+                size=file_size,
+                output=archive_output(record.conversion, self.audio_output_policy),
+            )
 
-class Downloader(QThread):
+    def _handle_progress(self, row: int, data: dict) -> None:
+        status = data.get("status")
+        if status == "downloading":
+            title = os.path.splitext(os.path.basename(data.get("filename", "")))[0]
+            self.progress.update(row, title, data)
+        elif status == "finished":
+            self.progress.finish(row)
+            title = os.path.splitext(os.path.basename(data.get("filename", "")))[0]
+            if len(title) > 14:
+                title = title[:14] + "..."
+            # Only the file is done: merging, post-processing or the transcode
+            # stage may still follow, so completion is emitted by
+            # download_video() / _transcode_done() once the output exists
+            self.updated_status.emit(f"Finished downloading {title}")
+        elif status == "error":
+            self.progress.finish(row)
+            title = os.path.splitext(os.path.basename(data.get("filename", "")))[0]
+            if len(title) > 14:
+                title = title[:14] + "..."
+            self.download_failed.emit(f"Error downloading {title}")
+
+
+class Downloader(DownloadMixin, QThread):
     """Download videos and emit progress/status updates."""
 
     updated_status = pyqtSignal(str)
@@ -22,119 +322,48 @@ class Downloader(QThread):
     item_started = pyqtSignal(int, str)  # row, title
     history_added = pyqtSignal(str, str, str, str, object)  # title, url, format, path, size
 
-    def __init__(self, videos: List[Tuple[str, str, str]], download_directory: str, row_mapping: dict = None):
+    def __init__(
+        self,
+        videos: List[Tuple[str, str, FormatRecord]],
+        download_directory: str,
+        row_mapping: dict = None,
+        session=None,
+    ):
         """Initialize downloader thread.
         
         Args:
-            videos: List of tuples (title, url, format_id)
+            videos: List of tuples (title, url, FormatRecord)
             download_directory: Target directory for downloads
             row_mapping: Dictionary mapping (title, url) to row index
+            session: ExtractorSession providing warm yt_dlp clients;
+                defaults to the process-wide session
         """
         super().__init__()
         self.videos = videos
-        self.download_directory = download_directory
         self.row_mapping = row_mapping or {}  # Maps (title, url) to row index
         self.current_row = -1
         self.current_title = ""
+        self._init_downloads(download_directory, session)
 
     def run(self):
         """Execute download process for all videos."""
-        for idx, (title, url, format_id) in enumerate(self.videos):
+        try:
+            self._download_all()
+        finally:
+            logger.info(
+                "Download batch: %d item(s), %d extraction(s), %d reused search result(s)",
+                len(self.videos),
+                self.extractions,
+                self.reused_infos,
+            )
+
+    def _download_all(self):
+        for idx, (title, url, record) in enumerate(self.videos):
             # Find row index for this video
             row_idx = self.row_mapping.get((title, url), idx)
             self.current_row = row_idx
             self.current_title = title
-            
-            # Emit started signal
-            self.item_started.emit(row_idx, title)
-            
-            # Use improved filename sanitization
-            safe_title = sanitize_filename(title)
-            is_mp3_conversion = format_id == "bestaudio/best" or "MP3" in title
-
-            ffmpeg_path = find_ffmpeg_executable()
-            if ffmpeg_path != "ffmpeg" and os.path.exists(ffmpeg_path):
-                logger.info("Using FFmpeg at: %s", ffmpeg_path)
-            else:
-                logger.warning("FFmpeg fallback to PATH (resolved value: %s)", ffmpeg_path)
-
-            download_options = {
-                "format": format_id,
-                "outtmpl": os.path.join(self.download_directory, f"{safe_title}.%(ext)s"),
-                "progress_hooks": [self.progress_hook],
-                "nocheckcertificate": True,
-                "prefer_insecure": True,
-                "geo_bypass": True,
-                "geo_verification_proxy": None,
-                "socket_timeout": 30,
-                "retries": 10,
-                "fragment_retries": 10,
-                "file_access_retries": 10,
-                "extractor_retries": 10,
-                "ignoreerrors": True,
-                "no_color": True,
-                "logtostderr": True,
-                "verbose": True,
-                "ffmpeg_location": ffmpeg_path,
-            }
-
-            if is_mp3_conversion:
-                download_options["postprocessors"] = [
-                    {
-                        "key": "FFmpegExtractAudio",
-                        "preferredcodec": "mp3",
-                        "preferredquality": "320",
-                    }
-                ]
-            else:
-                download_options["merge_output_format"] = "mp4"
-
-            with yt_dlp.YoutubeDL(download_options) as ydl:
-                try:
-                    self.updated_status.emit(f"Starting download: {title}")
-                    ydl.download([url])
-                    self.updated_status.emit(f"Download complete: {title}")
-                    # Emit completion signal
-                    self.item_completed.emit(row_idx)
-                    
-                    # Find downloaded file and add to history
-                    downloaded_file = None
-                    file_size = None
-                    try:
-                        # Try to find the downloaded file by checking common extensions
-                        base_path = os.path.join(
-                            self.download_directory, safe_title
-                        )
-                        for ext in ["mp3", "mp4", "webm", "m4a", "opus"]:
-                            test_path = f"{base_path}.{ext}"
-                            if os.path.exists(test_path):
-                                downloaded_file = test_path
-                                file_size = os.path.getsize(test_path)
-                                break
-                    except Exception as file_exc:
-                        logger.debug(
-                            f"Could not determine downloaded file path: "
-                            f"{file_exc}"
-                        )
-                    
-                    # Emit history signal
-                    self.history_added.emit(
-                        title, url, format_id,
-                        downloaded_file or "",
-                        file_size
-                    )
-                except (yt_dlp.utils.DownloadError, 
-                        yt_dlp.utils.ExtractorError,
-                        OSError,
-                        IOError) as exc:
-                    error_msg = f"Download failed ({title}): {exc}"
-                    logger.error(error_msg, exc_info=True)
-                    self.download_failed.emit(error_msg)
-                except Exception as exc:  # noqa: BLE001
-                    # Catch-all for unexpected errors
-                    error_msg = f"Unexpected error downloading {title}: {exc}"
-                    logger.error(error_msg, exc_info=True)
-                    self.download_failed.emit(error_msg)
+            self.download_video(row_idx, title, url, record, self.download_directory)
 
     def progress_hook(self, data: dict) -> None:
         """Handle download progress updates from yt-dlp.
@@ -142,38 +371,4 @@ class Downloader(QThread):
         Args:
             data: Progress data dictionary from yt-dlp
         """
-        status = data.get("status")
-        if status == "downloading":
-            title = os.path.splitext(os.path.basename(data.get("filename", "")))[0]
-            if len(title) > 14:
-                title = title[:14] + "..."
-            percent_complete = float(data.get("_percent_str", "0%").replace("%", ""))
-            
-            # Extract speed and ETA
-            speed_str = data.get("_speed_str", "N/A")
-            eta_str = data.get("_eta_str", "N/A")
-            
-            # Emit overall progress (for backward compatibility)
-            self.updated_progress.emit(percent_complete)
-            
-            # Emit individual item progress
-            if self.current_row >= 0:
-                self.item_progress.emit(self.current_row, percent_complete, speed_str, eta_str)
-            
-            self.updated_status.emit(
-                f"Downloading {title}: {data.get('_percent_str', '')} {data.get('_eta_str', '')}"
-            )
-        elif status == "finished":
-            title = os.path.splitext(os.path.basename(data.get("filename", "")))[0]
-            if len(title) > 14:
-                title = title[:14] + "..."
-            self.updated_status.emit(f"Finished downloading {title}")
-            # Emit completion for current row
-            if self.current_row >= 0:
-                self.item_completed.emit(self.current_row)
-        elif status == "error":
-            title = os.path.splitext(os.path.basename(data.get("filename", "")))[0]
-            if len(title) > 14:
-                title = title[:14] + "..."
-            self.download_failed.emit(f"Error downloading {title}")
-
+        self._handle_progress(self.current_row, data)
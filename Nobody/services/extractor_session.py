@@ -0,0 +1,275 @@
+"""Long-lived yt_dlp clients shared by searches, format lookups and downloads."""
+
+import copy
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import yt_dlp
+
+from ..utils.cache import resolve_writable_cache_dir
+from ..utils.logging import logger
+
+# Options that may differ on every use of a pooled client. Everything else
+# is fixed at construction and therefore part of the pool key.
+PER_USE_OPTIONS = ("format", "outtmpl", "progress_hooks", "postprocessor_hooks")
+
+# Signed stream URLs carry their expiry as a unix timestamp, either as a
+# query parameter (``&expire=...``) or a path segment (``/expire/.../``).
+_EXPIRE_RE = re.compile(r"[?&/]expire[=/](\d+)")
+
+# Keys filled in by a previous processing pass that must not leak into the
+# next one (same set yt_dlp strips before writing an info JSON).
+_TRANSIENT_KEYS = frozenset({
+    "requested_downloads",
+    "requested_formats",
+    "requested_subtitles",
+    "filepath",
+    "infojson_filename",
+})
+
+
+def stream_expiry(info: Dict) -> Optional[float]:
+    """Return the earliest expiry timestamp of the info dict's stream URLs."""
+    expiries = []
+    for fmt in info.get("formats") or [info]:
+        match = _EXPIRE_RE.search((fmt or {}).get("url") or "")
+        if match:
+            expiries.append(float(match.group(1)))
+    return min(expiries) if expiries else None
+
+
+class ResolvedInfoStore:
+    """Bounded store of resolved info dicts, keyed by webpage URL.
+
+    The Searcher resolves every video fully; keeping the result lets the
+    Downloader process it directly instead of extracting the page again.
+    Entries are handed out only while their stream URLs are still valid.
+    """
+
+    def __init__(self, max_entries: int = 256, max_age_seconds: float = 600, expiry_margin: float = 120):
+        """Initialize store.
+
+        Args:
+            max_entries: Entries kept before the oldest are evicted
+            max_age_seconds: Age limit for entries without an explicit
+                stream expiry
+            expiry_margin: Seconds that must remain before a stream expiry
+                for an entry to be reused
+        """
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.expiry_margin = expiry_margin
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, info: Optional[Dict]) -> None:
+        """Remember a resolved single-video info dict."""
+        if not info or info.get("_type", "video") != "video" or not info.get("formats"):
+            return
+        url = info.get("webpage_url")
+        if not url:
+            return
+        with self._lock:
+            self._entries[url] = (time.time(), info)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def take(self, url: str) -> Optional[Dict]:
+        """Return a fresh, private copy of the info for ``url`` and forget it.
+
+        Returns:
+            Info dict ready for ``process_ie_result``, or None if nothing is
+            stored or its stream URLs have (nearly) expired
+        """
+        with self._lock:
+            entry = self._entries.pop(url, None)
+        if entry is None:
+            return None
+        stored_at, info = entry
+        now = time.time()
+        expiry = stream_expiry(info)
+        if expiry is not None:
+            if expiry - now < self.expiry_margin:
+                return None
+        elif now - stored_at > self.max_age_seconds:
+            return None
+        return copy.deepcopy(
+            {k: v for k, v in info.items() if k not in _TRANSIENT_KEYS and not k.startswith("__")}
+        )
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class _PooledClient:
+    """A YoutubeDL instance plus the hooks of its current borrower."""
+
+    __slots__ = ("ydl", "progress_hooks", "postprocessor_hooks")
+
+    def __init__(self, ydl):
+        self.ydl = ydl
+        self.progress_hooks = []
+        self.postprocessor_hooks = []
+        ydl.add_progress_hook(self._dispatch_progress)
+        ydl.add_postprocessor_hook(self._dispatch_postprocessor)
+
+    def _dispatch_progress(self, data):
+        for hook in self.progress_hooks:
+            hook(data)
+
+    def _dispatch_postprocessor(self, data):
+        for hook in self.postprocessor_hooks:
+            hook(data)
+
+
+class ExtractorSession:
+    """Pool of warm ``yt_dlp.YoutubeDL`` clients.
+
+    Creating a YoutubeDL instantiates every extractor lazily and starts with
+    empty in-memory player/signature caches, so reusing instances makes every
+    extraction after the first cheaper. The on-disk ``cachedir`` lives in the
+    app cache directory so that data also survives restarts.
+
+    A client is never used by two threads at once: ``client()`` checks one
+    out exclusively and returns it to the pool afterwards.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_idle_per_profile: int = 8):
+        """Initialize session.
+
+        Args:
+            cache_dir: yt_dlp cachedir; defaults to ``yt-dlp`` inside the
+                app cache directory
+            max_idle_per_profile: Idle clients kept per option profile
+        """
+        self.cache_dir = cache_dir or os.path.join(resolve_writable_cache_dir("Nobody 3"), "yt-dlp")
+        self.max_idle_per_profile = max(1, int(max_idle_per_profile))
+        self._idle = defaultdict(list)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.resolved = ResolvedInfoStore()
+        self.created = 0
+        self.reused = 0
+        self.setup_seconds = 0.0
+
+    @contextmanager
+    def client(self, options: Dict):
+        """Borrow a YoutubeDL configured with ``options``.
+
+        ``format``, ``outtmpl`` and the progress/postprocessor hooks are
+        applied per use; any other option selects (or creates) a matching
+        pooled client.
+
+        Args:
+            options: yt_dlp options as passed to ``yt_dlp.YoutubeDL``
+        """
+        key = self._profile_key(options)
+        pooled = self._checkout(key, options)
+        try:
+            self._apply_per_use(pooled, options)
+            yield pooled.ydl
+        finally:
+            pooled.progress_hooks = []
+            pooled.postprocessor_hooks = []
+            self._checkin(key, pooled)
+
+    def stats(self) -> Dict:
+        """Return client creation/reuse counters."""
+        with self._lock:
+            idle = sum(len(clients) for clients in self._idle.values())
+            return {
+                "created": self.created,
+                "reused": self.reused,
+                "idle": idle,
+                "avg_setup_ms": self.setup_seconds / self.created * 1000 if self.created else 0.0,
+            }
+
+    def close(self) -> None:
+        """Close every idle client; clients in use are closed on return."""
+        with self._lock:
+            self._closed = True
+            clients = [pooled for idle in self._idle.values() for pooled in idle]
+            self._idle.clear()
+        for pooled in clients:
+            self._close_client(pooled)
+
+    # Internal helpers -------------------------------------------------
+
+    @staticmethod
+    def _profile_key(options: Dict) -> str:
+        fixed = {k: v for k, v in options.items() if k not in PER_USE_OPTIONS}
+        return json.dumps(fixed, sort_keys=True, default=repr)
+
+    def _checkout(self, key: str, options: Dict) -> _PooledClient:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.reused += 1
+                return idle.pop()
+        started = time.perf_counter()
+        params = {k: v for k, v in options.items() if k not in ("progress_hooks", "postprocessor_hooks")}
+        params.setdefault("cachedir", self.cache_dir)
+        ydl = yt_dlp.YoutubeDL(params)
+        if (params.get("segmented_connections") or 1) > 1:
+            from .segmented_download import SegmentedDownloadPP
+
+            ydl.add_post_processor(SegmentedDownloadPP(ydl), when="before_dl")
+        pooled = _PooledClient(ydl)
+        with self._lock:
+            self.created += 1
+            self.setup_seconds += time.perf_counter() - started
+        return pooled
+
+    def _checkin(self, key: str, pooled: _PooledClient) -> None:
+        with self._lock:
+            idle = self._idle[key]
+            if not self._closed and len(idle) < self.max_idle_per_profile:
+                idle.append(pooled)
+                return
+        self._close_client(pooled)
+
+    @staticmethod
+    def _apply_per_use(pooled: _PooledClient, options: Dict) -> None:
+        ydl = pooled.ydl
+        pooled.progress_hooks = list(options.get("progress_hooks") or [])
+        pooled.postprocessor_hooks = list(options.get("postprocessor_hooks") or [])
+        if "outtmpl" in options:
+            outtmpl = options["outtmpl"]
+            if isinstance(outtmpl, dict):
+                ydl.params["outtmpl"].update(outtmpl)
+            else:
+                ydl.params["outtmpl"]["default"] = outtmpl
+        format_spec = options.get("format")
+        if format_spec != ydl.params.get("format"):
+            ydl.params["format"] = format_spec
+            ydl.format_selector = (
+                ydl.build_format_selector(format_spec) if isinstance(format_spec, str) else format_spec
+            )
+
+    @staticmethod
+    def _close_client(pooled: _PooledClient) -> None:
+        try:
+            pooled.ydl.close()
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("Error closing yt_dlp client: %s", exc)
+
+
+_shared_session: Optional[ExtractorSession] = None
+_shared_lock = threading.Lock()
+
+
+def get_extractor_session() -> ExtractorSession:
+    """Return the process-wide extractor session, creating it on first use."""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = ExtractorSession()
+        return _shared_session
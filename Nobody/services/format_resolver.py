@@ -0,0 +1,87 @@
+"""On-demand format resolution for lazily listed playlist rows."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from ..utils.logging import logger
+from ..utils.metadata_cache import info_cache_key
+from .extractor_session import get_extractor_session
+from .searcher import build_search_options, process_formats
+
+
+class FormatResolver(QObject):
+    """Resolve the format list of single videos in a background pool.
+
+    Signals are emitted from worker threads; Qt queues them to receivers
+    living on the GUI thread.
+    """
+
+    formats_resolved = pyqtSignal(str, list)  # video_url, formats
+    resolution_failed = pyqtSignal(str, str)  # video_url, message
+
+    def __init__(self, parent=None, max_workers=2, cache=None, session=None):
+        """Initialize resolver.
+
+        Args:
+            parent: Optional parent QObject
+            max_workers: Number of concurrent extractions
+            cache: Optional MetadataCache shared with the Searcher
+            session: ExtractorSession providing warm yt_dlp clients;
+                defaults to the process-wide session
+        """
+        super().__init__(parent)
+        self.cache = cache
+        self.session = session or get_extractor_session()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers or 1)),
+            thread_name_prefix="format-resolver",
+        )
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def request(self, video_url: str) -> None:
+        """Queue resolution of ``video_url`` unless it is already in flight."""
+        if not video_url:
+            return
+        with self._lock:
+            if video_url in self._in_flight:
+                return
+            self._in_flight.add(video_url)
+        try:
+            self._pool.submit(self._resolve, video_url)
+        except RuntimeError:
+            # Pool already shut down during application exit
+            with self._lock:
+                self._in_flight.discard(video_url)
+
+    def shutdown(self) -> None:
+        """Drop queued requests without waiting for running extractions."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _resolve(self, video_url: str) -> None:
+        try:
+            with self.session.client(build_search_options()) as ydl:
+                video = ydl.extract_info(video_url, download=False)
+            if not video:
+                self.resolution_failed.emit(video_url, "Video not found")
+                return
+            formats = process_formats(video)
+            self.session.resolved.put(video)
+            if self.cache is not None:
+                self.cache.put(
+                    info_cache_key(video),
+                    video.get("title", ""),
+                    video.get("thumbnail", ""),
+                    video.get("webpage_url", video_url),
+                    video.get("duration"),
+                    formats,
+                )
+            self.formats_resolved.emit(video_url, formats)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Format resolution failed for %s: %s", video_url, exc)
+            self.resolution_failed.emit(video_url, str(exc))
+        finally:
+            with self._lock:
+                self._in_flight.discard(video_url)
@@ -0,0 +1,214 @@
+"""Per-host admission control for downloads.
+
+Each host gets a token bucket (request rate), a concurrency cap, an
+exponential backoff with jitter after throttling responses and a circuit
+breaker that pauses the host after repeated failures. Items for other hosts
+are unaffected.
+"""
+
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from ..utils.sanitize import host_of
+
+# Messages yt_dlp raises for throttling / temporary unavailability
+_THROTTLE_RE = re.compile(
+    r"HTTP Error (429|503)|Too Many Requests|rate.?limit|Service Unavailable", re.IGNORECASE
+)
+
+OUTCOME_OK = "ok"
+OUTCOME_THROTTLED = "throttled"
+OUTCOME_ERROR = "error"
+OUTCOME_CANCELLED = "cancelled"  # stopped by the user; frees the slot only
+
+
+def classify_failure(message: Optional[str]) -> str:
+    """Map a download error message to an outcome for HostHealth.release()."""
+    if message and _THROTTLE_RE.search(message):
+        return OUTCOME_THROTTLED
+    return OUTCOME_ERROR
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate`` per second."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Return seconds until a token is available (0 if one is)."""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+
+class _HostState:
+    __slots__ = (
+        "bucket", "active", "consecutive_failures", "retry_at", "circuit_open_until",
+        "half_open", "started", "succeeded", "failed", "throttled", "circuit_trips",
+    )
+
+    def __init__(self, rate: float, burst: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.active = 0
+        self.consecutive_failures = 0
+        self.retry_at = 0.0
+        self.circuit_open_until = 0.0
+        self.half_open = False
+        self.started = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.throttled = 0
+        self.circuit_trips = 0
+
+
+class HostHealth:
+    """Decide when a download for a given host may start.
+
+    Call acquire() before starting a download and release() with its outcome
+    afterwards. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = 1.0,
+        burst: int = 3,
+        max_per_host: int = 2,
+        base_backoff: float = 2.0,
+        max_backoff: float = 120.0,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 60.0,
+    ):
+        """Initialize host health tracking.
+
+        Args:
+            rate_per_second: Sustained download starts per host
+            burst: Starts allowed back to back before the rate applies
+            max_per_host: Concurrent downloads per host
+            base_backoff: First backoff after a failure, doubled per
+                consecutive failure
+            max_backoff: Backoff ceiling in seconds
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown_seconds: Time the circuit stays open before one trial
+                download is let through
+        """
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_per_host = max(1, max_per_host)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.rate_per_second, self.burst)
+        return state
+
+    def _wait_locked(self, state: _HostState, now: float) -> Optional[float]:
+        """Seconds until ``state`` admits a download; None if only a slot is missing."""
+        if state.circuit_open_until > now:
+            return state.circuit_open_until - now
+        if state.retry_at > now:
+            return state.retry_at - now
+        limit = 1 if state.half_open else self.max_per_host
+        if state.active >= limit:
+            return None
+        return state.bucket.wait_time(now)
+
+    def acquire(self, host: str) -> bool:
+        """Take a download slot for ``host`` if it is healthy and under its limits."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(host)
+            if state.circuit_open_until and state.circuit_open_until <= now:
+                # Cooldown over: let a single trial download through
+                state.circuit_open_until = 0.0
+                state.half_open = True
+            if self._wait_locked(state, now) != 0:
+                return False
+            state.bucket.take(now)
+            state.active += 1
+            state.started += 1
+            return True
+
+    def release(self, host: str, outcome: str) -> None:
+        """Return the slot taken by acquire() and record the outcome."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(host)
+            state.active = max(0, state.active - 1)
+            if outcome == OUTCOME_CANCELLED:
+                return
+            if outcome == OUTCOME_OK:
+                state.succeeded += 1
+                state.consecutive_failures = 0
+                state.retry_at = 0.0
+                state.half_open = False
+                return
+            state.failed += 1
+            if outcome == OUTCOME_THROTTLED:
+                state.throttled += 1
+            state.consecutive_failures += 1
+            delay = min(self.max_backoff, self.base_backoff * 2 ** (state.consecutive_failures - 1))
+            state.retry_at = now + delay * random.uniform(0.5, 1.5)
+            if state.half_open or state.consecutive_failures >= self.failure_threshold:
+                state.circuit_open_until = now + self.cooldown_seconds
+                state.half_open = False
+                state.circuit_trips += 1
+
+    def next_ready_in(self) -> Optional[float]:
+        """Return the shortest time until a host blocked by rate, backoff or
+        circuit admits a download; None if no host is waiting on a timer."""
+        now = time.monotonic()
+        with self._lock:
+            waits = [self._wait_locked(state, now) for state in self._hosts.values()]
+        waits = [wait for wait in waits if wait]
+        return min(waits) if waits else None
+
+    def paused_hosts(self) -> List[str]:
+        """Return hosts whose circuit is currently open."""
+        now = time.monotonic()
+        with self._lock:
+            return sorted(h for h, s in self._hosts.items() if s.circuit_open_until > now)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Return per-host counters and state for diagnostics."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                host: {
+                    "state": (
+                        "open" if state.circuit_open_until > now
+                        else "half-open" if state.half_open
+                        else "backoff" if state.retry_at > now
+                        else "closed"
+                    ),
+                    "active": state.active,
+                    "started": state.started,
+                    "succeeded": state.succeeded,
+                    "failed": state.failed,
+                    "throttled": state.throttled,
+                    "circuit_trips": state.circuit_trips,
+                    "retry_in": max(0.0, max(state.retry_at, state.circuit_open_until) - now),
+                }
+                for host, state in self._hosts.items()
+            }
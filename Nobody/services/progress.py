@@ -0,0 +1,133 @@
+"""Rate-limited delivery of download progress to the GUI thread."""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+DEFAULT_INTERVAL_MS = 100  # 10 Hz
+
+
+def format_speed(speed: Optional[float]) -> str:
+    """Return a compact ``1.5MiB/s`` style rate, or ``N/A``."""
+    if not speed:
+        return "N/A"
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if speed < 1024 or unit == "GiB":
+            return f"{speed:.0f}{unit}/s" if unit == "B" else f"{speed:.1f}{unit}/s"
+        speed /= 1024
+    return "N/A"
+
+
+def format_eta(eta: Optional[float]) -> str:
+    """Return ``MM:SS`` (or ``H:MM:SS``) for a number of seconds, or ``N/A``."""
+    if eta is None or eta < 0:
+        return "N/A"
+    minutes, seconds = divmod(int(eta), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+
+def progress_fields(data: Dict) -> Tuple[int, Optional[int], Optional[float], Optional[float]]:
+    """Read the numeric fields of a yt_dlp ``downloading`` hook.
+
+    Returns:
+        Tuple of (downloaded_bytes, total_bytes, speed, eta); the total
+        falls back to yt_dlp's estimate and may be None
+    """
+    downloaded = data.get("downloaded_bytes") or 0
+    total = data.get("total_bytes") or data.get("total_bytes_estimate")
+    return downloaded, int(total) if total else None, data.get("speed"), data.get("eta")
+
+
+def percent_of(downloaded: int, total: Optional[int]) -> float:
+    """Return the completed percentage, clamped to 0-100."""
+    if not total:
+        return 0.0
+    return max(0.0, min(100.0, downloaded * 100.0 / total))
+
+
+class ProgressAggregator(QObject):
+    """Collect progress from worker threads and publish it at a fixed rate.
+
+    ``update()`` only records the newest numbers for a row, so yt_dlp may
+    call it for every chunk from any number of threads. A GUI-thread timer
+    then emits at most one ``item_progress`` per row per tick, plus one
+    overall percentage and status line. The timer runs only while there is
+    something to publish.
+    """
+
+    item_progress = pyqtSignal(int, float, str, str)  # row, percent, speed, eta
+    overall_progress = pyqtSignal(float)
+    status = pyqtSignal(str)
+    _wake = pyqtSignal()
+
+    def __init__(self, parent=None, interval_ms: int = DEFAULT_INTERVAL_MS):
+        """Initialize aggregator; create it in the GUI thread.
+
+        Args:
+            parent: Optional QObject parent
+            interval_ms: Publish interval in milliseconds
+        """
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Tuple] = {}
+        self._active: Dict[int, Tuple[int, Optional[int]]] = {}
+        self._armed = False
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+        # Queued when emitted from a worker: starts the timer in its own thread
+        self._wake.connect(self._timer.start)
+
+    def update(self, row: int, title: str, data: Dict) -> None:
+        """Record a ``downloading`` hook for ``row``; safe from any thread."""
+        downloaded, total, speed, eta = progress_fields(data)
+        with self._lock:
+            self._pending[row] = (title, downloaded, total, speed, eta)
+            self._active[row] = (downloaded, total)
+            wake = not self._armed
+            self._armed = True
+        if wake:
+            self._wake.emit()
+
+    def finish(self, row: int) -> None:
+        """Forget ``row`` once its download finished or failed."""
+        with self._lock:
+            self._pending.pop(row, None)
+            self._active.pop(row, None)
+
+    def flush(self) -> int:
+        """Publish the newest state of every updated row.
+
+        Returns:
+            Number of rows published
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            active = list(self._active.values())
+            if not pending:
+                self._armed = False
+        if not pending:
+            self._timer.stop()
+            return 0
+
+        for row, (_, downloaded, total, speed, eta) in pending.items():
+            if row >= 0:
+                self.item_progress.emit(
+                    row, percent_of(downloaded, total), format_speed(speed), format_eta(eta)
+                )
+        known = [(done, total) for done, total in active if total]
+        overall = percent_of(sum(d for d, _ in known), sum(t for _, t in known))
+        self.overall_progress.emit(overall)
+
+        title, downloaded, total, speed, eta = next(reversed(pending.values()))
+        if len(title) > 14:
+            title = title[:14] + "..."
+        if len(active) > 1:
+            self.status.emit(f"Downloading {len(active)} items: {overall:.1f}%")
+        else:
+            self.status.emit(
+                f"Downloading {title}: {percent_of(downloaded, total):.1f}% {format_eta(eta)}"
+            )
+        return len(pending)
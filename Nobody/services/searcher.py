@@ -1,162 +1,434 @@
 """Background search thread for retrieving video metadata."""
 
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
 import yt_dlp
+from yt_dlp.utils import PlaylistEntries
 from PyQt5.QtCore import QThread, pyqtSignal
 
+from ..models.formats import FormatRecord, SearchResult
+from ..utils.cancellation import CancellationToken, OperationCancelled
 from ..utils.logging import logger
+from ..utils.metadata_cache import canonical_video_id, info_cache_key
+from .extractor_session import get_extractor_session
+
+
+def build_search_options(extract_flat=False):
+    """Return the yt_dlp options used for metadata extraction."""
+    return {
+        "quiet": True,
+        "no_warnings": True,
+        "skip_download": True,
+        "ignoreerrors": True,
+        "ignore_no_formats_error": True,
+        "extract_flat": extract_flat,
+        # Entries are consumed as the extractor yields them
+        "lazy_playlist": True,
+        "format": "best[height<=480]/best[height<=720]/best",
+        # Improved timeout and retry settings for better stability
+        "socket_timeout": 20,  # Increased from 10 to 20 seconds
+        "retries": 5,  # Increased from 2 to 5 retries
+        "fragment_retries": 5,  # Increased from 2 to 5 retries
+        "concurrent_fragment_downloads": 1,
+    }
+
+
+def process_formats(video, index=0, cancel_token=None):
+    """Turn a resolved yt_dlp info dict into the format list shown per row.
+
+    Args:
+        video: Resolved info dict with a ``formats`` list
+        index: Playlist position, used for log messages only
+        cancel_token: Optional CancellationToken checked per format
+
+    Returns:
+        List of FormatRecord, audio-only first and largest first per type
+    """
+    raw_formats = video.get("formats", [])
+    processed = []
+
+    if not raw_formats:
+        logger.debug("Video %s has no raw formats from yt_dlp.", index + 1)
+
+    best_audio = None
+    best_audio_bitrate = 0
+
+    for fmt in raw_formats:
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        if not fmt:
+            continue
+
+        record = FormatRecord.from_yt_dlp(fmt)
+        if record is None:
+            continue
+
+        abr = fmt.get("abr") or 0
+        if record.acodec and abr > best_audio_bitrate:
+            best_audio = fmt
+            best_audio_bitrate = abr
+
+        processed.append(record)
+
+    if best_audio:
+        estimated_size = best_audio.get("filesize") or 0
+        estimated = False
+        if estimated_size <= 0:
+            duration = video.get("duration", 0)
+            if duration and best_audio_bitrate:
+                estimated_size = int(duration * best_audio_bitrate * 1000 / 8)
+                estimated = True
+
+        processed.append(
+            FormatRecord(
+                format_id="bestaudio/best",
+                ext="mp3",
+                type_label="Audio-only",
+                acodec="mp3",
+                abr=best_audio_bitrate,
+                filesize=estimated_size,
+                filesize_estimated=estimated,
+                conversion="mp3",
+            )
+        )
+
+    if not processed and raw_formats:
+        logger.warning(
+            "Video %s ('%s') - all formats were filtered out.",
+            index + 1,
+            video.get("title", "N/A"),
+        )
+
+    processed.sort(
+        key=lambda record: (
+            record.type_label != "Audio-only",
+            record.type_label != "Video",
+            record.type_label != "Video-only",
+            -record.filesize,
+        )
+    )
+    return processed
+
+
+def flat_entry_thumbnail(entry):
+    """Return the smallest thumbnail URL available on a flat playlist entry."""
+    if entry.get("thumbnail"):
+        return entry["thumbnail"]
+    thumbnails = [t for t in entry.get("thumbnails") or [] if t.get("url")]
+    return thumbnails[0]["url"] if thumbnails else ""
 
 
 class Searcher(QThread):
-    """Fetch metadata and available formats via yt_dlp."""
+    """Fetch metadata and available formats via yt_dlp.
+
+    Rows are buffered and delivered as ``results_ready`` batches so a large
+    playlist costs a handful of cross-thread events instead of one per row.
+    """
 
-    updated_list = pyqtSignal(str, str, str, list)
+    results_ready = pyqtSignal(list)  # SearchResult batch, in playlist order
     search_progress = pyqtSignal(int, int)
 
-    def __init__(self, url, parent=None):
+    # A batch is flushed when it reaches this many rows or has been
+    # collecting for this many seconds, whichever comes first.
+    RESULT_BATCH_SIZE = 50
+    RESULT_BATCH_INTERVAL = 0.1
+
+    def __init__(self, url, parent=None, max_workers=1, cache=None, lazy=False, session=None):
+        """Initialize search thread.
+
+        Args:
+            url: Video or playlist URL to search
+            parent: Optional parent QObject
+            max_workers: Number of playlist entries resolved concurrently.
+                Entries are always streamed through the pool and delivered
+                in playlist order in batches; 1 resolves one entry at a time.
+            cache: Optional MetadataCache used to skip extraction of videos
+                resolved recently
+            lazy: Emit playlist entries as placeholder rows without formats;
+                formats are then resolved per row on demand
+            session: ExtractorSession providing warm yt_dlp clients;
+                defaults to the process-wide session
+        """
         super().__init__(parent)
         self.url = url
+        self.max_workers = max(1, int(max_workers or 1))
+        self.cache = cache
+        self.lazy = lazy
+        self.session = session or get_extractor_session()
+        self.cancel_token = CancellationToken()
+        self._batch = []
+        self._batch_started = 0.0
+        self._delivered = 0
+        self._progress = None
+        self._progress_sent = None
+
+    def cancel(self):
+        """Ask the search to stop; rows already emitted are kept."""
+        self.cancel_token.cancel()
 
     def run(self):
-        options = {
-            "quiet": True,
-            "no_warnings": True,
-            "skip_download": True,
-            "ignoreerrors": True,
-            "ignore_no_formats_error": True,
-            "extract_flat": False,
-            "format": "best[height<=480]/best[height<=720]/best",
-            # Improved timeout and retry settings for better stability
-            "socket_timeout": 20,  # Increased from 10 to 20 seconds
-            "retries": 5,  # Increased from 2 to 5 retries
-            "fragment_retries": 5,  # Increased from 2 to 5 retries
-            "concurrent_fragment_downloads": 1,
-        }
-        with yt_dlp.YoutubeDL(options) as ydl:
-            try:
-                result = ydl.extract_info(self.url, download=False)
-                if result is None:
-                    logger.debug("yt_dlp result is None.")
-                    self.updated_list.emit("Video/Playlist not found", "", self.url, [])
-                    return
-
-                videos = result.get("entries", [result])
-                if not videos:
-                    logger.debug("No videos/entries found in yt_dlp result.")
-                    self.updated_list.emit(result.get("title", "Video/Playlist not found"), "", self.url, [])
-                    return
-
-                for index, video in enumerate(videos):
-                    if video is None:
-                        logger.debug("Video %s is None, skipping.", index + 1)
-                        continue
-
-                    raw_formats = video.get("formats", [])
-                    processed = []
-
-                    if not raw_formats:
-                        logger.debug("Video %s has no raw formats from yt_dlp.", index + 1)
-
-                    best_audio = None
-                    best_audio_bitrate = 0
-
-                    for fmt in raw_formats:
-                        if not fmt:
-                            continue
-
-                        format_id = fmt.get("format_id")
-                        ext = fmt.get("ext")
-                        if not format_id or not ext or "storyboard" in format_id.lower():
-                            continue
-
-                        filesize = fmt.get("filesize") or fmt.get("filesize_approx") or 0
-                        type_label = "Unknown"
-                        quality_desc: list[str] = []
-
-                        vcodec = fmt.get("vcodec", "none")
-                        acodec = fmt.get("acodec", "none")
-
-                        abr = fmt.get("abr") or 0
-                        if acodec != "none" and abr > best_audio_bitrate:
-                            best_audio = fmt
-                            best_audio_bitrate = abr
-
-                        if vcodec != "none" and acodec != "none":
-                            type_label = "Video"
-                            if fmt.get("width") and fmt.get("height"):
-                                quality_desc.append(f"{fmt.get('width')}x{fmt.get('height')}")
-                            if fmt.get("fps"):
-                                quality_desc.append(f"{fmt.get('fps')}fps")
-                            if fmt.get("vbr"):
-                                quality_desc.append(f"V:{round(fmt.get('vbr'))}k")
-                            elif fmt.get("abr"):
-                                quality_desc.append(f"A:{round(fmt.get('abr'))}k")
-                        elif vcodec != "none":
-                            type_label = "Video-only"
-                            if fmt.get("width") and fmt.get("height"):
-                                quality_desc.append(f"{fmt.get('width')}x{fmt.get('height')}")
-                            if fmt.get("fps"):
-                                quality_desc.append(f"{fmt.get('fps')}fps")
-                            if fmt.get("vbr"):
-                                quality_desc.append(f"V:{round(fmt.get('vbr'))}k")
-                        elif acodec != "none":
-                            type_label = "Audio-only"
-                            if fmt.get("abr"):
-                                quality_desc.append(f"A:{round(fmt.get('abr'))}k")
-
-                        quality_str = " / ".join(filter(None, quality_desc))
-                        filesize_mb = f"{filesize // 1024 // 1024}MB" if filesize > 0 else "N/A"
-                        display_text = (
-                            f"[{type_label}] {ext.upper()} {format_id} "
-                            f"({quality_str if quality_str else 'data'}) - {filesize_mb}"
-                        )
-                        processed.append((display_text, format_id, type_label, filesize))
-
-                    if best_audio:
-                        estimated_size = best_audio.get("filesize", 0)
-                        if estimated_size > 0:
-                            estimated_size_mb = f"{estimated_size // 1024 // 1024}MB"
-                        else:
-                            duration = video.get("duration", 0)
-                            if duration and best_audio_bitrate:
-                                estimated_size = int(duration * best_audio_bitrate * 1000 / 8)
-                                estimated_size_mb = f"~{estimated_size // 1024 // 1024}MB"
-                            else:
-                                estimated_size_mb = "N/A"
-
-                        mp3_quality = f"A:{round(min(320, best_audio_bitrate))}k"
-                        mp3_display = (
-                            f"[Audio-only] MP3 bestaudio (MP3 Conversion / {mp3_quality}) - {estimated_size_mb}"
-                        )
-                        processed.append((mp3_display, "bestaudio/best", "Audio-only", estimated_size))
-
-                    if not processed and raw_formats:
-                        logger.warning(
-                            "Video %s ('%s') - all formats were filtered out.",
-                            index + 1,
-                            video.get("title", "N/A"),
-                        )
-
-                    processed.sort(key=lambda x: (x[2] != "Audio-only", x[2] != "Video", x[2] != "Video-only", -x[3]))
-
-                    self.updated_list.emit(
-                        video.get("title", "No title"),
-                        video.get("thumbnail", ""),
-                        video.get("webpage_url", ""),
-                        processed,
-                    )
-            except (yt_dlp.utils.DownloadError,
-                    yt_dlp.utils.ExtractorError,
-                    yt_dlp.utils.UnsupportedError) as exc:
-                error_msg = f"Video extraction error: {exc}"
-                logger.error(error_msg, exc_info=True)
-                self.updated_list.emit(f"Error: {exc}", "", self.url, [])
-            except (OSError, IOError, ConnectionError) as exc:
-                error_msg = f"Network/IO error: {exc}"
-                logger.error(error_msg, exc_info=True)
-                self.updated_list.emit(f"Connection error: {exc}", "", self.url, [])
-            except Exception as exc:  # noqa: BLE001
-                # Catch-all for unexpected errors
-                error_msg = f"Unexpected search error: {exc}"
-                logger.error(error_msg, exc_info=True)
-                self.updated_list.emit(f"Error: {exc}", "", self.url, [])
+        started = time.perf_counter()
+        try:
+            if self._emit_cached_url():
+                return
+            # Extract without processing so playlist entries stay a lazy
+            # iterator; each entry is resolved and emitted as it arrives.
+            with self.session.client(build_search_options("in_playlist")) as ydl:
+                try:
+                    result = self._extract_unprocessed(ydl, self.url)
+                    if result is None:
+                        logger.debug("yt_dlp result is None.")
+                        self._emit_row(SearchResult("Video/Playlist not found", "", self.url, []))
+                        return
+
+                    if result.get("_type") in ("playlist", "multi_video"):
+                        if not self._stream_entries(ydl, result):
+                            logger.debug("No videos/entries found in yt_dlp result.")
+                            self._emit_row(SearchResult(result.get("title", "Video/Playlist not found"), "", self.url, []))
+                        return
+
+                    video = ydl.process_ie_result(result, download=False)
+                    self._emit_row(self._build_row(0, video))
+                except OperationCancelled:
+                    pass
+                except (yt_dlp.utils.DownloadError,
+                        yt_dlp.utils.ExtractorError,
+                        yt_dlp.utils.UnsupportedError) as exc:
+                    error_msg = f"Video extraction error: {exc}"
+                    logger.error(error_msg, exc_info=True)
+                    self._emit_row(SearchResult(f"Error: {exc}", "", self.url, []))
+                except (OSError, IOError, ConnectionError) as exc:
+                    error_msg = f"Network/IO error: {exc}"
+                    logger.error(error_msg, exc_info=True)
+                    self._emit_row(SearchResult(f"Connection error: {exc}", "", self.url, []))
+                except Exception as exc:  # noqa: BLE001
+                    # Catch-all for unexpected errors
+                    error_msg = f"Unexpected search error: {exc}"
+                    logger.error(error_msg, exc_info=True)
+                    self._emit_row(SearchResult(f"Error: {exc}", "", self.url, []))
+        finally:
+            self._flush_results(force=True)
+            if self.cancel_token.is_cancelled:
+                logger.info(
+                    "Search cancelled (%s); worker stopped %.1f ms after request",
+                    self.url,
+                    self.cancel_token.elapsed_ms(),
+                )
+            session_stats = self.session.stats()
+            logger.info(
+                "Search took %.0f ms (extractor clients: %d created, %d reused)",
+                (time.perf_counter() - started) * 1000,
+                session_stats["created"],
+                session_stats["reused"],
+            )
+            if self.cache is not None:
+                stats = self.cache.stats()
+                logger.info(
+                    "Metadata cache: %d hits, %d misses (%.0f%% hit rate)",
+                    stats["hits"],
+                    stats["misses"],
+                    stats["hit_rate"] * 100,
+                )
+
+    @staticmethod
+    def _extract_unprocessed(ydl, url):
+        result = ydl.extract_info(url, download=False, process=False)
+        # Follow plain redirects (short links etc.) without resolving entries
+        for _ in range(5):
+            if not result or result.get("_type") != "url":
+                break
+            result = ydl.extract_info(
+                result["url"], download=False, ie_key=result.get("ie_key"), process=False
+            )
+        return result
+
+    # Playlist streaming ------------------------------------------------
+
+    def _stream_entries(self, ydl, playlist):
+        """Resolve playlist entries as the extractor yields them.
+
+        Entries are resolved on a bounded pool and emitted in playlist order
+        as soon as they and every entry before them are ready.
+
+        Returns:
+            Number of entries processed
+        """
+        entries = playlist.get("entries")
+        total = playlist.get("playlist_count") or (len(entries) if isinstance(entries, list) else 0)
+        done = 0
+        self._report_progress(done, total)
+        self._flush_results(force=True)
+        logger.info(
+            "Streaming playlist entries (%s total) with %d workers",
+            total or "unknown",
+            self.max_workers,
+        )
+
+        pool = None
+        if not self.lazy:
+            pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="searcher")
+        pending = deque()
+        try:
+            for position, entry in PlaylistEntries(ydl, playlist).get_requested_items():
+                self.cancel_token.raise_if_cancelled()
+                if self.lazy:
+                    self._emit_lazy_entry(position - 1, entry)
+                    done += 1
+                    self._report_progress(done, total)
+                    continue
+                pending.append(pool.submit(self._resolve_entry, position - 1, entry))
+                # Emit finished heads; block only to keep the queue bounded
+                while pending and (pending[0].done() or len(pending) >= self.max_workers * 2):
+                    self.cancel_token.raise_if_cancelled()
+                    self._emit_row(self._await(pending.popleft()))
+                    done += 1
+                    self._report_progress(done, total)
+            while pending:
+                self.cancel_token.raise_if_cancelled()
+                self._emit_row(self._await(pending.popleft()))
+                done += 1
+                self._report_progress(done, total)
+        finally:
+            if pool is not None:
+                # On cancellation drop queued entries and let in-flight
+                # extractions finish in the background.
+                cancelled = self.cancel_token.is_cancelled
+                pool.shutdown(wait=not cancelled, cancel_futures=cancelled)
+        return done
+
+    def _await(self, future):
+        """Return the result of ``future``.
+
+        Rows already buffered are delivered once the batch interval runs
+        out, even while ``future`` is still resolving.
+        """
+        while True:
+            timeout = None
+            if self._batch:
+                elapsed = time.monotonic() - self._batch_started
+                timeout = max(0.0, self.RESULT_BATCH_INTERVAL - elapsed)
+            finished, _ = wait([future], timeout=timeout)
+            if finished:
+                return future.result()
+            self.cancel_token.raise_if_cancelled()
+            self._flush_results()
+
+    def _report_progress(self, done, total):
+        # An unknown or understated total is reported as 0 (indeterminate).
+        # Progress travels with the next batch rather than once per row.
+        self._progress = (done, total if total >= done else 0)
+
+    def _emit_lazy_entry(self, index, entry):
+        """Emit an entry as a placeholder row, using cached formats when fresh."""
+        if not entry:
+            return
+        cached = self.cache.get(info_cache_key(entry)) if self.cache is not None else None
+        if cached:
+            self._emit_row(self._row_from_cache(cached))
+        elif entry.get("_type", "video") == "video" and entry.get("formats"):
+            self._emit_row(self._resolve_entry(index, entry))
+        else:
+            self._emit_row(
+                SearchResult(
+                    entry.get("title") or "No title",
+                    flat_entry_thumbnail(entry),
+                    entry.get("webpage_url") or entry.get("url") or "",
+                    None,
+                )
+            )
+
+    def _resolve_entry(self, index, entry):
+        if not entry or self.cancel_token.is_cancelled:
+            return None
+        if self.cache is not None:
+            cached = self.cache.get(info_cache_key(entry))
+            if cached:
+                return self._row_from_cache(cached)
+        try:
+            with self.session.client(build_search_options()) as ydl:
+                video = ydl.process_ie_result(entry, download=False)
+        except Exception as exc:  # noqa: BLE001
+            if self.cancel_token.is_cancelled:
+                return None
+            logger.warning(
+                "Failed to resolve playlist entry %s: %s",
+                entry.get("url") or entry.get("id"),
+                exc,
+            )
+            return None
+        return self._build_row(index, video)
+
+    # Metadata cache ----------------------------------------------------
+
+    def _emit_cached_url(self):
+        """Serve a single-video URL straight from the cache when fresh."""
+        if self.cache is None:
+            return False
+        cached = self.cache.get(canonical_video_id(self.url))
+        if not cached:
+            return False
+        self._emit_row(self._row_from_cache(cached))
+        return True
+
+    @staticmethod
+    def _row_from_cache(cached):
+        return SearchResult(
+            cached["title"],
+            cached["thumbnail"],
+            cached["webpage_url"],
+            cached["formats"],
+        )
+
+    # Result delivery ---------------------------------------------------
+
+    def _emit_row(self, row):
+        if row is None:
+            return
+        if not self._batch:
+            self._batch_started = time.monotonic()
+        self._batch.append(row)
+        self._flush_results()
+
+    def _flush_results(self, force=False):
+        """Deliver buffered rows and the latest progress.
+
+        The very first row is delivered immediately so the table fills as
+        soon as something is known; later rows wait for a full batch or the
+        batch interval unless ``force`` is set.
+        """
+        if self._batch and (
+            force
+            or not self._delivered
+            or len(self._batch) >= self.RESULT_BATCH_SIZE
+            or time.monotonic() - self._batch_started >= self.RESULT_BATCH_INTERVAL
+        ):
+            batch, self._batch = self._batch, []
+            self._delivered += len(batch)
+            self.results_ready.emit(batch)
+        elif not force:
+            return
+        if self._progress is not None and self._progress != self._progress_sent:
+            self._progress_sent = self._progress
+            self.search_progress.emit(*self._progress)
+
+    # Format processing -------------------------------------------------
+
+    def _build_row(self, index, video):
+        if video is None:
+            logger.debug("Video %s is None, skipping.", index + 1)
+            return None
 
+        processed = process_formats(video, index, self.cancel_token)
+        row = SearchResult(
+            video.get("title", "No title"),
+            video.get("thumbnail", ""),
+            video.get("webpage_url", ""),
+            processed,
+        )
+        if self.cache is not None:
+            self.cache.put(info_cache_key(video), *row[:3], video.get("duration"), processed)
+        # Keep the resolved info so a download can skip re-extraction
+        self.session.resolved.put(video)
+        return row
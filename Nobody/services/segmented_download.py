@@ -0,0 +1,332 @@
+"""Multi-connection HTTP range downloads for single-file progressive formats.
+
+Hosts that throttle each connection cap a progressive (non-DASH) download
+at a fraction of the available bandwidth. SegmentedDownloader splits the
+file into byte ranges, fetches them over a pool of keep-alive connections
+into a preallocated ``.part`` file and verifies the assembled length before
+moving it into place.
+
+SegmentedDownloadPP plugs this into yt_dlp as a ``before_dl`` step: it
+writes the selected format to yt_dlp's temp filename, which yt_dlp then
+treats as already downloaded and hands to its postprocessors. Anything it
+cannot handle is left to yt_dlp's own downloader.
+"""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from yt_dlp.postprocessor.common import PostProcessor
+
+from ..utils.logging import logger
+
+MIN_SEGMENT_SIZE = 2 * 1024 * 1024  # smaller files are not worth splitting
+CHUNK_SIZE = 64 * 1024
+PROGRESS_INTERVAL = 0.1  # seconds between progress hook calls
+PART_SUFFIX = ".seg.part"  # distinct from yt_dlp's .part so it never resumes ours
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+
+class SegmentedDownloadError(Exception):
+    """A segmented download failed or produced a file of the wrong length."""
+
+
+class RangeNotSupported(SegmentedDownloadError):
+    """The server ignored the Range header or did not report a size."""
+
+
+def parse_content_range(value: Optional[str]) -> Optional[Tuple[int, int, Optional[int]]]:
+    """Parse ``bytes start-end/total`` into integers (total None for ``*``)."""
+    match = _CONTENT_RANGE_RE.match(value or "")
+    if not match:
+        return None
+    start, end, total = match.groups()
+    return int(start), int(end), None if total == "*" else int(total)
+
+
+class SegmentedDownloader:
+    """Download one URL with several concurrent range requests.
+
+    Each segment is retried from the last byte written, so a dropped
+    connection only costs the bytes in flight.
+    """
+
+    def __init__(
+        self,
+        connections: int = 4,
+        min_segment_size: int = MIN_SEGMENT_SIZE,
+        chunk_size: int = CHUNK_SIZE,
+        timeout: float = 30.0,
+        retries: int = 3,
+        session: Optional[requests.Session] = None,
+    ):
+        """Initialize downloader.
+
+        Args:
+            connections: Parallel range requests per file
+            min_segment_size: Lower bound for a segment in bytes
+            chunk_size: Bytes read per socket read
+            timeout: Connect/read timeout per request in seconds
+            retries: Attempts per segment after the first one fails
+            session: requests session to use; one with a pool of
+                ``connections`` keep-alive connections is created if omitted
+        """
+        self.connections = max(1, int(connections))
+        self.min_segment_size = max(1, int(min_segment_size))
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.retries = max(0, int(retries))
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.connections)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def probe(self, url: str, headers: Optional[Dict] = None) -> int:
+        """Return the size of ``url`` after checking range support.
+
+        Raises:
+            RangeNotSupported: If the server answers without a 206 and a
+                complete Content-Range
+        """
+        request_headers = dict(headers or {}, Range="bytes=0-0")
+        try:
+            with self.session.get(url, headers=request_headers, stream=True, timeout=self.timeout) as resp:
+                content_range = parse_content_range(resp.headers.get("Content-Range"))
+                if resp.status_code != 206 or content_range is None or content_range[2] is None:
+                    raise RangeNotSupported(f"No byte range support (HTTP {resp.status_code})")
+                return content_range[2]
+        except requests.RequestException as exc:
+            raise SegmentedDownloadError(f"Probe failed: {exc}") from exc
+
+    def plan(self, size: int) -> List[Tuple[int, int]]:
+        """Split ``size`` bytes into inclusive ``(start, end)`` ranges."""
+        if size <= 0:
+            return []
+        count = max(1, min(self.connections, size // self.min_segment_size))
+        step = -(-size // count)
+        return [(start, min(size, start + step) - 1) for start in range(0, size, step)]
+
+    def download(
+        self,
+        url: str,
+        target: str,
+        headers: Optional[Dict] = None,
+        size: Optional[int] = None,
+        progress_hook: Optional[Callable[[Dict], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> int:
+        """Download ``url`` to ``target``.
+
+        Args:
+            url: Direct media URL
+            target: Final file path; written via ``target + PART_SUFFIX``
+            headers: HTTP headers sent with every request
+            size: Expected size; probed if omitted, and checked against the
+                server's Content-Range either way
+            progress_hook: Called from this thread with yt_dlp-shaped dicts
+            cancel_event: Set to abort the download
+
+        Returns:
+            Number of bytes written
+
+        Raises:
+            RangeNotSupported: If the server cannot serve byte ranges
+            SegmentedDownloadError: If a segment fails after its retries or
+                the assembled file has the wrong length
+        """
+        headers = dict(headers or {})
+        probed = self.probe(url, headers)
+        if size is not None and size != probed:
+            logger.debug("Expected %d bytes for %s, server reports %d", size, url, probed)
+        size = probed
+        part_path = target + PART_SUFFIX
+        with open(part_path, "wb") as f:
+            f.truncate(size)
+
+        segments = self.plan(size)
+        cancel_event = cancel_event or threading.Event()
+        counter = _ByteCounter()
+        started = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=len(segments) or 1, thread_name_prefix="segment") as pool:
+                futures = [
+                    pool.submit(self._fetch, url, headers, part_path, start, end, size, counter, cancel_event)
+                    for start, end in segments
+                ]
+                pending = futures
+                while pending:
+                    done, pending = wait(pending, timeout=PROGRESS_INTERVAL, return_when=FIRST_EXCEPTION)
+                    if any(future.exception() for future in done):
+                        cancel_event.set()
+                        break
+                    if progress_hook is not None:
+                        progress_hook(self._progress(target, part_path, counter.value, size, started))
+                written = sum(future.result() for future in futures)
+            actual = os.path.getsize(part_path)
+            if written != size or actual != size:
+                raise SegmentedDownloadError(
+                    f"Assembled {written} bytes into a {actual} byte file, expected {size}"
+                )
+            os.replace(part_path, target)
+        except Exception:
+            self._discard(part_path)
+            raise
+
+        if progress_hook is not None:
+            progress_hook({
+                "status": "finished",
+                "downloaded_bytes": size,
+                "total_bytes": size,
+                "elapsed": time.monotonic() - started,
+                "filename": target,
+            })
+        logger.info(
+            "Segmented download of %s: %d bytes over %d connection(s) in %.1fs",
+            os.path.basename(target), size, len(segments), time.monotonic() - started,
+        )
+        return size
+
+    # Internal helpers -------------------------------------------------
+
+    def _fetch(self, url, headers, part_path, start, end, size, counter, cancel_event) -> int:
+        """Fetch ``start``-``end`` into ``part_path``; return the bytes written."""
+        offset = start
+        failures = 0
+        while offset <= end:
+            if cancel_event.is_set():
+                raise SegmentedDownloadError("Cancelled")
+            request_headers = dict(headers, Range=f"bytes={offset}-{end}")
+            try:
+                with self.session.get(
+                    url, headers=request_headers, stream=True, timeout=self.timeout
+                ) as resp:
+                    content_range = parse_content_range(resp.headers.get("Content-Range"))
+                    if resp.status_code != 206 or content_range is None:
+                        raise RangeNotSupported(f"Range request answered with HTTP {resp.status_code}")
+                    if content_range[0] != offset or content_range[2] not in (None, size):
+                        raise SegmentedDownloadError(
+                            f"Server returned range {resp.headers.get('Content-Range')} "
+                            f"for bytes={offset}-{end}"
+                        )
+                    with open(part_path, "r+b") as f:
+                        f.seek(offset)
+                        for chunk in resp.iter_content(self.chunk_size):
+                            if cancel_event.is_set():
+                                raise SegmentedDownloadError("Cancelled")
+                            if offset + len(chunk) > end + 1:
+                                raise SegmentedDownloadError("Server sent more bytes than requested")
+                            f.write(chunk)
+                            offset += len(chunk)
+                            counter.add(len(chunk))
+            except requests.RequestException as exc:
+                failures += 1
+                if failures > self.retries:
+                    raise SegmentedDownloadError(f"Segment {start}-{end} failed: {exc}") from exc
+                logger.debug("Retrying segment %d-%d at %d: %s", start, end, offset, exc)
+                continue
+            if offset <= end:
+                # Connection closed early: resume the segment where it stopped
+                failures += 1
+                if failures > self.retries:
+                    raise SegmentedDownloadError(f"Segment {start}-{end} stopped at {offset}")
+        return offset - start
+
+    @staticmethod
+    def _progress(target: str, part_path: str, downloaded: int, size: int, started: float) -> Dict:
+        elapsed = time.monotonic() - started
+        speed = downloaded / elapsed if elapsed > 0 else None
+        return {
+            "status": "downloading",
+            "downloaded_bytes": downloaded,
+            "total_bytes": size,
+            "speed": speed,
+            "eta": (size - downloaded) / speed if speed else None,
+            "elapsed": elapsed,
+            "filename": target,
+            "tmpfilename": part_path,
+        }
+
+    @staticmethod
+    def _discard(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class _ByteCounter:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def add(self, count: int) -> None:
+        with self._lock:
+            self.value += count
+
+
+class SegmentedDownloadPP(PostProcessor):
+    """yt_dlp ``before_dl`` step that fetches large progressive formats in segments.
+
+    Reads ``segmented_connections`` from the YoutubeDL params. Merged
+    formats, fragmented protocols and small files are left untouched.
+    """
+
+    def __init__(self, downloader=None, min_size: int = 2 * MIN_SEGMENT_SIZE):
+        super().__init__(downloader)
+        self.min_size = min_size
+
+    def run(self, info):
+        connections = int(self.get_param("segmented_connections") or 1)
+        if connections <= 1 or not self._eligible(info):
+            return [], info
+        ydl = self._downloader
+        target = ydl.prepare_filename(info, "temp")
+        if os.path.exists(target):
+            return [], info
+        directory = os.path.dirname(os.path.abspath(target))
+        os.makedirs(directory, exist_ok=True)
+
+        def hook(data):
+            if data["status"] != "downloading":
+                return  # yt_dlp reports the finished file itself
+            data["info_dict"] = info
+            for progress_hook in ydl._progress_hooks:
+                progress_hook(data)
+
+        downloader = SegmentedDownloader(
+            connections=connections,
+            timeout=self.get_param("socket_timeout") or 30.0,
+            retries=min(int(self.get_param("retries") or 3), 10),
+        )
+        try:
+            downloader.download(
+                info["url"],
+                target,
+                headers=info.get("http_headers"),
+                size=info.get("filesize"),
+                progress_hook=hook,
+            )
+        except SegmentedDownloadError as exc:
+            logger.warning("Segmented download unavailable (%s); using yt_dlp's downloader", exc)
+        finally:
+            downloader.session.close()
+        return [], info
+
+    def _eligible(self, info: Dict) -> bool:
+        if info.get("requested_formats") or info.get("fragments") or not info.get("url"):
+            return False
+        if info.get("protocol") not in ("http", "https"):
+            return False
+        # Unknown sizes are probed by the downloader
+        size = info.get("filesize") or info.get("filesize_approx")
+        return not size or size >= self.min_size
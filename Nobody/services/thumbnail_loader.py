@@ -0,0 +1,180 @@
+"""Background thumbnail fetching and decoding for the video table."""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+import requests
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QObject, QSize, Qt, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from ..utils.http_client import HttpClient, get_http_client
+from ..utils.logging import logger
+from ..utils.metadata_cache import canonical_video_id
+from ..utils.thumbnail_cache import ThumbnailCache, thumbnail_cache_key
+
+THUMBNAIL_SIZE = QSize(30, 30)
+
+
+def decode_thumbnail(data: bytes, size: QSize = THUMBNAIL_SIZE) -> QImage:
+    """Decode image bytes and scale them to fit ``size``.
+
+    Uses QImage, which unlike QPixmap may be used outside the GUI thread.
+
+    Returns:
+        The scaled image, or a null QImage if ``data`` is not an image
+    """
+    image = QImage.fromData(data)
+    if image.isNull():
+        return image
+    return image.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def encode_png(image: QImage) -> bytes:
+    """Return ``image`` as PNG bytes."""
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    buffer.close()
+    return bytes(data)
+
+
+class ThumbnailLoader(QObject):
+    """Fetch and decode thumbnails in a background pool.
+
+    Each URL is fetched once however many rows request it while it is in
+    flight, and the scaled result is kept in an optional on-disk
+    ThumbnailCache so later sessions skip the download. Signals are
+    emitted from worker threads; Qt queues them to receivers living on the
+    GUI thread, which turn the image into a pixmap.
+    """
+
+    thumbnail_ready = pyqtSignal(str, QImage)  # url, scaled image
+    thumbnail_failed = pyqtSignal(str, str)  # url, message
+
+    def __init__(
+        self,
+        parent=None,
+        max_workers: int = 4,
+        size: QSize = THUMBNAIL_SIZE,
+        timeout: float = 10.0,
+        cache: Optional[ThumbnailCache] = None,
+        http_client: Optional[HttpClient] = None,
+    ):
+        """Initialize loader.
+
+        Args:
+            parent: Optional parent QObject
+            max_workers: Concurrent thumbnail fetches
+            size: Bounding box the images are scaled into
+            timeout: Per-request timeout in seconds
+            cache: Disk cache for scaled images; None disables it
+            http_client: Pooled client to fetch with; defaults to the
+                process-wide client
+        """
+        super().__init__(parent)
+        self.size = size
+        self.timeout = timeout
+        self.cache = cache
+        self.http = http_client or get_http_client()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers or 1)),
+            thread_name_prefix="thumbnail",
+        )
+        self._in_flight: Dict[str, Optional[Future]] = {}
+        self._lock = threading.Lock()
+
+    def request(self, url: str, video_url: str = "") -> bool:
+        """Queue ``url`` unless it is already in flight.
+
+        Args:
+            url: Thumbnail URL
+            video_url: Page URL of the video; its canonical ID keys the disk
+                cache so differently signed thumbnail URLs share an entry
+
+        Returns:
+            True if a new fetch was queued
+        """
+        if not url:
+            return False
+        with self._lock:
+            if url in self._in_flight:
+                return False
+            self._in_flight[url] = None
+        try:
+            future = self._pool.submit(self._load, url, video_url)
+        except RuntimeError:
+            # Pool already shut down during application exit
+            with self._lock:
+                self._in_flight.pop(url, None)
+            return False
+        with self._lock:
+            if url in self._in_flight:
+                self._in_flight[url] = future
+        return True
+
+    def cancel(self, url: str) -> bool:
+        """Drop a queued fetch of ``url``.
+
+        Returns:
+            True if the fetch had not started and will not run
+        """
+        with self._lock:
+            future = self._in_flight.get(url)
+            if future is None or not future.cancel():
+                return False
+            del self._in_flight[url]
+            return True
+
+    def stats(self) -> Dict:
+        """Return the disk cache counters (empty without a cache)."""
+        return self.cache.stats() if self.cache is not None else {}
+
+    def shutdown(self) -> None:
+        """Drop queued fetches without waiting for running ones."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self.cache is not None:
+            logger.info("Thumbnail cache: %s", self.cache.stats())
+
+    def _fetch(self, url: str) -> bytes:
+        return self.http.get(url, timeout=self.timeout)
+
+    def _cached(self, key: str) -> Optional[QImage]:
+        data = self.cache.get(key)
+        if data is None:
+            return None
+        image = QImage.fromData(data)
+        return None if image.isNull() else image
+
+    def _load(self, url: str, video_url: str = "") -> None:
+        image, error = None, None
+        try:
+            key = None
+            if self.cache is not None:
+                source = canonical_video_id(video_url) if video_url else None
+                key = thumbnail_cache_key(source or url, self.size.width(), self.size.height())
+                image = self._cached(key)
+            if image is None:
+                image = decode_thumbnail(self._fetch(url), self.size)
+                if image.isNull():
+                    image, error = None, "Not an image"
+                elif key is not None:
+                    self.cache.put(key, encode_png(image))
+        except requests.exceptions.Timeout:
+            logger.warning("Thumbnail request timed out: %s", url)
+            error = "Timed out"
+        except requests.exceptions.RequestException as exc:
+            logger.warning("Thumbnail download failed: %s - %s", url, exc)
+            error = str(exc)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Thumbnail processing error: %s", exc)
+            error = str(exc)
+        # Leave the in-flight set first so a row added after the signal can
+        # request the URL again
+        with self._lock:
+            self._in_flight.pop(url, None)
+        if image is not None:
+            self.thumbnail_ready.emit(url, image)
+        else:
+            self.thumbnail_failed.emit(url, error)
@@ -0,0 +1,154 @@
+"""Audio transcode stage that runs ffmpeg alongside the download workers."""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from ..utils.ffmpeg import find_ffmpeg_executable
+from ..utils.logging import logger
+
+# Hide the console window ffmpeg would otherwise open on Windows
+_CREATION_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0) if sys.platform.startswith("win") else 0
+
+
+class StageStats:
+    """Busy-time accounting for one pipeline stage.
+
+    Utilisation is the share of the stage's capacity (slots x wall time
+    since the first job) spent working. A stage close to 100% while the
+    other idles is the bottleneck.
+    """
+
+    def __init__(self, name: str, capacity: int = 1):
+        self.name = name
+        self.capacity = max(1, int(capacity))
+        self.jobs = 0
+        self.busy_seconds = 0.0
+        self._started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def busy(self):
+        """Time one job of this stage."""
+        started = time.monotonic()
+        with self._lock:
+            if self._started is None:
+                self._started = started
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.jobs += 1
+                self.busy_seconds += time.monotonic() - started
+
+    def utilisation(self) -> float:
+        """Return the busy fraction (0-1) since the first job."""
+        with self._lock:
+            if self._started is None:
+                return 0.0
+            elapsed = time.monotonic() - self._started
+            return min(1.0, self.busy_seconds / (elapsed * self.capacity)) if elapsed > 0 else 0.0
+
+    def snapshot(self) -> Dict:
+        """Return counters for logging."""
+        utilisation = self.utilisation()
+        with self._lock:
+            return {
+                "stage": self.name,
+                "capacity": self.capacity,
+                "jobs": self.jobs,
+                "busy_seconds": self.busy_seconds,
+                "utilisation": utilisation,
+            }
+
+    def reset(self) -> None:
+        """Start a new measurement window."""
+        with self._lock:
+            self.jobs = 0
+            self.busy_seconds = 0.0
+            self._started = None
+
+
+def transcode_to_mp3(source: str, target: str, ffmpeg_path: str, bitrate: str = "320k") -> int:
+    """Encode ``source`` to an MP3 at ``target`` and delete the source.
+
+    Args:
+        source: Downloaded audio/video file
+        target: Output MP3 path
+        ffmpeg_path: FFmpeg executable
+        bitrate: libmp3lame bitrate (same as FFmpegExtractAudio at quality 320)
+
+    Returns:
+        Size of the encoded file in bytes
+
+    Raises:
+        OSError: If ffmpeg cannot be started or fails
+    """
+    command = [
+        ffmpeg_path, "-y", "-loglevel", "error", "-i", source,
+        "-vn", "-codec:a", "libmp3lame", "-b:a", bitrate, target,
+    ]
+    result = subprocess.run(
+        command,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        creationflags=_CREATION_FLAGS,
+    )
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", "replace").strip()
+        raise OSError(f"ffmpeg exited with {result.returncode}: {message[-500:]}")
+    if os.path.abspath(source) != os.path.abspath(target):
+        try:
+            os.remove(source)
+        except OSError as exc:
+            logger.debug("Could not remove transcode source %s: %s", source, exc)
+    return os.path.getsize(target)
+
+
+class Transcoder:
+    """Pool of ffmpeg encoder processes, one slot per CPU core.
+
+    Each slot supervises its own ffmpeg child process, so encodes run in
+    parallel with each other and with the download workers; the download
+    worker that handed off a file is free to fetch the next item.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, ffmpeg_path: Optional[str] = None):
+        """Initialize transcoder.
+
+        Args:
+            max_workers: Concurrent encodes; defaults to the CPU count
+            ffmpeg_path: FFmpeg executable; resolved like the downloader's
+        """
+        self.max_workers = max(1, int(max_workers or os.cpu_count() or 1))
+        self.ffmpeg_path = ffmpeg_path or find_ffmpeg_executable()
+        self.stats = StageStats("transcode", self.max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="transcode"
+        )
+
+    def submit(self, source: str, target: str) -> Future:
+        """Queue an MP3 encode.
+
+        Returns:
+            Future resolving to the encoded file size
+        """
+        return self._executor.submit(self._run, source, target)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting work; queued encodes are cancelled unless waiting."""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _run(self, source: str, target: str) -> int:
+        with self.stats.busy():
+            started = time.perf_counter()
+            size = transcode_to_mp3(source, target, self.ffmpeg_path)
+        logger.info(
+            "Transcoded %s in %.1f s", os.path.basename(target), time.perf_counter() - started
+        )
+        return size
@@ -8,7 +8,10 @@ from .ffmpeg import (
     get_ffmpeg_download_url,
     download_ffmpeg_quietly,
 )
-from .sanitize import sanitize_filename, validate_url, sanitize_url
+from .metadata_cache import MetadataCache, get_metadata_cache, canonical_video_id
+from .thumbnail_cache import ThumbnailCache, get_thumbnail_cache
+from .http_client import HttpClient, get_http_client
+from .sanitize import sanitize_filename, validate_url, sanitize_url, parse_url_list, host_of
 from .notifications import NotificationManager
 
 __all__ = [
@@ -19,9 +22,18 @@ __all__ = [
     "check_ffmpeg_exists",
     "get_ffmpeg_download_url",
     "download_ffmpeg_quietly",
+    "MetadataCache",
+    "get_metadata_cache",
+    "canonical_video_id",
+    "ThumbnailCache",
+    "get_thumbnail_cache",
+    "HttpClient",
+    "get_http_client",
     "sanitize_filename",
     "validate_url",
     "sanitize_url",
+    "parse_url_list",
+    "host_of",
     "NotificationManager",
 ]
 
@@ -0,0 +1,39 @@
+"""Cooperative cancellation helpers for background work."""
+
+import threading
+import time
+from typing import Optional
+
+
+class OperationCancelled(Exception):
+    """Raised inside a worker once its cancellation token has been set."""
+
+
+class CancellationToken:
+    """Thread-safe flag that workers poll between units of work."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.cancelled_at: Optional[float] = None
+
+    def cancel(self) -> None:
+        """Request cancellation; repeated calls keep the first timestamp."""
+        if not self._event.is_set():
+            self.cancelled_at = time.monotonic()
+            self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Return True once cancel() has been called."""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise OperationCancelled if cancellation was requested."""
+        if self._event.is_set():
+            raise OperationCancelled()
+
+    def elapsed_ms(self) -> float:
+        """Milliseconds since cancel() was called (0 if not cancelled)."""
+        if self.cancelled_at is None:
+            return 0.0
+        return (time.monotonic() - self.cancelled_at) * 1000
@@ -3,12 +3,17 @@
 import os
 import shutil
 import sys
-import urllib.request
 import zipfile
 import tempfile
+from .http_client import get_http_client
 from .logging import logger
 
 
+def _download(url: str, path: str) -> None:
+    """Fetch ``url`` to ``path`` through the shared HTTP client."""
+    get_http_client().download(url, path, timeout=60)
+
+
 def find_ffmpeg_executable() -> str:
     """Find FFmpeg executable path relative to the application."""
     if getattr(sys, "frozen", False):
@@ -52,7 +57,7 @@ def download_ffmpeg_quietly(base_path: str) -> bool:
             url = "https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-master-latest-win64-gpl.zip"
             temp_zip = os.path.join(tempfile.gettempdir(), "ffmpeg_download.zip")
 
-            urllib.request.urlretrieve(url, temp_zip)
+            _download(url, temp_zip)
 
             temp_extract = os.path.join(tempfile.gettempdir(), "ffmpeg_extract")
             os.makedirs(temp_extract, exist_ok=True)
@@ -79,8 +84,8 @@ def download_ffmpeg_quietly(base_path: str) -> bool:
             ffmpeg_zip = os.path.join(temp_dir, "ffmpeg_mac.zip")
             ffprobe_zip = os.path.join(temp_dir, "ffprobe_mac.zip")
 
-            urllib.request.urlretrieve(ffmpeg_url, ffmpeg_zip)
-            urllib.request.urlretrieve(ffprobe_url, ffprobe_zip)
+            _download(ffmpeg_url, ffmpeg_zip)
+            _download(ffprobe_url, ffprobe_zip)
 
             temp_extract_ffmpeg = os.path.join(temp_dir, "ffmpeg_extract")
             temp_extract_ffprobe = os.path.join(temp_dir, "ffprobe_extract")
@@ -0,0 +1,239 @@
+"""Shared HTTP client for auxiliary fetches (thumbnails, tool downloads).
+
+One keep-alive connection pool serves every caller, so repeated requests
+to the same host skip the TCP/TLS handshake. On top of the pool the client
+limits concurrent requests per host, lets identical concurrent GETs share
+a single response and revalidates remembered bodies with ETag /
+Last-Modified instead of downloading them again.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .sanitize import host_of
+
+DEFAULT_TIMEOUT = 15.0
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+
+class _Call:
+    """A GET in flight that identical requests wait on."""
+
+    __slots__ = ("done", "content", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.content: Optional[bytes] = None
+        self.error: Optional[BaseException] = None
+
+
+class _Validated:
+    """A remembered body with the validators needed to revalidate it."""
+
+    __slots__ = ("etag", "last_modified", "content")
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], content: bytes):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content = content
+
+
+class HttpClient:
+    """Pooled, per-host limited HTTP client. Thread-safe."""
+
+    def __init__(
+        self,
+        pool_maxsize: int = 16,
+        max_per_host: int = 6,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = 2,
+        revalidate_bytes: int = 8 * 1024 * 1024,
+        max_body_bytes: int = 512 * 1024,
+    ):
+        """Initialize client.
+
+        Args:
+            pool_maxsize: Keep-alive connections kept per host
+            max_per_host: Concurrent requests per host
+            timeout: Default connect/read timeout in seconds
+            retries: Retries for connection errors and 502/503/504
+            revalidate_bytes: Memory budget for bodies kept for conditional
+                requests (least recently used are dropped)
+            max_body_bytes: Largest body kept for revalidation
+        """
+        self.max_per_host = max(1, int(max_per_host))
+        self.timeout = timeout
+        self.revalidate_bytes = revalidate_bytes
+        self.max_body_bytes = max_body_bytes
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=max(1, int(pool_maxsize)),
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=("GET", "HEAD"),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.requests = 0
+        self.coalesced = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._in_flight: Dict[str, _Call] = {}
+        self._validated: "OrderedDict[str, _Validated]" = OrderedDict()
+        self._validated_bytes = 0
+
+    def get(self, url: str, timeout: Optional[float] = None) -> bytes:
+        """Return the body of ``url``.
+
+        Concurrent calls for the same URL share one request; a body seen
+        before is revalidated with If-None-Match / If-Modified-Since.
+
+        Raises:
+            requests.RequestException: On network errors and HTTP error statuses
+        """
+        with self._lock:
+            call = self._in_flight.get(url)
+            leader = call is None
+            if leader:
+                call = self._in_flight[url] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.content
+        try:
+            call.content = self._fetch(url, timeout or self.timeout)
+            return call.content
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(url, None)
+            call.done.set()
+
+    def download(self, url: str, path: str, timeout: Optional[float] = None) -> int:
+        """Stream ``url`` to ``path`` (written via a temporary file).
+
+        Returns:
+            Number of bytes written
+
+        Raises:
+            requests.RequestException: On network errors and HTTP error statuses
+        """
+        tmp_path = f"{path}.part"
+        written = 0
+        with self._host_slot(url):
+            with self.session.get(url, stream=True, timeout=timeout or self.timeout) as response:
+                self._count_request()
+                response.raise_for_status()
+                try:
+                    with open(tmp_path, "wb") as f:
+                        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                            written += len(chunk)
+                    os.replace(tmp_path, path)
+                except Exception:
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+                    raise
+        return written
+
+    def stats(self) -> Dict:
+        """Return request counters for diagnostics."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "not_modified": self.not_modified,
+                "remembered": len(self._validated),
+                "remembered_bytes": self._validated_bytes,
+            }
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+    # Internal helpers -------------------------------------------------
+
+    @contextmanager
+    def _host_slot(self, url: str):
+        host = host_of(url)
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+        with slot:
+            yield
+
+    def _count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def _fetch(self, url: str, timeout: float) -> bytes:
+        with self._lock:
+            known = self._validated.get(url)
+            if known is not None:
+                self._validated.move_to_end(url)
+        headers = {}
+        if known is not None:
+            if known.etag:
+                headers["If-None-Match"] = known.etag
+            if known.last_modified:
+                headers["If-Modified-Since"] = known.last_modified
+        with self._host_slot(url):
+            response = self.session.get(url, headers=headers, timeout=timeout)
+            self._count_request()
+        if response.status_code == 304 and known is not None:
+            with self._lock:
+                self.not_modified += 1
+            return known.content
+        response.raise_for_status()
+        content = response.content
+        self._remember(url, response, content)
+        return content
+
+    def _remember(self, url: str, response: requests.Response, content: bytes) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not (etag or last_modified) or len(content) > self.max_body_bytes:
+            return
+        with self._lock:
+            previous = self._validated.pop(url, None)
+            if previous is not None:
+                self._validated_bytes -= len(previous.content)
+            self._validated[url] = _Validated(etag, last_modified, content)
+            self._validated_bytes += len(content)
+            while self._validated_bytes > self.revalidate_bytes and self._validated:
+                _, dropped = self._validated.popitem(last=False)
+                self._validated_bytes -= len(dropped.content)
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide HTTP client, creating it on first use."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
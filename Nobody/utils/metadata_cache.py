@@ -0,0 +1,247 @@
+"""Persistent SQLite cache for processed video metadata."""
+
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from ..models.formats import FormatRecord
+from .cache import resolve_writable_cache_dir
+from .logging import logger
+
+# Bump when the stored format payload changes shape; older rows are dropped.
+SCHEMA_VERSION = 2
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+_extractor_classes = None
+_extractor_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4096)
+def canonical_video_id(url: str) -> Optional[str]:
+    """Return the ``"<extractor> <id>"`` key for a URL without network access.
+
+    Uses the same extractor matching as yt_dlp (and the same key layout as
+    its download archive), so ``youtu.be/x`` and ``youtube.com/watch?v=x``
+    map to the same entry. Results are memoized because matching an
+    unknown host walks every extractor pattern.
+
+    Args:
+        url: Video URL
+
+    Returns:
+        Canonical key, or None if no specific extractor matches the URL
+    """
+    global _extractor_classes
+    if not url:
+        return None
+    with _extractor_lock:
+        if _extractor_classes is None:
+            from yt_dlp.extractor import gen_extractor_classes
+
+            _extractor_classes = [
+                ie for ie in gen_extractor_classes() if ie.ie_key() != "Generic"
+            ]
+    for ie in _extractor_classes:
+        try:
+            if not ie.suitable(url):
+                continue
+            video_id = ie.get_temp_id(url)
+        except Exception:  # noqa: BLE001
+            continue
+        if video_id:
+            return f"{ie.ie_key().lower()} {video_id}"
+        return None
+    return None
+
+
+def info_cache_key(info: Dict) -> Optional[str]:
+    """Return the canonical key for a yt_dlp info dict or flat playlist entry."""
+    if not info:
+        return None
+    extractor = info.get("extractor_key") or info.get("ie_key")
+    video_id = info.get("id")
+    if extractor and video_id:
+        return f"{extractor.lower()} {video_id}"
+    return canonical_video_id(info.get("webpage_url") or info.get("url") or "")
+
+
+class MetadataCache:
+    """Store processed format lists per canonical video ID with a TTL.
+
+    The cache is shared between search threads, so all access goes through
+    a single connection guarded by a lock.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        """Open (or create) the cache database.
+
+        Args:
+            path: Database path; defaults to the application cache directory
+            ttl_seconds: Age after which an entry is considered stale
+        """
+        self.path = path or self._get_cache_file_path()
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+        self._init_schema()
+
+    def _get_cache_file_path(self) -> str:
+        """Return the filesystem path for the metadata database."""
+        cache_dir = resolve_writable_cache_dir("Nobody 3")
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir, exist_ok=True)
+        return os.path.join(cache_dir, "metadata.sqlite3")
+
+    def _init_schema(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS videos")
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS videos (
+                    video_key TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    thumbnail TEXT NOT NULL,
+                    webpage_url TEXT NOT NULL,
+                    duration REAL,
+                    formats TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+
+    def get(self, video_key: Optional[str]) -> Optional[Dict]:
+        """Return a fresh cached entry, or None on a miss or stale entry.
+
+        Args:
+            video_key: Canonical video key
+
+        Returns:
+            Dict with title, thumbnail, webpage_url, duration and formats
+        """
+        if not video_key:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT title, thumbnail, webpage_url, duration, formats, updated_at "
+                    "FROM videos WHERE video_key = ?",
+                    (video_key,),
+                ).fetchone()
+                fresh = row is not None and time.time() - row[5] <= self.ttl_seconds
+                if fresh:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            if not fresh:
+                return None
+            return {
+                "title": row[0],
+                "thumbnail": row[1],
+                "webpage_url": row[2],
+                "duration": row[3],
+                "formats": [FormatRecord.from_dict(item) for item in json.loads(row[4])],
+            }
+        except (sqlite3.Error, ValueError, TypeError) as exc:
+            logger.warning("Metadata cache read failed for %s: %s", video_key, exc)
+            return None
+
+    def put(
+        self,
+        video_key: Optional[str],
+        title: str,
+        thumbnail: str,
+        webpage_url: str,
+        duration: Optional[float],
+        formats: List,
+    ) -> None:
+        """Insert or refresh an entry.
+
+        Args:
+            video_key: Canonical video key
+            title: Video title
+            thumbnail: Thumbnail URL
+            webpage_url: Canonical page URL
+            duration: Duration in seconds (optional)
+            formats: FormatRecord list as emitted by the Searcher
+        """
+        if not video_key or not formats:
+            return
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        video_key,
+                        title or "",
+                        thumbnail or "",
+                        webpage_url or "",
+                        duration,
+                        json.dumps([record.to_dict() for record in formats], ensure_ascii=False),
+                        time.time(),
+                    ),
+                )
+        except (sqlite3.Error, TypeError, ValueError) as exc:
+            logger.warning("Metadata cache write failed for %s: %s", video_key, exc)
+
+    def purge_expired(self) -> int:
+        """Delete stale entries.
+
+        Returns:
+            Number of removed entries
+        """
+        try:
+            with self._lock, self._conn:
+                cursor = self._conn.execute(
+                    "DELETE FROM videos WHERE updated_at < ?",
+                    (time.time() - self.ttl_seconds,),
+                )
+                return cursor.rowcount
+        except sqlite3.Error as exc:
+            logger.warning("Metadata cache purge failed: %s", exc)
+            return 0
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters for tuning the TTL."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_shared_cache: Optional[MetadataCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_metadata_cache(ttl_seconds: int = DEFAULT_TTL_SECONDS) -> Optional[MetadataCache]:
+    """Return the process-wide metadata cache, creating it on first use.
+
+    Returns:
+        Shared MetadataCache, or None if the database cannot be opened
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            try:
+                _shared_cache = MetadataCache(ttl_seconds=ttl_seconds)
+            except (sqlite3.Error, OSError) as exc:
+                logger.error("Failed to open metadata cache: %s", exc)
+                return None
+        _shared_cache.ttl_seconds = ttl_seconds
+        return _shared_cache
@@ -2,7 +2,8 @@
 
 import re
 import sys
-from typing import Optional
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
 
 
 # Windows reserved names that cannot be used as filenames
@@ -150,3 +151,43 @@ def sanitize_url(url: str) -> str:
             url = f"https://{url}"
     
     return url
+
+
+def host_of(url: str) -> str:
+    """Return the lower-case host of ``url`` with ``www.`` stripped.
+
+    Used to group requests per host (rate limits, connection caps).
+    """
+    host = (urlparse(url or "").hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def parse_url_list(text: str) -> Tuple[List[str], List[str]]:
+    """Split pasted or imported text into individual URLs.
+
+    URLs may be separated by newlines, whitespace or commas. Exact
+    duplicates are dropped while keeping the original order.
+
+    Args:
+        text: Raw text from the search field or a URL list file
+
+    Returns:
+        A tuple of (urls, rejected)
+        - urls: Sanitized, valid URLs in input order
+        - rejected: Tokens that did not look like URLs
+    """
+    urls: List[str] = []
+    rejected: List[str] = []
+    seen = set()
+    for token in re.split(r"[\s,]+", text or ""):
+        if not token or token.startswith("#"):
+            continue
+        is_valid, _ = validate_url(token)
+        if not is_valid:
+            rejected.append(token)
+            continue
+        url = sanitize_url(token)
+        if url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls, rejected
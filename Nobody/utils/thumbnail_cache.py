@@ -0,0 +1,159 @@
+"""Size-bounded on-disk cache of scaled thumbnails with LRU eviction."""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .cache import resolve_writable_cache_dir
+from .logging import logger
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+_SUFFIX = ".png"
+
+
+def thumbnail_cache_key(source: str, width: int, height: int) -> str:
+    """Return the file key for a thumbnail of ``source`` at a given size.
+
+    Args:
+        source: Canonical video key if known, otherwise the thumbnail URL
+        width: Bounding box width the image was scaled into
+        height: Bounding box height the image was scaled into
+    """
+    digest = hashlib.sha1(source.encode("utf-8")).hexdigest()
+    return f"{digest}-{width}x{height}"
+
+
+class ThumbnailCache:
+    """Store already-scaled thumbnail images as files under a byte budget.
+
+    The least recently used files are deleted once the total size exceeds
+    ``max_bytes``. Recency survives restarts through file modification
+    times, which are refreshed on every hit. Thread-safe.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Open (or create) the cache directory.
+
+        Args:
+            directory: Cache directory; defaults to ``thumbnails`` inside
+                the application cache directory
+            max_bytes: Total size kept on disk
+        """
+        self.directory = directory or os.path.join(resolve_writable_cache_dir("Nobody 3"), "thumbnails")
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_bytes = max(0, int(max_bytes))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._lock = threading.Lock()
+        self._scan()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def _scan(self) -> None:
+        found = []
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith(_SUFFIX):
+                        stat = entry.stat()
+                        found.append((stat.st_mtime, entry.name[: -len(_SUFFIX)], stat.st_size))
+        except OSError as exc:
+            logger.warning("Failed to scan thumbnail cache: %s", exc)
+        with self._lock:
+            for _, key, size in sorted(found):
+                self._entries[key] = size
+                self.total_bytes += size
+            self._evict_locked()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored image bytes for ``key`` and mark it recently used."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.total_bytes -= self._entries.pop(key, 0)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store ``data`` under ``key`` and evict old entries beyond the budget."""
+        if not data or len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning("Failed to write thumbnail cache entry: %s", exc)
+            return
+        with self._lock:
+            self.total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        while self.total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and the current disk usage."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+_shared_cache: Optional[ThumbnailCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_thumbnail_cache() -> Optional[ThumbnailCache]:
+    """Return the process-wide thumbnail cache, creating it on first use.
+
+    Returns:
+        Shared ThumbnailCache, or None if the directory cannot be created
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            try:
+                _shared_cache = ThumbnailCache()
+            except OSError as exc:
+                logger.error("Failed to open thumbnail cache: %s", exc)
+                return None
+        return _shared_cache
@@ -1,15 +1,18 @@
 """UI components package."""
 
-from .components import CheckBoxHeader, VideoHandler, MainThreadSignalEmitter, main_thread_signal_emitter
+from .components import CheckBoxHeader, FormatComboBox, LazyFormatComboBox, VideoHandler, MainThreadSignalEmitter, main_thread_signal_emitter
 from .format_settings_dialog import FormatSettingsDialog
 from .settings_dialog import SettingsDialog
 from .mini_player import MiniPlayerController
 from .video_table import VideoTableManager
+from .video_table_model import VideoTableModel, VideoRow
 from .presenter import VideoPresenter
 from .main_window import VideoDownloader
 
 __all__ = [
     "CheckBoxHeader",
+    "FormatComboBox",
+    "LazyFormatComboBox",
     "VideoHandler",
     "MainThreadSignalEmitter",
     "main_thread_signal_emitter",
@@ -17,6 +20,8 @@ __all__ = [
     "SettingsDialog",
     "MiniPlayerController",
     "VideoTableManager",
+    "VideoTableModel",
+    "VideoRow",
     "VideoPresenter",
     "VideoDownloader",
 ]
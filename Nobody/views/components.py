@@ -1,6 +1,6 @@
 """Common UI components (header, signal helpers)."""
 
-from PyQt5.QtWidgets import QHeaderView, QCheckBox, QTableWidgetItem
+from PyQt5.QtWidgets import QHeaderView, QCheckBox, QComboBox
 from PyQt5.QtCore import QObject, Qt, pyqtSignal, pyqtSlot
 
 
@@ -28,26 +28,43 @@ class CheckBoxHeader(QHeaderView):
             self.parent().setColumnWidth(0, self._check_box.sizeHint().width())
 
     def selectAll(self):  # noqa: N802 (Qt naming)
-        check_state = self._check_box.isChecked()
-        table = self.parent()
-        if table is None:
-            return
-        for row in range(table.rowCount()):
-            item = table.item(row, 0)
-            if item and isinstance(item, QTableWidgetItem):
-                item.setCheckState(Qt.Checked if check_state else Qt.Unchecked)
+        model = self.model()
+        if model is not None and hasattr(model, "set_all_checked"):
+            model.set_all_checked(self._check_box.isChecked())
 
     def updateState(self):  # noqa: N802 (Qt naming)
-        table = self.parent()
-        if table is None or table.rowCount() == 0:
-            self._check_box.setChecked(False)
-            return
-        for row in range(table.rowCount()):
-            item = table.item(row, 0)
-            if item is None or item.checkState() != Qt.Checked:
-                self._check_box.setChecked(False)
-                return
-        self._check_box.setChecked(True)
+        model = self.model()
+        self._check_box.setChecked(
+            model is not None and hasattr(model, "all_checked") and model.all_checked()
+        )
+
+
+class FormatComboBox(QComboBox):
+    """Format dropdown that keeps the row's full, unfiltered FormatRecord list.
+
+    Filters only change which records are shown, so loosening a filter can
+    bring back entries hidden earlier.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.formats = []
+
+
+class LazyFormatComboBox(FormatComboBox):
+    """Format dropdown whose entries are resolved the first time it is needed."""
+
+    popup_requested = pyqtSignal()
+
+    def __init__(self, video_url: str, parent=None):
+        super().__init__(parent)
+        self.video_url = video_url
+        self.pending = True
+
+    def showPopup(self):  # noqa: N802 (Qt naming)
+        if self.pending:
+            self.popup_requested.emit()
+        super().showPopup()
 
 
 class VideoHandler(QObject):
@@ -9,10 +9,16 @@ from PyQt5.QtWidgets import (
     QPushButton,
     QCheckBox,
     QGroupBox,
+    QSpinBox,
 )
 from PyQt5.QtCore import pyqtSignal
 
-from ..models.settings import AppSettings
+from ..models.settings import AUDIO_OUTPUT_POLICIES, AppSettings
+
+AUDIO_POLICY_LABELS = {
+    "mp3": "Convert to MP3 (320k)",
+    "original": "Keep original audio (no re-encode)",
+}
 
 
 class FormatSettingsDialog(QDialog):
@@ -25,7 +31,7 @@ class FormatSettingsDialog(QDialog):
         self.app_settings = app_settings or AppSettings()
         self.setWindowTitle("Format Settings")
         self.setModal(True)
-        self.setFixedSize(450, 420)
+        self.setFixedSize(450, 760)
         self._build_ui()
 
     def _build_ui(self):
@@ -86,6 +92,84 @@ class FormatSettingsDialog(QDialog):
         quality_layout.addWidget(self.quality_combo)
         quality_group.setLayout(quality_layout)
 
+        loading_group = QGroupBox("Playlist Loading")
+        loading_layout = QVBoxLayout()
+        loading_layout.setContentsMargins(10, 15, 10, 10)
+        loading_layout.setSpacing(5)
+
+        self.lazy_formats_check = QCheckBox("Load formats on demand (faster for large playlists)")
+        self.lazy_formats_check.setChecked(self.app_settings.lazy_format_resolution)
+        self.lazy_formats_check.setMinimumHeight(20)
+
+        concurrency_layout = QHBoxLayout()
+        concurrency_label = QLabel("URLs searched at once:")
+        self.concurrent_searches_spin = QSpinBox()
+        self.concurrent_searches_spin.setRange(1, 8)
+        self.concurrent_searches_spin.setValue(self.app_settings.max_concurrent_searches)
+        self.concurrent_searches_spin.setMinimumHeight(26)
+        concurrency_layout.addWidget(concurrency_label)
+        concurrency_layout.addWidget(self.concurrent_searches_spin)
+
+        loading_layout.addWidget(self.lazy_formats_check)
+        loading_layout.addLayout(concurrency_layout)
+        loading_group.setLayout(loading_layout)
+
+        download_group = QGroupBox("Downloads")
+        download_layout = QVBoxLayout()
+        download_layout.setContentsMargins(10, 15, 10, 10)
+        download_layout.setSpacing(8)
+
+        workers_layout = QHBoxLayout()
+        download_label = QLabel("Parallel downloads:")
+        self.min_downloads_spin = QSpinBox()
+        self.min_downloads_spin.setRange(1, 8)
+        self.min_downloads_spin.setValue(self.app_settings.min_concurrent_downloads)
+        self.min_downloads_spin.setMinimumHeight(26)
+        self.concurrent_downloads_spin = QSpinBox()
+        self.concurrent_downloads_spin.setRange(1, 8)
+        self.concurrent_downloads_spin.setValue(self.app_settings.max_concurrent_downloads)
+        self.concurrent_downloads_spin.setMinimumHeight(26)
+        workers_layout.addWidget(download_label)
+        workers_layout.addWidget(self.min_downloads_spin)
+        workers_layout.addWidget(QLabel("to"))
+        workers_layout.addWidget(self.concurrent_downloads_spin)
+
+        self.adaptive_check = QCheckBox("Adjust within this range by measured speed")
+        self.adaptive_check.setChecked(self.app_settings.adaptive_concurrency)
+        self.adaptive_check.setMinimumHeight(20)
+        self.adaptive_check.toggled.connect(self.min_downloads_spin.setEnabled)
+        self.min_downloads_spin.setEnabled(self.app_settings.adaptive_concurrency)
+
+        audio_layout = QHBoxLayout()
+        audio_label = QLabel("MP3 entries:")
+        self.audio_policy_combo = QComboBox()
+        for policy in AUDIO_OUTPUT_POLICIES:
+            self.audio_policy_combo.addItem(AUDIO_POLICY_LABELS[policy], policy)
+        self.audio_policy_combo.setCurrentIndex(
+            max(0, self.audio_policy_combo.findData(self.app_settings.audio_output_policy))
+        )
+        self.audio_policy_combo.setMinimumHeight(26)
+        audio_layout.addWidget(audio_label)
+        audio_layout.addWidget(self.audio_policy_combo, 1)
+
+        segments_layout = QHBoxLayout()
+        segments_label = QLabel("Connections per file:")
+        self.segmented_spin = QSpinBox()
+        self.segmented_spin.setRange(1, 8)
+        self.segmented_spin.setValue(self.app_settings.segmented_connections)
+        self.segmented_spin.setToolTip(
+            "Split large single-file formats into parallel range requests (1 = off)"
+        )
+        self.segmented_spin.setMinimumHeight(26)
+        segments_layout.addWidget(segments_label)
+        segments_layout.addWidget(self.segmented_spin)
+
+        download_layout.addLayout(workers_layout)
+        download_layout.addWidget(self.adaptive_check)
+        download_layout.addLayout(segments_layout)
+        download_layout.addLayout(audio_layout)
+        download_group.setLayout(download_layout)
+
         button_layout = QHBoxLayout()
         button_layout.setContentsMargins(0, 10, 0, 0)
         button_layout.setSpacing(10)
@@ -103,6 +187,8 @@ class FormatSettingsDialog(QDialog):
         layout.addWidget(default_group)
         layout.addWidget(display_group)
         layout.addWidget(quality_group)
+        layout.addWidget(loading_group)
+        layout.addWidget(download_group)
         layout.addLayout(button_layout)
 
         self.setLayout(layout)
@@ -178,6 +264,14 @@ class FormatSettingsDialog(QDialog):
                 color: #FFFFFF;
                 border: 1px solid #555555;
             }
+            QSpinBox {
+                background-color: #333333;
+                color: #FFFFFF;
+                border: 2px solid #555555;
+                border-radius: 5px;
+                padding: 3px;
+                font-size: 12px;
+            }
             QPushButton {
                 background-color: #333333;
                 color: #FFFFFF;
@@ -204,6 +298,15 @@ class FormatSettingsDialog(QDialog):
         self.app_settings.show_audio_only = self.show_audio_only_check.isChecked()
         quality_map = {0: 480, 1: 720, 2: 1080, 3: 0}
         self.app_settings.max_quality = quality_map.get(self.quality_combo.currentIndex(), 720)
+        self.app_settings.lazy_format_resolution = self.lazy_formats_check.isChecked()
+        self.app_settings.max_concurrent_searches = self.concurrent_searches_spin.value()
+        self.app_settings.max_concurrent_downloads = self.concurrent_downloads_spin.value()
+        self.app_settings.min_concurrent_downloads = min(
+            self.min_downloads_spin.value(), self.concurrent_downloads_spin.value()
+        )
+        self.app_settings.adaptive_concurrency = self.adaptive_check.isChecked()
+        self.app_settings.audio_output_policy = self.audio_policy_combo.currentData()
+        self.app_settings.segmented_connections = self.segmented_spin.value()
         self.app_settings.save_settings()
         self.settingsChanged.emit()
         self.accept()
@@ -7,7 +7,7 @@ from PyQt5.QtWidgets import (
     QWidget,
     QPushButton,
     QLineEdit,
-    QTableWidget,
+    QTableView,
     QLabel,
     QProgressBar,
     QSplitter,
@@ -137,7 +137,7 @@ class LayoutBuilder:
         host.copyUrlButton.setFixedSize(30, 30)
 
         host.search_url = QLineEdit()
-        host.search_url.setPlaceholderText("Enter URL and press Enter or click Search...")
+        host.search_url.setPlaceholderText("Enter or paste one or more URLs...")
         host.search_url.setAccessibleName("URL input field")
         host.search_url.setAccessibleDescription("Enter YouTube, YouTube Music, or SoundCloud URL to search for videos")
         host.search_url.setStyleSheet(
@@ -151,7 +151,7 @@ class LayoutBuilder:
             }
             """
         )
-        host.search_url.setFixedSize(356, 30)
+        host.search_url.setFixedSize(321, 30)
         host.search_url.setClearButtonEnabled(True)
 
         host.search_button = QPushButton("🔍")
@@ -162,6 +162,13 @@ class LayoutBuilder:
         host.search_button.setAccessibleDescription("Search for videos using the URL in the input field")
         host.copyUrlButton.clicked.connect(host.copyUrlToClipboard)
 
+        host.import_urls_button = QPushButton("📄")
+        host.import_urls_button.setFixedSize(30, 30)
+        host.import_urls_button.clicked.connect(host.on_import_url_list)
+        host.import_urls_button.setToolTip("URL 목록 가져오기 / Import URL list (.txt)")
+        host.import_urls_button.setAccessibleName("Import URL list button")
+        host.import_urls_button.setAccessibleDescription("Search every URL listed in a text file")
+
         host.download_list = QPushButton("📍 History")
         host.download_list.setFixedSize(100, 30)
         host.download_list.setToolTip("다운로드 히스토리 / Download History")
@@ -169,7 +176,7 @@ class LayoutBuilder:
         host.later_list = QPushButton("📌")
         host.later_list.setFixedSize(100, 30)
 
-        host.video_table = QTableWidget()
+        host.video_table = QTableView()
         self.table_manager = VideoTableManager(host, host.video_table)
         self.table_manager.initialize()
 
@@ -234,6 +241,7 @@ class LayoutBuilder:
         searchLayout.addWidget(host.copyUrlButton)
         searchLayout.addWidget(host.search_url)
         searchLayout.addWidget(host.search_button)
+        searchLayout.addWidget(host.import_urls_button)
 
         statusLayout = QHBoxLayout()
         statusLayout.addWidget(host.progress_bar)
@@ -13,7 +13,6 @@ from PyQt5.QtWidgets import (
     QLineEdit,
     QLabel,
     QProgressBar,
-    QTableWidget,
     QFileDialog,
     QHBoxLayout,
     QSplitter,
@@ -64,7 +63,8 @@ class VideoDownloader(QDialog):
         # Initialize download queue and notification manager
         from ..models.queue import DownloadQueue
         from ..utils.notifications import NotificationManager
-        self.download_queue = DownloadQueue()
+        self.download_queue = DownloadQueue(journal_path=DownloadQueue.default_journal_path())
+        self.download_queue.load_journal()
         self.notification_manager = NotificationManager(self)
         # Use a user-writable cache directory to avoid permission issues under Program Files
         self.cacheDirectory = resolve_writable_cache_dir("Nobody 3")
@@ -140,6 +140,7 @@ class VideoDownloader(QDialog):
 
         self.initUI()
         self.presenter = VideoPresenter(self, self.table_manager)
+        self.presenter.resume_queued_downloads()
 
         self.scrollTimer = QTimer(self)
         self.scrollTimer.timeout.connect(self.scrollTitle)
@@ -263,11 +264,8 @@ class VideoDownloader(QDialog):
             event.accept()
         # Ctrl+A: Select all
         elif modifiers == Qt.ControlModifier and key == Qt.Key_A:
-            if hasattr(self, "video_table"):
-                for row in range(self.video_table.rowCount()):
-                    item = self.video_table.item(row, 0)
-                    if item:
-                        item.setCheckState(Qt.Checked)
+            if hasattr(self, "table_manager"):
+                self.table_manager.set_all_checked(True)
             event.accept()
         else:
             super().keyPressEvent(event)
@@ -318,18 +316,25 @@ class VideoDownloader(QDialog):
             
             # Clean up search and download threads via presenter
             if hasattr(self, 'presenter') and self.presenter:
-                if hasattr(self.presenter, 'search_thread') and self.presenter.search_thread:
+                if getattr(self.presenter, 'format_resolver', None):
+                    self.presenter.format_resolver.shutdown()
+                if getattr(self.presenter, 'thumbnail_loader', None):
+                    self.presenter.thumbnail_loader.shutdown()
+                for search_thread in self.presenter.cancel_searches():
                     self._cleanup_thread(
-                        self.presenter.search_thread,
+                        search_thread,
                         "Search thread",
                         timeout_ms=3000  # 3 seconds for search operations
                     )
-                if hasattr(self.presenter, 'downloader_thread') and self.presenter.downloader_thread:
-                    self._cleanup_thread(
-                        self.presenter.downloader_thread,
-                        "Downloader thread",
-                        timeout_ms=5000  # 5 seconds for download operations
-                    )
+                if getattr(self.presenter, 'download_engine', None):
+                    # Kill running download processes; they resume from the
+                    # queue journal on the next start
+                    self.presenter.download_engine.shutdown(timeout=1)
+            if hasattr(self, 'download_queue'):
+                self.download_queue.flush_journal()
+            if hasattr(self, 'presenter') and self.presenter:
+                self.presenter.download_archive.flush()
+                self.presenter.extractor_session.close()
         except Exception as exc:
             logger.warning(f"Error cleaning up background threads: {exc}")
 
@@ -390,6 +395,9 @@ class VideoDownloader(QDialog):
     def _cleanup_thread(self, thread, thread_name, timeout_ms=2000):
         """Safely cleanup a QThread with timeout and fallback termination.
 
+        Threads exposing ``cancel()`` are asked to stop cooperatively first;
+        terminate() is only a last resort during shutdown.
+
         Args:
             thread: QThread instance to cleanup
             thread_name: Name for logging purposes
@@ -401,6 +409,11 @@ class VideoDownloader(QDialog):
         try:
             if thread.isRunning():
                 logger.debug(f"Stopping {thread_name}...")
+                # Prefer cooperative cancellation; quit() only affects
+                # threads that run an event loop.
+                cancel = getattr(thread, "cancel", None)
+                if callable(cancel):
+                    cancel()
                 thread.quit()
 
                 # Wait for graceful shutdown
@@ -990,6 +1003,25 @@ class VideoDownloader(QDialog):
     def on_search(self):
         self.presenter.start_search(self.search_url.text())
 
+    def on_import_url_list(self):
+        """Search every URL listed in a text file chosen by the user."""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Import URL list",
+            os.path.expanduser("~"),
+            "Text files (*.txt);;All files (*)",
+        )
+        if not file_path:
+            return
+        try:
+            with open(file_path, "r", encoding="utf-8", errors="replace") as handle:
+                text = handle.read()
+        except OSError as exc:
+            logger.warning("Failed to read URL list %s: %s", file_path, exc)
+            self.set_status(f"Could not read file: {exc}")
+            return
+        self.presenter.start_search(text)
+
     def check_results(self):
         # Assuming self.video_info_list is updated with search results
         if not self.video_info_list:
@@ -1019,6 +1051,7 @@ class VideoDownloader(QDialog):
 
     def download_finished(self):
         self.status_label.setText("Download complete.")
+        self._update_status_bar()
 
     def set_status(self, message):
         """Set status message and update status bar with queue info.
@@ -1177,38 +1210,27 @@ class VideoDownloader(QDialog):
         selected_rows = []
         invalid_selection = False
 
-        for row in range(self.video_table.rowCount()):
-            checkbox = self.video_table.item(row, 0)
-            if not (checkbox and checkbox.checkState() == Qt.Checked):
-                continue
+        checked_rows = self.table_manager.checked_rows()
+        # Placeholder rows fetch their formats first; the download resumes
+        # automatically once every checked row has been resolved.
+        if self.table_manager.resolve_pending_formats(checked_rows, self.on_download):
+            self.set_status("Loading formats for the selected items...")
+            return
 
-            title_item = self.video_table.item(row, 2)
-            format_combo_box = self.video_table.cellWidget(row, 3)
-            selected_format_id = None
-            
-            modified_title = title_item.text() if title_item else "Untitled"
+        for row in checked_rows:
+            modified_title = self.table_manager.row_title(row) or "Untitled"
             if row < len(self.video_info_list) and self.video_info_list[row] is not None:
                 video_url = self.video_info_list[row][1]
             else:
                 logger.error(f"Invalid video_info_list entry at row {row}")
                 continue
             
-            if format_combo_box:
-                selected_format_id = format_combo_box.currentData()
-                if selected_format_id is None:
-                    current_text = format_combo_box.currentText()
-                    if "--- " in current_text or current_text == "No available formats":
-                        invalid_selection = True
-                        break
-                    else:
-                        invalid_selection = True
-                        break
-
-            if selected_format_id is None:
+            selected_format = self.table_manager.selected_format(row)
+            if selected_format is None:
                 invalid_selection = True
                 break
 
-            selected_videos.append((modified_title, video_url, selected_format_id))
+            selected_videos.append((modified_title, video_url, selected_format))
             selected_rows.append(row)
 
         if invalid_selection:
@@ -1226,23 +1248,18 @@ class VideoDownloader(QDialog):
 
     @pyqtSlot()
     def on_delete_selected(self):
-        rows_to_delete = []
-        for row in range(self.video_table.rowCount()):
-            checkbox_item = self.video_table.item(row, 0)
-            if checkbox_item and checkbox_item.checkState() == Qt.Checked:
-                rows_to_delete.append(row)
+        rows_to_delete = self.table_manager.checked_rows()
 
         if not rows_to_delete:
             self.status_label.setText("No videos selected.")
             return
 
+        if hasattr(self, "presenter") and self.presenter:
+            self.presenter.remove_download_rows(rows_to_delete)
         for row in sorted(rows_to_delete, reverse=True):
             if row < len(self.video_info_list):
                 self.video_info_list.pop(row)
-            self.video_table.removeRow(row)
-
-        if hasattr(self, "header"):
-            self.header.updateState()
+        self.table_manager.remove_rows(rows_to_delete)
         self.status_label.setText(f"Removed {len(rows_to_delete)} item(s).")
 
     def _on_new_tab(self):
@@ -1319,6 +1336,16 @@ class VideoDownloader(QDialog):
             parts.append(f"FFmpeg: {self.ffmpeg_status}")
         if hasattr(self, 'network_status'):
             parts.append(f"Network: {self.network_status}")
+        engine = getattr(getattr(self, 'presenter', None), 'download_engine', None)
+        if engine is not None:
+            paused = engine.host_health.paused_hosts()
+            if paused:
+                parts.append(f"Paused: {', '.join(paused)}")
+            self.status_label.setToolTip("\n".join(
+                f"{host}: {c['state']}, {c['succeeded']} ok, {c['failed']} failed "
+                f"({c['throttled']} throttled)"
+                for host, c in engine.host_diagnostics().items()
+            ))
         
         # Update status if we have parts
         if parts:
@@ -1,12 +1,22 @@
 """Presenter layer for VideoDownloader."""
 
+import os
+from collections import deque
 from typing import List, Tuple, Optional
 from PyQt5.QtCore import QObject
 
+from ..models.download_archive import archive_output, get_download_archive
+from ..models.formats import FormatRecord, SearchResult
+from ..services.concurrency import ConcurrencyController
 from ..services.searcher import Searcher
-from ..services.downloader import Downloader
+from ..services.download_engine import DownloadEngine
+from ..services.extractor_session import get_extractor_session
+from ..services.format_resolver import FormatResolver
+from ..services.thumbnail_loader import ThumbnailLoader
 from ..utils.logging import logger
-from ..utils.sanitize import validate_url, sanitize_url
+from ..utils.metadata_cache import canonical_video_id, get_metadata_cache
+from ..utils.sanitize import parse_url_list, validate_url
+from ..utils.thumbnail_cache import get_thumbnail_cache
 
 
 class VideoPresenter(QObject):
@@ -16,176 +26,349 @@ class VideoPresenter(QObject):
         super().__init__(view)
         self.view = view
         self.table_manager = table_manager
-        self.search_thread = None
-        self.downloader_thread = None
+        self._search_queue = deque()
+        self._pending_keys = set()
+        self._active_searches = []
+        self._batch_total = 0
+        self._batch_done = 0
+        self.download_engine = None
+        self.download_archive = get_download_archive()
+        self.extractor_session = get_extractor_session()
+        self.format_resolver = FormatResolver(
+            self,
+            max_workers=getattr(view.app_settings, "search_workers", 1),
+            cache=self._metadata_cache(),
+            session=self.extractor_session,
+        )
+        self.table_manager.attach_format_resolver(self.format_resolver)
+        self.thumbnail_loader = ThumbnailLoader(self, cache=get_thumbnail_cache())
+        self.table_manager.attach_thumbnail_loader(self.thumbnail_loader)
+
+    def _metadata_cache(self):
+        """Return the shared metadata cache, or None when disabled."""
+        cache_ttl_hours = getattr(self.view.app_settings, "metadata_cache_ttl_hours", 0)
+        if cache_ttl_hours <= 0:
+            return None
+        return get_metadata_cache(int(cache_ttl_hours * 3600))
 
     # Search ------------------------------------------------------------
 
-    def start_search(self, url: str) -> None:
-        """Start search operation with URL validation.
-        
+    def start_search(self, text: str) -> None:
+        """Queue every URL in ``text`` for searching.
+
+        ``text`` may hold a single URL or many, separated by newlines,
+        whitespace or commas (e.g. a multi-line paste). URLs already in the
+        table or already queued are skipped; the rest are extracted with at
+        most ``max_concurrent_searches`` running at once and their rows are
+        added as each one streams in.
+
         Args:
-            url: URL to search for videos
+            text: URL or list of URLs to search for videos
         """
-        url = (url or "").strip()
-        if not url:
+        text = (text or "").strip()
+        if not text:
             self.view.set_status("Please enter a URL to search.")
             return
-        
-        # Validate URL format
-        is_valid, error_msg = validate_url(url)
-        if not is_valid:
+
+        urls, rejected = parse_url_list(text)
+        for token in rejected:
+            logger.warning(f"Invalid URL rejected: {token}")
+        if not urls:
+            _, error_msg = validate_url(rejected[0] if rejected else text)
             self.view.set_status(f"Invalid URL: {error_msg}")
-            logger.warning(f"Invalid URL rejected: {url} - {error_msg}")
-            return
-        
-        # Sanitize and normalize URL
-        url = sanitize_url(url)
-        
-        if self.view.is_duplicate_url(url):
-            self.view.set_status("This video is already in the list.")
             return
+        self.start_batch_search(urls)
 
-        # Cancel previous search if still running
-        if self.search_thread and self.search_thread.isRunning():
-            logger.info("Cancelling previous search operation")
-            self.search_thread.quit()
-            self.search_thread.wait(500)  # Wait up to 500ms
-            if self.search_thread.isRunning():
-                self.search_thread.terminate()
-                self.search_thread.wait(200)
-            # Disconnect old signals
-            try:
-                self.search_thread.updated_list.disconnect()
-                self.search_thread.finished.disconnect()
-            except (TypeError, RuntimeError):
-                pass
-            self.search_thread.deleteLater()
+    def start_batch_search(self, urls: List[str]) -> int:
+        """Queue sanitized URLs, deduplicated by canonical video ID.
+
+        Args:
+            urls: URLs to search, in the order rows should appear
+
+        Returns:
+            Number of URLs actually queued
+        """
+        known = {self._url_key(url) for _, url in self.view.video_info_list}
+        queued = 0
+        for url in urls:
+            key = self._url_key(url)
+            if key in known or key in self._pending_keys:
+                continue
+            self._pending_keys.add(key)
+            self._search_queue.append(url)
+            queued += 1
 
-        self.view.search_button.setEnabled(False)
-        self.view.animation_timer.start(50)
+        skipped = len(urls) - queued
+        if not queued:
+            self.view.set_status(
+                "This video is already in the list."
+                if len(urls) == 1
+                else "All of these URLs are already in the list."
+            )
+            return 0
+
+        if not self._active_searches:
+            self._batch_total = 0
+            self._batch_done = 0
+            self.view.animation_timer.start(50)
+            self.view.progress_bar.setRange(0, 0)
+        self._batch_total += queued
+        if skipped:
+            logger.info("Skipped %d duplicate URL(s) in batch search", skipped)
         self.view.set_status("Searching...")
-        self.view.progress_bar.setRange(0, 0)
-
-        self.search_thread = Searcher(url)
-        self.search_thread.updated_list.connect(self._handle_search_update)
-        self.search_thread.finished.connect(self.view.search_finished)
-        self.search_thread.finished.connect(self.view.enable_search_button)
-        self.search_thread.finished.connect(self.view.check_results)
-        self.search_thread.finished.connect(self._handle_search_finished)
-        self.search_thread.start()
-
-    def _handle_search_update(
-        self, title, thumbnail_url, video_url, formats
-    ):
-        self.table_manager.update_video_list(
-            title, thumbnail_url, video_url, formats
-        )
+        self._pump_search_queue()
+        return queued
 
-    def _handle_search_finished(self):
-        self.view.progress_bar.setRange(0, 100)
-        self.view.progress_bar.setValue(100)
-        self.view.set_status("Search completed.")
+    @staticmethod
+    def _url_key(url: str) -> str:
+        return canonical_video_id(url) or url
+
+    def _pump_search_queue(self) -> None:
+        settings = self.view.app_settings
+        limit = max(1, int(getattr(settings, "max_concurrent_searches", 1) or 1))
+        while self._search_queue and len(self._active_searches) < limit:
+            url = self._search_queue.popleft()
+            thread = Searcher(
+                url,
+                max_workers=getattr(settings, "search_workers", 1),
+                cache=self._metadata_cache(),
+                session=self.extractor_session,
+                lazy=getattr(settings, "lazy_format_resolution", False),
+            )
+            thread.results_ready.connect(self.table_manager.add_video_rows)
+            thread.search_progress.connect(self._handle_search_progress)
+            thread.finished.connect(lambda t=thread: self._handle_search_finished(t))
+            self._active_searches.append(thread)
+            thread.start()
+
+    def cancel_searches(self) -> list:
+        """Cancel every running search and drop queued URLs (e.g. on shutdown).
 
-        # Disconnect signals before clearing reference
-        if self.search_thread:
+        Returns:
+            Search threads that may still be finishing
+        """
+        self._search_queue.clear()
+        self._pending_keys.clear()
+        threads = list(self._active_searches)
+        for thread in threads:
+            thread.cancel()
+        return threads
+
+    @staticmethod
+    def _disconnect_search_signals(thread) -> None:
+        for signal in (
+            thread.results_ready,
+            thread.search_progress,
+            thread.finished,
+        ):
             try:
-                self.search_thread.updated_list.disconnect()
-                self.search_thread.finished.disconnect()
+                signal.disconnect()
             except (TypeError, RuntimeError):
                 # Signals may already be disconnected
                 pass
-            self.search_thread = None
+
+    def _handle_search_progress(self, done: int, total: int) -> None:
+        # Per-playlist progress is only meaningful for a single URL; batches
+        # report how many URLs have finished instead.
+        if self._batch_total > 1:
+            return
+        if total > 0:
+            self.view.animation_timer.stop()
+            self.view.progress_bar.setRange(0, total)
+            self.view.progress_bar.setValue(done)
+            self.view.set_status(f"Searching... {done}/{total}")
+        elif done:
+            self.view.set_status(f"Searching... {done} found")
+
+    def _handle_search_finished(self, thread) -> None:
+        self._disconnect_search_signals(thread)
+        if thread in self._active_searches:
+            self._active_searches.remove(thread)
+        self._pending_keys.discard(self._url_key(thread.url))
+        thread.deleteLater()
+        self._batch_done += 1
+        self._pump_search_queue()
+
+        if self._active_searches:
+            self.view.animation_timer.stop()
+            self.view.progress_bar.setRange(0, self._batch_total)
+            self.view.progress_bar.setValue(self._batch_done)
+            self.view.set_status(f"Searching... {self._batch_done}/{self._batch_total} URLs")
+            return
+
+        self.view.search_finished()
+        self.view.enable_search_button()
+        self.view.check_results()
+        self.view.progress_bar.setRange(0, 100)
+        self.view.progress_bar.setValue(100)
+        self.view.set_status("Search completed.")
 
     # Download ----------------------------------------------------------
 
-    def start_download(self, videos: List[Tuple[str, str, str]], row_indices: List[int] = None) -> None:
-        """Start download operation for selected videos.
+    def start_download(self, videos: List[Tuple[str, str, FormatRecord]], row_indices: List[int] = None) -> None:
+        """Queue selected videos on the download engine.
         
+        Downloads already running keep going; new items join the queue and
+        start as soon as a worker is free. Videos whose file for the same
+        format is already on disk (per the download archive) are skipped.
+
         Args:
-            videos: List of tuples (title, url, format_id)
+            videos: List of tuples (title, url, FormatRecord)
             row_indices: Optional list of row indices corresponding to videos
         """
         if not videos:
             self.view.set_status("Select at least one video to download.")
             return
 
-        # Check if download is already in progress
-        if self.downloader_thread and self.downloader_thread.isRunning():
-            logger.warning(
-                "Download already in progress, skipping new request"
-            )
-            self.view.set_status("Download already in progress. Please wait.")
-            return
-
         directory = self.view.select_download_directory()
         if not directory:
             self.view.set_status("Select a valid download directory.")
             return
 
-        # Clean up previous download thread if exists
-        if self.downloader_thread:
-            try:
-                if self.downloader_thread.isRunning():
-                    self.downloader_thread.quit()
-                    self.downloader_thread.wait(500)
-                # Disconnect old signals
-                try:
-                    self.downloader_thread.download_failed.disconnect()
-                    self.downloader_thread.updated_status.disconnect()
-                    self.downloader_thread.updated_progress.disconnect()
-                    self.downloader_thread.item_progress.disconnect()
-                    self.downloader_thread.item_completed.disconnect()
-                    self.downloader_thread.item_started.disconnect()
-                except (TypeError, RuntimeError):
-                    pass
-                self.downloader_thread.deleteLater()
-            except Exception as cleanup_exc:
-                logger.warning(
-                    f"Error cleaning up previous download thread: "
-                    f"{cleanup_exc}"
+        engine = self._download_engine()
+        queued = 0
+        skipped = 0
+        for idx, (title, url, record) in enumerate(videos):
+            if row_indices and len(row_indices) == len(videos):
+                row_idx = row_indices[idx]
+            else:
+                row_idx = self._row_for_url(url, idx)
+            existing = self.download_archive.find(
+                url, record.format_id, archive_output(record.conversion, engine.audio_output_policy)
+            )
+            if existing:
+                logger.info("Skipping %s: already downloaded to %s", title, existing["path"])
+                self.view.mark_item_complete(row_idx)
+                skipped += 1
+                continue
+            if engine.enqueue(title, url, record, row_idx, download_directory=directory):
+                queued += 1
+
+        skipped_note = f" Skipped {skipped} already downloaded." if skipped else ""
+        if not queued:
+            if skipped:
+                self.view.set_status(f"Nothing to download.{skipped_note}")
+            else:
+                self.view.set_status("These videos are already downloading.")
+            return
+        logger.info("Queued %d download(s) on %d worker(s)", queued, engine.max_workers)
+        self.view.set_status(f"Queued {queued} download(s).{skipped_note}")
+
+    def resume_queued_downloads(self) -> int:
+        """Show and restart downloads restored from the queue journal.
+
+        Each restored item gets a table row again; yt_dlp continues any
+        ``.part`` file it left behind instead of starting over.
+
+        Returns:
+            Number of resumed downloads
+        """
+        queue = self.view.download_queue
+        restored = [item for item in list(queue.items) if item.row_index < 0]
+        if not restored:
+            return 0
+        first_row = self.table_manager.row_count()
+        self.table_manager.add_video_rows([
+            SearchResult(item.title, "", item.url, [item.format_record or FormatRecord(item.format_id)])
+            for item in restored
+        ])
+        for offset, item in enumerate(restored):
+            queue.update_item(item, row_index=first_row + offset)
+            if item.partial_path and os.path.exists(item.partial_path):
+                logger.info(
+                    "Resuming %s from %d bytes", item.title, os.path.getsize(item.partial_path)
                 )
+        pending = self._download_engine().resume_pending()
+        self.view.set_status(f"Resuming {pending} interrupted download(s).")
+        return pending
 
-        # Create row mapping: (title, url) -> row index
-        # If row_indices provided, use them; otherwise try to match by title/url
-        row_mapping = {}
-        if row_indices and len(row_indices) == len(videos):
-            for idx, (title, url, _) in enumerate(videos):
-                row_mapping[(title, url)] = row_indices[idx]
-        else:
-            # Fallback: try to find rows by matching title/url in video_info_list
-            for idx, (title, url, _) in enumerate(videos):
-                # Try to find matching row in table
-                row_idx = idx  # Default to index if not found
-                if hasattr(self.view, 'video_info_list'):
-                    for row, (list_title, list_url) in enumerate(self.view.video_info_list):
-                        if list_url == url:  # Match by URL (more reliable)
-                            row_idx = row
-                            break
-                row_mapping[(title, url)] = row_idx
-
-        self.downloader_thread = Downloader(videos, directory, row_mapping)
-        self.downloader_thread.download_failed.connect(
-            self.view.download_failed
-        )
-        self.downloader_thread.updated_status.connect(self.view.set_status)
-        self.downloader_thread.updated_progress.connect(
-            self.view.update_progress_bar
-        )
-        # Connect new individual progress signals
-        self.downloader_thread.item_progress.connect(
-            self.view.update_item_progress
-        )
-        self.downloader_thread.item_completed.connect(
-            self.view.mark_item_complete
-        )
-        self.downloader_thread.item_started.connect(
-            self.view.mark_item_started
-        )
-        # Connect history signal
-        self.downloader_thread.history_added.connect(
-            self.view.add_to_history
+    def cancel_downloads(self, rows: List[int]) -> int:
+        """Cancel queued or running downloads for ``rows``.
+
+        Returns:
+            Number of downloads cancelled
+        """
+        if self.download_engine is None:
+            return 0
+        queue = self.view.download_queue
+        items = [queue.get_item(row) for row in rows]
+        return sum(
+            1 for item in items if item is not None and self.download_engine.cancel_item(item.item_id)
         )
-        self.downloader_thread.start()
 
-        logger.info("Download process started (%d items)", len(videos))
+    def remove_download_rows(self, rows: List[int]) -> None:
+        """Cancel downloads for ``rows`` and renumber the rest of the queue.
+
+        Call before the rows are removed from the table.
+        """
+        self.cancel_downloads(rows)
+        self.view.download_queue.remove_rows(rows)
+
+    def _row_of(self, item_id: int) -> int:
+        """Return the table row currently showing engine item ``item_id``, or -1."""
+        item = self.view.download_queue.get_item_by_id(item_id)
+        return item.row_index if item is not None else -1
+
+    def _on_item_progress(self, item_id: int, percent: float, speed: str, eta: str) -> None:
+        row = self._row_of(item_id)
+        if row >= 0:
+            self.view.update_item_progress(row, percent, speed, eta)
+
+    def _on_item_started(self, item_id: int, title: str) -> None:
+        row = self._row_of(item_id)
+        if row >= 0:
+            self.view.mark_item_started(row, title)
+
+    def _on_item_completed(self, item_id: int) -> None:
+        row = self._row_of(item_id)
+        if row >= 0:
+            self.view.mark_item_complete(row)
+
+    def _on_queue_drained(self) -> None:
+        # Every signal for the batch has been delivered; finished items
+        # are no longer needed to map ids to rows
+        self.view.download_queue.prune_finished()
+        self.view.download_finished()
+
+    def _row_for_url(self, url: str, default: int) -> int:
+        # Fallback: find the row by URL in video_info_list
+        for row, (_, list_url) in enumerate(getattr(self.view, "video_info_list", [])):
+            if list_url == url:
+                return row
+        return default
+
+    def _download_engine(self) -> DownloadEngine:
+        """Return the download engine, creating and wiring it on first use."""
+        settings = self.view.app_settings
+        workers = getattr(settings, "max_concurrent_downloads", 4)
+        if self.download_engine is None:
+            self.download_engine = DownloadEngine(
+                self.view.download_queue,
+                max_workers=workers,
+                session=self.extractor_session,
+            )
+            engine = self.download_engine
+            engine.archive = self.download_archive
+            engine.download_failed.connect(self.view.download_failed)
+            engine.updated_status.connect(self.view.set_status)
+            engine.updated_progress.connect(self.view.update_progress_bar)
+            # Engine item signals carry item ids; rows are looked up on arrival
+            engine.item_progress.connect(self._on_item_progress)
+            engine.item_completed.connect(self._on_item_completed)
+            engine.item_started.connect(self._on_item_started)
+            engine.history_added.connect(self.view.add_to_history)
+            engine.queue_drained.connect(self._on_queue_drained)
+        engine = self.download_engine
+        if getattr(settings, "adaptive_concurrency", False):
+            min_workers = min(getattr(settings, "min_concurrent_downloads", 1), workers)
+            if engine.controller is None:
+                engine.set_controller(ConcurrencyController(min_workers, workers))
+            else:
+                engine.controller.set_bounds(min_workers, workers)
+                engine.set_max_workers(engine.controller.clamp(engine.max_workers))
+        else:
+            engine.set_controller(None)
+            engine.set_max_workers(workers)
+        engine.audio_output_policy = getattr(settings, "audio_output_policy", "mp3")
+        engine.segmented_connections = getattr(settings, "segmented_connections", 1)
+        return engine
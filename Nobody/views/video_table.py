@@ -1,50 +1,91 @@
 """Video table management utilities."""
 
-import re
-from typing import List, Tuple, Optional
-
-import requests
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap, QColor
-from PyQt5.QtWidgets import (
-    QComboBox, QTableWidget, QTableWidgetItem, QProgressBar
+from typing import Dict, List, Optional
+
+from PyQt5.QtCore import QPersistentModelIndex, QTimer
+from PyQt5.QtGui import QImage, QPixmap, QPixmapCache
+from PyQt5.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+
+from ..models.formats import FormatRecord, SearchResult
+from .components import CheckBoxHeader, FormatComboBox
+from .video_table_model import (
+    COLUMN_CHECK,
+    COLUMN_FORMAT,
+    COLUMN_PROGRESS,
+    COLUMN_THUMBNAIL,
+    COLUMN_TITLE,
+    STATE_COMPLETE,
+    STATE_DOWNLOADING,
+    THUMBNAIL_URL_ROLE,
+    VIDEO_URL_ROLE,
+    FormatDelegate,
+    ProgressDelegate,
+    VideoRow,
+    VideoTableModel,
 )
 
-from ..utils.logging import logger
-from .components import CheckBoxHeader
-
-FormatInfo = Tuple[str, Optional[str], str, int]
+# Rows prefetched above and below the viewport, at least one page each way
+THUMBNAIL_PREFETCH_ROWS = 10
+ROW_HEIGHT = 34
 
 
 class VideoTableManager:
-    """Encapsulates QTableWidget setup and updates for VideoDownloader."""
+    """Encapsulates the video table (QTableView + VideoTableModel) for VideoDownloader."""
 
-    def __init__(self, host, table: QTableWidget):
+    def __init__(self, host, table: QTableView):
         self.host = host
         self.table = table
+        self.model = VideoTableModel(table)
         self.header: CheckBoxHeader | None = None
+        self.format_resolver = None
+        self._deferred_urls: set = set()
+        self._deferred_callback = None
+        self.thumbnail_loader = None
+        # Thumbnail URL -> cells waiting for it; persistent indexes follow
+        # row insertions/removals and turn invalid when the row is deleted
+        self._thumbnail_cells: Dict[str, List[QPersistentModelIndex]] = {}
+        # Coalesces scroll/resize/insert bursts into one visibility pass
+        self._thumbnail_timer = QTimer()
+        self._thumbnail_timer.setSingleShot(True)
+        self._thumbnail_timer.setInterval(50)
+        self._thumbnail_timer.timeout.connect(self._update_visible_thumbnails)
+        self.format_delegate = FormatDelegate(self._populate_format_combo, self._request_formats, table)
 
     def initialize(self):
         """Initial table setup."""
-        self.table.setColumnCount(5)  # Added Progress column
-        self.table.setHorizontalHeaderLabels(
-            ["", "Thumbnail", "Title", "Format", "Progress"]
-        )
+        self.model.audio_output_policy = self.host.app_settings.audio_output_policy
+        self.table.setModel(self.model)
         header = CheckBoxHeader()
         self.table.setHorizontalHeader(header)
         header._check_box.clicked.connect(header.selectAll)
-        self.table.horizontalHeader().setSectionResizeMode(1, self.table.horizontalHeader().ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(2, self.table.horizontalHeader().Stretch)
-        self.table.horizontalHeader().setVisible(True)
-        self.table.verticalHeader().setVisible(False)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        header.setSectionResizeMode(COLUMN_TITLE, QHeaderView.Stretch)
+        header.setVisible(True)
+        # Fixed row heights: the view never measures rows, whatever their number
+        vertical = self.table.verticalHeader()
+        vertical.setVisible(False)
+        vertical.setSectionResizeMode(QHeaderView.Fixed)
+        vertical.setDefaultSectionSize(ROW_HEIGHT)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(
+            QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed
+        )
         self.table.setShowGrid(False)
-        self.table.setColumnWidth(0, 100)
-        self.table.setColumnWidth(1, 150)
-        self.table.setColumnWidth(2, 300)
-        self.table.setColumnWidth(3, 180)
-        self.table.setColumnWidth(4, 200)  # Progress column
-        self.table.itemChanged.connect(self._handle_item_changed)
+        self.table.setWordWrap(False)
+        self.table.setColumnWidth(COLUMN_CHECK, 100)
+        self.table.setColumnWidth(COLUMN_THUMBNAIL, 60)
+        self.table.setColumnWidth(COLUMN_TITLE, 300)
+        self.table.setColumnWidth(COLUMN_FORMAT, 180)
+        self.table.setColumnWidth(COLUMN_PROGRESS, 200)
+        self.table.setItemDelegateForColumn(COLUMN_FORMAT, self.format_delegate)
+        self.table.setItemDelegateForColumn(COLUMN_PROGRESS, ProgressDelegate(self.table))
+        # The format dropdown opens on a single click like a cell widget would
+        self.table.clicked.connect(self._handle_clicked)
+        self.model.checks_changed.connect(self._handle_checks_changed)
+        scroll_bar = self.table.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self._schedule_thumbnails)
+        scroll_bar.rangeChanged.connect(self._schedule_thumbnails)
+        self.model.rowsInserted.connect(self._schedule_thumbnails)
+        self.model.rowsRemoved.connect(self._schedule_thumbnails)
         self.header = header
 
     def update_video_list(
@@ -52,303 +93,340 @@ class VideoTableManager:
         title: str,
         thumbnail_url: str,
         video_url: str,
-        formats_info_list: List[FormatInfo],
+        formats: List[FormatRecord],
     ):
         """Add a new video row with thumbnail and format dropdown."""
-        row_position = self.table.rowCount()
-        self.table.insertRow(row_position)
-        self.host.video_info_list.append((title, video_url))
+        self.add_video_rows([SearchResult(title, thumbnail_url, video_url, formats)])
 
-        checkbox_item = QTableWidgetItem()
-        checkbox_item.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
-        checkbox_item.setCheckState(Qt.Unchecked)
-        self.table.setItem(row_position, 0, checkbox_item)
+    def add_placeholder_row(self, title: str, thumbnail_url: str, video_url: str):
+        """Add a row whose formats are resolved only when first needed.
 
-        title_item = QTableWidgetItem(title)
-        title_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
-        self.table.setItem(row_position, 2, title_item)
+        Resolution is requested when the format dropdown is opened, the row
+        is checked, or a download including the row is started.
+        """
+        self.add_video_rows([SearchResult(title, thumbnail_url, video_url, None)])
 
-        if thumbnail_url:
-            self._load_thumbnail(row_position, thumbnail_url)
+    def add_video_rows(self, results: List[SearchResult]):
+        """Append a batch of search results with a single insert notification."""
+        if not results:
+            return
+        rows = []
+        for result in results:
+            self.host.video_info_list.append((result.title, result.webpage_url))
+            formats = None if result.is_placeholder else list(result.formats)
+            selected = None if formats is None else self._default_format(self._filter_formats(formats))
+            rows.append(VideoRow(result.title, result.thumbnail, result.webpage_url, formats, selected))
+        self.model.append_rows(rows)
+        if self.header:
+            self.header.updateState()
 
-        format_combo = QComboBox()
-        filtered_formats = self._filter_formats(formats_info_list)
+    def attach_format_resolver(self, resolver) -> None:
+        """Use ``resolver`` to fetch formats for placeholder rows."""
+        self.format_resolver = resolver
+        resolver.formats_resolved.connect(self._on_formats_resolved)
+        resolver.resolution_failed.connect(self._on_resolution_failed)
 
-        current_category = None
-        if not filtered_formats:
-            format_combo.addItem("No available formats", None)
-        else:
-            for display_text, format_id, type_label, _ in filtered_formats:
-                if type_label != current_category:
-                    if format_combo.count() > 0 and current_category is not None:
-                        pass
-                    format_combo.addItem(f"--- {type_label} --- ")
-                    format_combo.model().item(format_combo.count() - 1).setEnabled(False)
-                    current_category = type_label
-                format_combo.addItem(display_text, userData=format_id)
-
-        self._select_default_format(format_combo)
-        self.table.setCellWidget(row_position, 3, format_combo)
-        
-        # Add progress bar for this row
-        progress_bar = QProgressBar()
-        progress_bar.setRange(0, 100)
-        progress_bar.setValue(0)
-        progress_bar.setTextVisible(True)
-        progress_bar.setFormat("Ready")
-        progress_bar.setStyleSheet("""
-            QProgressBar {
-                border: 1px solid #555;
-                border-radius: 3px;
-                text-align: center;
-                background-color: #2D2D2D;
-            }
-            QProgressBar::chunk {
-                background-color: #4CAF50;
-                border-radius: 2px;
-            }
-        """)
-        self.table.setCellWidget(row_position, 4, progress_bar)
+    def attach_thumbnail_loader(self, loader) -> None:
+        """Use ``loader`` to fetch thumbnails off the GUI thread."""
+        self.thumbnail_loader = loader
+        loader.thumbnail_ready.connect(self._on_thumbnail_ready)
+        loader.thumbnail_failed.connect(self._on_thumbnail_failed)
+
+    def resolve_pending_formats(self, rows: List[int], callback) -> bool:
+        """Request formats for placeholder rows among ``rows``.
+
+        Args:
+            rows: Row indices about to be used (e.g. checked for download)
+            callback: Called once every requested row has been resolved
+
+        Returns:
+            True if resolution is pending and the caller should wait for
+            ``callback``; False if all rows already have formats
+        """
+        if self.format_resolver is None:
+            return False
+        pending_urls = set()
+        for row in rows:
+            video = self.model.row(row)
+            if video is not None and video.pending:
+                pending_urls.add(video.video_url)
+        if not pending_urls:
+            return False
+        self._deferred_urls = pending_urls
+        self._deferred_callback = callback
+        for url in pending_urls:
+            self._request_formats(url)
+        return True
 
     def apply_filters(self):
-        """Reapply format filters to existing rows."""
-        row_count = self.table.rowCount()
-        for row in range(row_count):
-            format_combo = self.table.cellWidget(row, 3)
-            if not format_combo or not isinstance(format_combo, QComboBox):
+        """Reapply format filters to existing rows, keeping visible selections."""
+        self.model.set_audio_output_policy(self.host.app_settings.audio_output_policy)
+        for row, video in enumerate(self.model.rows()):
+            if video.pending:
                 continue
+            visible = self._filter_formats(video.formats)
+            current = video.selected
+            selected = None
+            if current is not None:
+                selected = next((r for r in visible if r.format_id == current.format_id), None)
+            self.model.set_selected(row, selected or self._default_format(visible))
 
-            current_format_id = format_combo.currentData()
-            all_formats: List[FormatInfo] = []
-            for i in range(format_combo.count()):
-                if not format_combo.model().item(i).isEnabled():
-                    continue
-                item_text = format_combo.itemText(i)
-                item_data = format_combo.itemData(i)
-                type_label = "Unknown"
-                if "[Video]" in item_text:
-                    type_label = "Video"
-                elif "[Video-only]" in item_text:
-                    type_label = "Video-only"
-                elif "[Audio-only]" in item_text:
-                    type_label = "Audio-only"
-                filesize = 0
-                match = re.search(r"(\d+)MB", item_text)
-                if match:
-                    filesize = int(match.group(1)) * 1024 * 1024
-                all_formats.append((item_text, item_data, type_label, filesize))
-
-            filtered_formats = self._filter_formats(all_formats)
-            format_combo.clear()
-            current_category = None
-            found_current = False
-            for display_text, format_id, type_label, _ in filtered_formats:
-                if type_label != current_category:
-                    format_combo.addItem(f"--- {type_label} --- ")
-                    format_combo.model().item(format_combo.count() - 1).setEnabled(False)
-                    current_category = type_label
-                format_combo.addItem(display_text, userData=format_id)
-                if format_id == current_format_id:
-                    format_combo.setCurrentIndex(format_combo.count() - 1)
-                    found_current = True
+    # Row access -------------------------------------------------------
+
+    def row_count(self) -> int:
+        return self.model.rowCount()
+
+    def checked_rows(self) -> List[int]:
+        """Return the indices of checked rows."""
+        return self.model.checked_rows()
+
+    def set_all_checked(self, checked: bool) -> None:
+        self.model.set_all_checked(checked)
 
-            if not found_current and format_combo.count() > 0:
-                for i in range(format_combo.count()):
-                    if format_combo.model().item(i).isEnabled():
-                        format_combo.setCurrentIndex(i)
-                        break
+    def row_title(self, row: int) -> str:
+        video = self.model.row(row)
+        return video.title if video is not None else ""
+
+    def selected_format(self, row: int) -> Optional[FormatRecord]:
+        video = self.model.row(row)
+        return video.selected if video is not None else None
+
+    def remove_rows(self, rows: List[int]) -> None:
+        """Remove rows from the table (``host.video_info_list`` is left alone)."""
+        self.model.remove_rows(rows)
+        if self.header:
+            self.header.updateState()
 
     # Internal helpers -------------------------------------------------
 
-    def _handle_item_changed(self, item):
-        if item.column() == 0 and self.header:
+    def _handle_clicked(self, index):
+        if index.column() == COLUMN_FORMAT:
+            self.table.edit(index)
+
+    def _handle_checks_changed(self, rows: List[int]):
+        if self.header:
             self.header.updateState()
+        for row in rows:
+            video = self.model.row(row)
+            if video is not None and video.checked and video.pending:
+                self._request_formats(video.video_url)
+
+    def _populate_format_combo(
+        self,
+        format_combo: FormatComboBox,
+        formats: List[FormatRecord],
+        selected: Optional[FormatRecord] = None,
+    ):
+        format_combo.formats = list(formats)
+        filtered_formats = self._filter_formats(format_combo.formats)
+
+        current_category = None
+        if not filtered_formats:
+            format_combo.addItem("No available formats", None)
+        else:
+            for record in filtered_formats:
+                if record.type_label != current_category:
+                    format_combo.addItem(f"--- {record.type_label} --- ")
+                    format_combo.model().item(format_combo.count() - 1).setEnabled(False)
+                    current_category = record.type_label
+                format_combo.addItem(
+                    record.display_label(self.host.app_settings.audio_output_policy), userData=record
+                )
+                if record is selected:
+                    format_combo.setCurrentIndex(format_combo.count() - 1)
 
-    def _load_thumbnail(self, row_position: int, thumbnail_url: str):
-        try:
-            response = requests.get(thumbnail_url, timeout=10)
-            response.raise_for_status()
-            pixmap = QPixmap()
-            if pixmap.loadFromData(response.content):
-                pixmap_resized = pixmap.scaled(30, 30, Qt.KeepAspectRatio)
-                thumbnail_item = QTableWidgetItem()
-                thumbnail_item.setData(Qt.DecorationRole, pixmap_resized)
-                self.table.setItem(row_position, 1, thumbnail_item)
-        except requests.exceptions.Timeout:
-            logger.warning("Thumbnail request timed out: %s", thumbnail_url)
-        except requests.exceptions.RequestException as exc:
-            logger.warning("Thumbnail download failed: %s - %s", thumbnail_url, exc)
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.error("Thumbnail processing error: %s", exc)
-
-    def _filter_formats(self, formats_info_list: List[FormatInfo]) -> List[FormatInfo]:
-        if not formats_info_list:
-            return formats_info_list
+    def _rows_for(self, video_url: str) -> List[int]:
+        return [row for row, video in enumerate(self.model.rows()) if video.video_url == video_url]
+
+    def _request_formats(self, video_url: str):
+        if self.format_resolver is not None:
+            self.format_resolver.request(video_url)
+
+    def _on_formats_resolved(self, video_url: str, formats: List[FormatRecord]):
+        for row in self._rows_for(video_url):
+            if self.model.row(row).pending:
+                self.model.set_formats(row, formats, self._default_format(self._filter_formats(formats)))
+        self.format_delegate.refresh(video_url)
+        self._finish_deferred(video_url)
+
+    def _on_resolution_failed(self, video_url: str, message: str):
+        for row in self._rows_for(video_url):
+            if self.model.row(row).pending:
+                self.model.set_formats(row, [], None)
+        self.format_delegate.refresh(video_url)
+        self._finish_deferred(video_url)
+
+    def _finish_deferred(self, video_url: str):
+        if video_url not in self._deferred_urls:
+            return
+        self._deferred_urls.discard(video_url)
+        if not self._deferred_urls and self._deferred_callback is not None:
+            callback, self._deferred_callback = self._deferred_callback, None
+            callback()
+
+    def _schedule_thumbnails(self, *args):
+        self._thumbnail_timer.start()
+
+    def _visible_rows(self):
+        """Return the first and last row intersecting the viewport (-1 if none)."""
+        count = self.model.rowCount()
+        if count == 0:
+            return -1, -1
+        first = self.table.rowAt(0)
+        if first < 0:
+            first = 0
+        last = self.table.rowAt(self.table.viewport().height() - 1)
+        if last < 0:
+            last = count - 1
+        return first, last
+
+    def _update_visible_thumbnails(self):
+        """Load thumbnails for visible rows, then nearby ones; cancel the rest."""
+        first, last = self._visible_rows()
+        wanted = set()
+        if first >= 0:
+            count = self.model.rowCount()
+            margin = max(THUMBNAIL_PREFETCH_ROWS, last - first + 1)
+            nearby = [
+                row
+                for distance in range(1, margin + 1)
+                for row in (last + distance, first - distance)
+                if 0 <= row < count
+            ]
+            for row in list(range(first, last + 1)) + nearby:
+                url = self._load_thumbnail(row)
+                if url:
+                    wanted.add(url)
+        if self.thumbnail_loader is None:
+            return
+        for url in list(self._thumbnail_cells):
+            if url not in wanted and self.thumbnail_loader.cancel(url):
+                del self._thumbnail_cells[url]
+
+    def _load_thumbnail(self, row: int) -> Optional[str]:
+        """Show or request the thumbnail of ``row``.
+
+        Returns:
+            The URL still being fetched for the row, or None
+        """
+        index = self.model.index(row, COLUMN_THUMBNAIL)
+        thumbnail_url = index.data(THUMBNAIL_URL_ROLE)
+        if not thumbnail_url:
+            return None
+        # Rows showing the same thumbnail share one decoded pixmap
+        pixmap = QPixmapCache.find(thumbnail_url)
+        if pixmap is not None and not pixmap.isNull():
+            self.model.set_thumbnail(row, pixmap)
+            return None
+        if self.thumbnail_loader is None:
+            return None
+        cells = self._thumbnail_cells.setdefault(thumbnail_url, [])
+        persistent = QPersistentModelIndex(index)
+        if persistent not in cells:
+            cells.append(persistent)
+        self.thumbnail_loader.request(thumbnail_url, index.data(VIDEO_URL_ROLE) or "")
+        return thumbnail_url
+
+    def _on_thumbnail_ready(self, thumbnail_url: str, image: QImage):
+        cells = self._thumbnail_cells.pop(thumbnail_url, [])
+        pixmap = QPixmap.fromImage(image)
+        QPixmapCache.insert(thumbnail_url, pixmap)
+        for index in cells:
+            if index.isValid():
+                self.model.set_thumbnail(index.row(), pixmap)
+
+    def _on_thumbnail_failed(self, thumbnail_url: str, message: str):
+        # Do not retry the URL on every scroll
+        for index in self._thumbnail_cells.pop(thumbnail_url, []):
+            if index.isValid():
+                self.model.set_thumbnail(index.row(), None)
+
+    def _filter_formats(self, formats: List[FormatRecord]) -> List[FormatRecord]:
+        if not formats:
+            return formats
 
-        filtered = []
         settings = self.host.app_settings
-        for display_text, format_id, type_label, filesize in formats_info_list:
-            if type_label == "Video" and not settings.show_video_formats:
+        filtered = []
+        for record in formats:
+            if record.is_video and not settings.show_video_formats:
                 continue
-            if type_label == "Audio-only" and not settings.show_audio_only:
+            if record.type_label == "Audio-only" and not settings.show_audio_only:
                 continue
-            if type_label == "Video-only" and not settings.show_video_formats:
+            if (
+                record.is_video
+                and settings.max_quality > 0
+                and record.height
+                and record.height > settings.max_quality
+            ):
                 continue
-
-            if type_label in ["Video", "Video-only"] and settings.max_quality > 0:
-                resolution_match = re.search(r"(\d+)x(\d+)", display_text)
-                if resolution_match:
-                    height = int(resolution_match.group(2))
-                    if height > settings.max_quality:
-                        continue
-            filtered.append((display_text, format_id, type_label, filesize))
+            filtered.append(record)
         return filtered
 
-    def _select_default_format(self, combo: QComboBox):
-        if combo.count() == 0:
-            return
+    @staticmethod
+    def _matches_preference(record: FormatRecord, preferred_format: str) -> bool:
+        if preferred_format == "best":
+            return record.format_id.startswith("best")
+        return preferred_format in (record.ext, record.conversion)
+
+    def _default_format(self, records: List[FormatRecord]) -> Optional[FormatRecord]:
+        """Return the record matching the preferred format, else the first one."""
+        if not records:
+            return None
         preferred_format = self.host.app_settings.default_format.lower()
-        best_match_index = -1
-        partial_match_index = -1
-        for i in range(combo.count()):
-            if not combo.model().item(i).isEnabled():
-                continue
-            item_text = combo.itemText(i).lower()
-            item_data = combo.itemData(i)
-            if item_data:
-                format_id_str = str(item_data).lower()
-                if preferred_format in format_id_str:
-                    best_match_index = i
-                    break
-            if preferred_format in ["mp3", "mp4", "webm", "m4a"]:
-                if f".{preferred_format}" in item_text or f" {preferred_format} " in item_text:
-                    if best_match_index == -1:
-                        best_match_index = i
-                elif preferred_format in item_text and partial_match_index == -1:
-                    partial_match_index = i
-            elif preferred_format in item_text and partial_match_index == -1:
-                partial_match_index = i
-
-        target_index = best_match_index
-        if target_index == -1:
-            target_index = partial_match_index
-        if target_index == -1:
-            for i in range(combo.count()):
-                if combo.model().item(i).isEnabled():
-                    target_index = i
-                    break
-
-        if target_index != -1:
-            combo.setCurrentIndex(target_index)
+        for record in records:
+            if self._matches_preference(record, preferred_format):
+                return record
+        return records[0]
 
     def delete_selected_videos(self):
-        rows_to_remove = []
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 0)
-            if item and item.checkState() == Qt.Checked:
-                rows_to_remove.append(row)
-
+        rows_to_remove = self.model.checked_rows()
         for row in reversed(rows_to_remove):
-            self.table.removeRow(row)
             if 0 <= row < len(self.host.video_info_list):
                 del self.host.video_info_list[row]
+        self.remove_rows(rows_to_remove)
 
     def get_selected_videos(self):
         selected_videos = []
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 0)
-            if item and item.checkState() == Qt.Checked:
-                url = self.host.video_info_list[row][1]
-                combo = self.table.cellWidget(row, 3)
-                format_id = None
-                if isinstance(combo, QComboBox):
-                    format_id = combo.currentData()
-                selected_videos.append((row, url, format_id))
+        for row in self.model.checked_rows():
+            url = self.host.video_info_list[row][1]
+            selected_videos.append((row, url, self.selected_format(row)))
         return selected_videos
 
     def update_download_progress(
         self, row: int, percent: float, speed: str, eta: str
     ) -> None:
         """Update download progress for a specific row.
-        
+
         Args:
             row: Row index
             percent: Download percentage (0-100)
             speed: Download speed string (e.g., "1.5MiB/s")
             eta: Estimated time remaining (e.g., "00:30")
         """
-        if row < 0 or row >= self.table.rowCount():
-            return
-        
-        progress_widget = self.table.cellWidget(row, 4)
-        if isinstance(progress_widget, QProgressBar):
-            progress_widget.setValue(int(percent))
-            # Format: "45% - 1.5MiB/s - ETA: 00:30"
-            if speed and speed != "N/A" and eta and eta != "N/A":
-                progress_widget.setFormat(f"{int(percent)}% - {speed} - ETA: {eta}")
-            elif speed and speed != "N/A":
-                progress_widget.setFormat(f"{int(percent)}% - {speed}")
-            elif eta and eta != "N/A":
-                progress_widget.setFormat(f"{int(percent)}% - ETA: {eta}")
-            else:
-                progress_widget.setFormat(f"{int(percent)}%")
+        # Format: "45% - 1.5MiB/s - ETA: 00:30"
+        if speed and speed != "N/A" and eta and eta != "N/A":
+            text = f"{int(percent)}% - {speed} - ETA: {eta}"
+        elif speed and speed != "N/A":
+            text = f"{int(percent)}% - {speed}"
+        elif eta and eta != "N/A":
+            text = f"{int(percent)}% - ETA: {eta}"
+        else:
+            text = f"{int(percent)}%"
+        self.model.set_progress(row, percent, text)
 
     def mark_download_complete(self, row: int) -> None:
         """Mark a download as complete with visual indication.
-        
+
         Args:
             row: Row index
         """
-        if row < 0 or row >= self.table.rowCount():
-            return
-        
-        # Update progress bar
-        progress_widget = self.table.cellWidget(row, 4)
-        if isinstance(progress_widget, QProgressBar):
-            progress_widget.setValue(100)
-            progress_widget.setFormat("✓ Complete")
-            progress_widget.setStyleSheet("""
-                QProgressBar {
-                    border: 1px solid #4CAF50;
-                    border-radius: 3px;
-                    text-align: center;
-                    background-color: #2D2D2D;
-                }
-                QProgressBar::chunk {
-                    background-color: #4CAF50;
-                    border-radius: 2px;
-                }
-            """)
-        
-        # Change row background color to indicate completion
-        for col in range(self.table.columnCount()):
-            item = self.table.item(row, col)
-            if item:
-                item.setBackground(QColor(40, 60, 40))  # Dark green tint
+        self.model.set_progress(row, 100, "✓ Complete", STATE_COMPLETE)
 
     def mark_download_started(self, row: int, title: str) -> None:
         """Mark a download as started.
-        
+
         Args:
             row: Row index
             title: Video title
         """
-        if row < 0 or row >= self.table.rowCount():
-            return
-        
-        progress_widget = self.table.cellWidget(row, 4)
-        if isinstance(progress_widget, QProgressBar):
-            progress_widget.setValue(0)
-            progress_widget.setFormat("Starting...")
-            progress_widget.setStyleSheet("""
-                QProgressBar {
-                    border: 1px solid #555;
-                    border-radius: 3px;
-                    text-align: center;
-                    background-color: #2D2D2D;
-                }
-                QProgressBar::chunk {
-                    background-color: #2196F3;
-                    border-radius: 2px;
-                }
-            """)
+        self.model.set_progress(row, 0, "Starting...", STATE_DOWNLOADING)
@@ -0,0 +1,370 @@
+"""Model and delegates backing the video table.
+
+Rows are plain data (VideoRow) in a QAbstractTableModel; the format column
+and the progress bar are painted by delegates, and a format dropdown exists
+only while a cell is being edited. This keeps memory and layout cost per
+row constant however many rows a playlist adds.
+"""
+
+from typing import Callable, Iterable, List, Optional
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, QRect, Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QPainter, QPalette, QPixmap
+from PyQt5.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+from ..models.formats import FormatRecord
+from .components import FormatComboBox, LazyFormatComboBox
+
+COLUMN_CHECK, COLUMN_THUMBNAIL, COLUMN_TITLE, COLUMN_FORMAT, COLUMN_PROGRESS = range(5)
+HEADERS = ["", "Thumbnail", "Title", "Format", "Progress"]
+
+PLACEHOLDER_FORMAT_TEXT = "Formats load on demand..."
+NO_FORMATS_TEXT = "No available formats"
+
+# Custom data roles
+THUMBNAIL_URL_ROLE = Qt.UserRole  # thumbnail URL still to be loaded, else None
+VIDEO_URL_ROLE = Qt.UserRole + 1
+FORMAT_RECORD_ROLE = Qt.UserRole + 2  # selected FormatRecord
+PROGRESS_ROLE = Qt.UserRole + 3  # percent as float
+STATE_ROLE = Qt.UserRole + 4
+
+STATE_READY = "ready"
+STATE_DOWNLOADING = "downloading"
+STATE_COMPLETE = "complete"
+
+_COMPLETE_BACKGROUND = QColor(40, 60, 40)  # dark green tint
+
+
+class VideoRow:
+    """Everything the table shows for one video."""
+
+    __slots__ = (
+        "title", "thumbnail_url", "video_url", "formats", "selected", "checked",
+        "pixmap", "progress", "progress_text", "state",
+    )
+
+    def __init__(
+        self,
+        title: str,
+        thumbnail_url: str,
+        video_url: str,
+        formats: Optional[List[FormatRecord]] = None,
+        selected: Optional[FormatRecord] = None,
+    ):
+        self.title = title
+        self.thumbnail_url = thumbnail_url or None
+        self.video_url = video_url
+        self.formats = formats  # None while the formats load on demand
+        self.selected = selected
+        self.checked = False
+        self.pixmap: Optional[QPixmap] = None
+        self.progress = 0.0
+        self.progress_text = "Ready"
+        self.state = STATE_READY
+
+    @property
+    def pending(self) -> bool:
+        return self.formats is None
+
+
+class VideoTableModel(QAbstractTableModel):
+    """Table model holding one VideoRow per video."""
+
+    checks_changed = pyqtSignal(list)  # rows whose check state changed
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[VideoRow] = []
+        self.audio_output_policy = "mp3"  # decides how conversion formats are labelled
+
+    # Qt model interface -------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):  # noqa: N802 (Qt naming)
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):  # noqa: N802 (Qt naming)
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):  # noqa: N802 (Qt naming)
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(HEADERS):
+            return HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        column = index.column()
+        if column == COLUMN_CHECK:
+            flags |= Qt.ItemIsUserCheckable
+        elif column in (COLUMN_TITLE, COLUMN_FORMAT):
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.BackgroundRole:
+            return _COMPLETE_BACKGROUND if row.state == STATE_COMPLETE else None
+        if column == COLUMN_CHECK:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if row.checked else Qt.Unchecked
+        elif column == COLUMN_THUMBNAIL:
+            if role == Qt.DecorationRole:
+                return row.pixmap
+            if role == THUMBNAIL_URL_ROLE:
+                return row.thumbnail_url
+            if role == VIDEO_URL_ROLE:
+                return row.video_url
+        elif column == COLUMN_TITLE:
+            if role in (Qt.DisplayRole, Qt.EditRole, Qt.ToolTipRole):
+                return row.title
+        elif column == COLUMN_FORMAT:
+            if role == Qt.DisplayRole:
+                return self.format_text(row)
+            if role in (Qt.EditRole, FORMAT_RECORD_ROLE):
+                return row.selected
+        elif column == COLUMN_PROGRESS:
+            if role == Qt.DisplayRole:
+                return row.progress_text
+            if role == PROGRESS_ROLE:
+                return row.progress
+            if role == STATE_ROLE:
+                return row.state
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):  # noqa: N802 (Qt naming)
+        if not index.isValid():
+            return False
+        row = self._rows[index.row()]
+        column = index.column()
+        if column == COLUMN_CHECK and role == Qt.CheckStateRole:
+            row.checked = value in (Qt.Checked, True, 2)
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+            self.checks_changed.emit([index.row()])
+            return True
+        if column == COLUMN_TITLE and role == Qt.EditRole:
+            row.title = str(value)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+            return True
+        if column == COLUMN_FORMAT and role == Qt.EditRole:
+            if value is None:
+                return False
+            row.selected = value
+            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+            return True
+        return False
+
+    # Row access ---------------------------------------------------------
+
+    def format_text(self, row: VideoRow) -> str:
+        if row.selected is not None:
+            return row.selected.display_label(self.audio_output_policy)
+        return PLACEHOLDER_FORMAT_TEXT if row.pending else NO_FORMATS_TEXT
+
+    def row(self, row: int) -> Optional[VideoRow]:
+        return self._rows[row] if 0 <= row < len(self._rows) else None
+
+    def rows(self) -> List[VideoRow]:
+        return self._rows
+
+    def append_rows(self, rows: List[VideoRow]) -> None:
+        """Insert ``rows`` at the end with a single insert notification."""
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def remove_rows(self, rows: Iterable[int]) -> None:
+        """Remove the given rows, merging adjacent ones into one notification."""
+        for first, last in _contiguous_ranges(sorted(set(rows), reverse=True)):
+            if 0 <= first and last < len(self._rows):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                del self._rows[first:last + 1]
+                self.endRemoveRows()
+
+    def checked_rows(self) -> List[int]:
+        return [index for index, row in enumerate(self._rows) if row.checked]
+
+    def all_checked(self) -> bool:
+        return bool(self._rows) and all(row.checked for row in self._rows)
+
+    def set_all_checked(self, checked: bool) -> None:
+        changed = [index for index, row in enumerate(self._rows) if row.checked != checked]
+        if not changed:
+            return
+        for index in changed:
+            self._rows[index].checked = checked
+        self._emit_column(COLUMN_CHECK, [Qt.CheckStateRole])
+        self.checks_changed.emit(changed)
+
+    def set_formats(self, row: int, formats: List[FormatRecord], selected: Optional[FormatRecord]) -> None:
+        video = self.row(row)
+        if video is None:
+            return
+        video.formats = list(formats)
+        video.selected = selected
+        self._emit_cell(row, COLUMN_FORMAT, [Qt.DisplayRole, Qt.EditRole])
+
+    def set_selected(self, row: int, selected: Optional[FormatRecord]) -> None:
+        video = self.row(row)
+        if video is not None and video.selected is not selected:
+            video.selected = selected
+            self._emit_cell(row, COLUMN_FORMAT, [Qt.DisplayRole, Qt.EditRole])
+
+    def set_thumbnail(self, row: int, pixmap: Optional[QPixmap]) -> None:
+        """Show ``pixmap`` (None: give up on the thumbnail) and stop loading it."""
+        video = self.row(row)
+        if video is None:
+            return
+        video.pixmap = pixmap
+        video.thumbnail_url = None
+        self._emit_cell(row, COLUMN_THUMBNAIL, [Qt.DecorationRole])
+
+    def set_progress(self, row: int, percent: float, text: str, state: Optional[str] = None) -> None:
+        video = self.row(row)
+        if video is None:
+            return
+        previous_state = video.state
+        video.progress = percent
+        video.progress_text = text
+        if state is not None:
+            video.state = state
+        if video.state != previous_state and STATE_COMPLETE in (video.state, previous_state):
+            # The row background follows the completed state
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1))
+        else:
+            self._emit_cell(row, COLUMN_PROGRESS, [Qt.DisplayRole, PROGRESS_ROLE, STATE_ROLE])
+
+    def set_audio_output_policy(self, policy: str) -> None:
+        if policy != self.audio_output_policy:
+            self.audio_output_policy = policy
+            self._emit_column(COLUMN_FORMAT, [Qt.DisplayRole])
+
+    def _emit_cell(self, row: int, column: int, roles: List[int]) -> None:
+        index = self.index(row, column)
+        self.dataChanged.emit(index, index, roles)
+
+    def _emit_column(self, column: int, roles: List[int]) -> None:
+        if self._rows:
+            self.dataChanged.emit(self.index(0, column), self.index(len(self._rows) - 1, column), roles)
+
+
+def _contiguous_ranges(descending: List[int]):
+    """Yield ``(first, last)`` runs from row numbers sorted high to low."""
+    run = []
+    for row in descending:
+        if run and row != run[-1] - 1:
+            yield run[-1], run[0]
+            run = []
+        run.append(row)
+    if run:
+        yield run[-1], run[0]
+
+
+class FormatDelegate(QStyledItemDelegate):
+    """Paints the selected format as text; edits it with a dropdown.
+
+    The dropdown is created only while the cell is edited and is filled
+    by ``populate(combo, formats, selected)``.
+    """
+
+    def __init__(
+        self,
+        populate: Callable[[FormatComboBox, List[FormatRecord], Optional[FormatRecord]], None],
+        request_formats: Callable[[str], None],
+        parent=None,
+    ):
+        super().__init__(parent)
+        self._populate = populate
+        self._request_formats = request_formats
+        self._editors = {}  # id(editor) -> (editor, VideoRow) while editing
+
+    def createEditor(self, parent, option, index):  # noqa: N802 (Qt naming)
+        video = index.model().row(index.row())
+        if video is None:
+            return None
+        if video.pending:
+            combo = LazyFormatComboBox(video.video_url, parent)
+            combo.popup_requested.connect(lambda url=video.video_url: self._request_formats(url))
+        else:
+            combo = FormatComboBox(parent)
+        combo.activated.connect(lambda _=None, editor=combo: self._commit(editor))
+        key = id(combo)
+        self._editors[key] = (combo, video)
+        combo.destroyed.connect(lambda _=None, key=key: self._editors.pop(key, None))
+        # Behave like the dropdown used to: one click opens the list
+        QTimer.singleShot(0, combo.showPopup)
+        return combo
+
+    def setEditorData(self, editor, index):  # noqa: N802 (Qt naming)
+        video = index.model().row(index.row())
+        if video is not None:
+            self._fill(editor, video)
+
+    def _fill(self, editor, video: VideoRow) -> None:
+        editor.blockSignals(True)
+        editor.clear()
+        if video.pending:
+            editor.addItem(PLACEHOLDER_FORMAT_TEXT, None)
+        else:
+            if isinstance(editor, LazyFormatComboBox):
+                editor.pending = False
+            self._populate(editor, video.formats, video.selected)
+        editor.blockSignals(False)
+
+    def setModelData(self, editor, model, index):  # noqa: N802 (Qt naming)
+        record = editor.currentData()
+        if record is not None:
+            model.setData(index, record, Qt.EditRole)
+
+    def refresh(self, video_url: str) -> None:
+        """Reload open editors of ``video_url`` after its formats changed."""
+        for editor, video in list(self._editors.values()):
+            if video.video_url == video_url:
+                self._fill(editor, video)
+
+    def _commit(self, editor) -> None:
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor, QStyledItemDelegate.NoHint)
+
+
+class ProgressDelegate(QStyledItemDelegate):
+    """Paints a progress bar from PROGRESS_ROLE / STATE_ROLE."""
+
+    CHUNK_COLORS = {
+        STATE_READY: QColor("#4CAF50"),
+        STATE_DOWNLOADING: QColor("#2196F3"),
+        STATE_COMPLETE: QColor("#4CAF50"),
+    }
+
+    def paint(self, painter: QPainter, option, index):
+        option = QStyleOptionViewItem(option)
+        self.initStyleOption(option, index)
+        widget = option.widget
+        style = widget.style() if widget is not None else None
+        if style is not None:
+            option.text = ""
+            style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, widget)
+
+        percent = max(0.0, min(100.0, float(index.data(PROGRESS_ROLE) or 0.0)))
+        state = index.data(STATE_ROLE) or STATE_READY
+        rect = option.rect.adjusted(3, 5, -3, -5)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QColor("#4CAF50") if state == STATE_COMPLETE else QColor("#555"))
+        painter.setBrush(QColor("#2D2D2D"))
+        painter.drawRoundedRect(rect, 3, 3)
+        if percent > 0:
+            chunk = QRect(rect.adjusted(1, 1, -1, -1))
+            chunk.setWidth(int(chunk.width() * percent / 100))
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.CHUNK_COLORS.get(state, self.CHUNK_COLORS[STATE_READY]))
+            painter.drawRoundedRect(chunk, 2, 2)
+        painter.setPen(option.palette.color(QPalette.Text))
+        painter.drawText(rect, Qt.AlignCenter, index.data(Qt.DisplayRole) or "")
+        painter.restore()
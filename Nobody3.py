@@ -4,5 +4,11 @@ Main entry point for the application.
 """
 
 if __name__ == "__main__":
+    # Download workers are spawned processes; in a frozen build this must
+    # run before the GUI is imported so workers don't start the app again
+    import multiprocessing
+
+    multiprocessing.freeze_support()
+
     from Nobody.main import main
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,31 @@
+from Nobody.services.concurrency import ConcurrencyController
+from Nobody.services.host_health import OUTCOME_THROTTLED
+
+
+def test_concurrency_controller_probes_up_and_backs_off(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("Nobody.services.concurrency.time.monotonic", lambda: clock[0])
+    controller = ConcurrencyController(min_workers=1, max_workers=6, window_seconds=1, hold_windows=2)
+    downloaded = {}
+
+    def window(rate_per_row, rows):
+        for row in range(rows):
+            downloaded[row] = downloaded.get(row, 0) + rate_per_row
+            controller.record_progress(row, {"downloaded_bytes": downloaded[row]})
+        clock[0] += 1
+
+    workers = controller.initial_workers()
+    assert workers == 2
+    window(1000, workers)
+    assert controller.adjust(workers, busy=2) == 3  # all busy: probe up
+    window(1000, 3)
+    assert controller.adjust(3, busy=3) == 4  # +50%: keep probing
+    window(750, 4)
+    assert controller.adjust(4, busy=4) == 3  # no gain from the 4th: revert
+    window(1000, 3)
+    assert controller.adjust(3, busy=3) == 3  # holding after a failed probe
+
+    controller.record_outcome(0, OUTCOME_THROTTLED)
+    window(1000, 3)
+    assert controller.adjust(3, busy=3) == 1  # throttled: halve
+    assert controller.adjust(1, busy=1) == 1  # window not elapsed yet
@@ -0,0 +1,95 @@
+import http.server
+import os
+import threading
+import time
+
+import pytest
+
+from Nobody.models.formats import FormatRecord
+from Nobody.models.queue import DownloadQueue, DownloadStatus
+from Nobody.services.download_engine import DownloadEngine
+from Nobody.services.download_worker import WorkerProcess
+from Nobody.services.extractor_session import ExtractorSession
+from Nobody.services.host_health import HostHealth
+
+
+class StallingHandler(http.server.BaseHTTPRequestHandler):
+    """Accept the request and never answer, like a hung extractor."""
+
+    def do_GET(self):
+        time.sleep(30)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_running_download_process_is_killed_on_cancel(tmp_path):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StallingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/video"
+
+    queue = DownloadQueue()
+    engine = DownloadEngine(
+        queue,
+        str(tmp_path),
+        max_workers=1,
+        session=ExtractorSession(str(tmp_path / "yt-dlp")),
+        host_health=HostHealth(rate_per_second=100, burst=10),
+    )
+    item = engine.enqueue("Hung", url, FormatRecord("best", "mp4", "Video"), 0)
+    deadline = time.monotonic() + 30
+    while not engine._running and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert item.status == DownloadStatus.DOWNLOADING
+
+    started = time.monotonic()
+    assert engine.cancel_item(item.item_id)
+    while item.status == DownloadStatus.DOWNLOADING and time.monotonic() < deadline:
+        time.sleep(0.005)
+    elapsed = time.monotonic() - started
+
+    assert item.status == DownloadStatus.CANCELLED
+    assert elapsed < 1.0
+    engine.shutdown(timeout=1)
+    server.shutdown()
+
+
+def test_stop_before_the_worker_starts_is_not_lost(tmp_path, monkeypatch):
+    original = DownloadEngine.download_video
+    stopped = []
+
+    def cancel_then_download(self, item_id, *args):
+        # The stop lands after the claim but before the process is armed
+        stopped.append(self.cancel_item(item_id))
+        return original(self, item_id, *args)
+
+    monkeypatch.setattr(DownloadEngine, "download_video", cancel_then_download)
+    queue = DownloadQueue()
+    engine = DownloadEngine(
+        queue, str(tmp_path), max_workers=1, session=ExtractorSession(str(tmp_path / "yt-dlp"))
+    )
+    item = engine.enqueue("Never", "http://127.0.0.1:9/video", FormatRecord("best", "mp4", "Video"), 0)
+    deadline = time.monotonic() + 10
+    while item.status != DownloadStatus.CANCELLED and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert stopped == [True]
+    assert item.status == DownloadStatus.CANCELLED
+    assert not any(process.alive for process in engine._processes)
+    engine.shutdown(timeout=1)
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg"), reason="POSIX process groups")
+def test_worker_process_leads_its_own_process_group():
+    worker = WorkerProcess()
+    worker._ensure_started()
+    pid = worker._process.pid
+    deadline = time.monotonic() + 10
+    while os.getpgid(pid) != pid and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert os.getpgid(pid) == pid  # killpg() reaches ffmpeg children too
+    worker.kill()
+    worker._process.join(5)
+    assert not worker.alive
@@ -0,0 +1,312 @@
+import time
+
+from Nobody.models.formats import FormatRecord
+from Nobody.services import extractor_session as session_module
+from Nobody.services.downloader import Downloader
+from Nobody.services.extractor_session import ExtractorSession
+
+
+class RecordingYoutubeDL:
+    instances = []
+
+    def __init__(self, params=None):
+        RecordingYoutubeDL.instances.append(self)
+        self.params = params or {}
+        self.params["outtmpl"] = {"default": self.params.get("outtmpl", "")}
+        self.processed = []
+        self.downloaded = []
+
+    def add_progress_hook(self, hook):
+        pass
+
+    def add_postprocessor_hook(self, hook):
+        pass
+
+    def build_format_selector(self, spec):
+        return spec
+
+    def process_ie_result(self, info, download=False):
+        self.processed.append(info["webpage_url"])
+
+    def download(self, urls):
+        self.downloaded.extend(urls)
+
+    def close(self):
+        pass
+
+
+def _info(url, expire):
+    return {
+        "_type": "video",
+        "webpage_url": url,
+        "formats": [{"format_id": "18", "url": f"https://cdn.example.com/v?expire={int(expire)}&sig=x"}],
+        "requested_formats": [{}],
+    }
+
+
+def test_download_reuses_search_info_until_streams_expire(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_module.yt_dlp, "YoutubeDL", RecordingYoutubeDL)
+    RecordingYoutubeDL.instances = []
+    session = ExtractorSession(cache_dir=str(tmp_path / "yt-dlp"))
+    now = time.time()
+    session.resolved.put(_info("https://example.com/fresh", now + 3600))
+    session.resolved.put(_info("https://example.com/stale", now + 30))
+    record = FormatRecord("18", "mp4", "Video")
+    downloader = Downloader(
+        [
+            ("Fresh", "https://example.com/fresh", record),
+            ("Stale", "https://example.com/stale", record),
+            ("Unknown", "https://example.com/unknown", record),
+        ],
+        str(tmp_path),
+        session=session,
+    )
+
+    downloader.run()
+
+    assert (downloader.reused_infos, downloader.extractions) == (1, 2)
+    # One pooled client served the whole batch
+    [ydl] = RecordingYoutubeDL.instances
+    assert ydl.processed == ["https://example.com/fresh"]
+    assert ydl.downloaded == ["https://example.com/stale", "https://example.com/unknown"]
+
+
+def test_engine_runs_queue_in_parallel_and_accepts_new_items(tmp_path, monkeypatch):
+    import threading
+
+    from PyQt5.QtCore import QThread, Qt
+
+    from Nobody.models.queue import DownloadQueue, DownloadStatus
+    from Nobody.services.download_engine import DownloadEngine
+    from Nobody.services.host_health import HostHealth
+
+    started = []
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_download(self, row_idx, title, url, record, directory):
+        with lock:
+            started.append(title)
+            running.append(title)
+            peak.append(len(running))
+        time.sleep(0.1)
+        with lock:
+            running.remove(title)
+        return title != "Broken"
+
+    monkeypatch.setattr(DownloadEngine, "download_video", fake_download)
+    queue = DownloadQueue()
+    engine = DownloadEngine(
+        queue,
+        str(tmp_path),
+        max_workers=3,
+        session=ExtractorSession(str(tmp_path)),
+        host_health=HostHealth(rate_per_second=1000, burst=100, max_per_host=8),
+    )
+    # Workers are plain threads; the engine itself only carries signals
+    assert not isinstance(engine, QThread)
+    drained = threading.Event()
+    # Emitted from a worker thread; no event loop runs in this test
+    engine.queue_drained.connect(drained.set, Qt.DirectConnection)
+    record = FormatRecord("18", "mp4", "Video")
+
+    begin = time.monotonic()
+    for i in range(6):
+        engine.enqueue(f"Track {i}", f"https://example.com/{i}", record, i)
+    assert engine.enqueue("Track 0", "https://example.com/0", record, 0) is None
+    engine.enqueue("Broken", "https://example.com/broken", record, 6)
+    engine.enqueue("Urgent", "https://example.com/urgent", record, 7, priority=5)
+    assert drained.wait(5)
+    elapsed = time.monotonic() - begin
+
+    assert max(peak) == 3
+    assert elapsed < 0.8 * 8 * 0.1
+    assert started.index("Urgent") < started.index("Track 5")
+    statuses = {item.title: item.status for item in queue.items}
+    assert statuses["Broken"] == DownloadStatus.FAILED
+    assert all(status == DownloadStatus.COMPLETED for title, status in statuses.items() if title != "Broken")
+    engine.shutdown(timeout=1)
+
+
+def test_engine_downloads_next_item_while_previous_encodes(tmp_path, monkeypatch):
+    import threading
+    from concurrent.futures import Future
+
+    from PyQt5.QtCore import Qt
+
+    from Nobody.models.queue import DownloadQueue, DownloadStatus
+    from Nobody.services.download_engine import DownloadEngine
+
+    class ManualTranscoder:
+        def __init__(self):
+            from Nobody.services.transcoder import StageStats
+
+            self.stats = StageStats("transcode")
+            self.jobs = []
+
+        def submit(self, source, target):
+            future = Future()
+            self.jobs.append((target, future))
+            return future
+
+        def shutdown(self, wait=False):
+            pass
+
+    downloaded = []
+
+    def fake_download(self, row_idx, title, url, record, directory):
+        downloaded.append(title)
+        self._start_transcode(row_idx, title, url, record, f"{title}.webm", f"{title}.mp3")
+        return True
+
+    monkeypatch.setattr(DownloadEngine, "download_video", fake_download)
+    transcoder = ManualTranscoder()
+    queue = DownloadQueue()
+    engine = DownloadEngine(
+        queue, str(tmp_path), max_workers=1, session=ExtractorSession(str(tmp_path)), transcoder=transcoder
+    )
+    drained = threading.Event()
+    engine.queue_drained.connect(drained.set, Qt.DirectConnection)
+    record = FormatRecord("bestaudio/best", "mp3", "Audio-only", conversion="mp3")
+
+    for i in range(3):
+        engine.enqueue(f"Song {i}", f"https://example.com/{i}", record, i)
+    deadline = time.monotonic() + 5
+    while len(transcoder.jobs) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # The single download worker moved on while every encode is pending
+    assert downloaded == ["Song 0", "Song 1", "Song 2"]
+    assert all(item.status == DownloadStatus.PROCESSING for item in queue.items)
+    assert not drained.is_set() and engine.is_busy()
+
+    for _, future in transcoder.jobs:
+        future.set_result(1024)
+    assert drained.wait(5)
+    assert all(item.status == DownloadStatus.COMPLETED for item in queue.items)
+    engine.shutdown(timeout=1)
+
+
+def test_handed_off_item_completes_only_after_transcode(qt_app, tmp_path):
+    from concurrent.futures import Future
+
+    from PyQt5.QtCore import Qt
+
+    class FailingTranscoder:
+        def submit(self, source, target):
+            future = Future()
+            future.set_exception(OSError("ffmpeg exited with status 1"))
+            return future
+
+    downloader = Downloader([], str(tmp_path), session=ExtractorSession(str(tmp_path)))
+    downloader.transcoder = FailingTranscoder()
+    completed, failed = [], []
+    downloader.item_completed.connect(completed.append, Qt.DirectConnection)
+    downloader.download_failed.connect(failed.append, Qt.DirectConnection)
+    record = FormatRecord("bestaudio/best", "mp3", "Audio-only", conversion="mp3")
+
+    downloader._handle_progress(0, {"status": "finished", "filename": str(tmp_path / "Song.webm")})
+    downloader._start_transcode(0, "Song", "https://example.com/1", record, "Song.webm", "Song.mp3")
+
+    assert completed == []
+    assert failed and "MP3 conversion failed" in failed[0]
+
+
+def test_original_audio_policy_remuxes_instead_of_transcoding(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_module.yt_dlp, "YoutubeDL", RecordingYoutubeDL)
+    RecordingYoutubeDL.instances = []
+    record = FormatRecord("bestaudio/best", "mp3", "Audio-only", acodec="mp3", conversion="mp3")
+    downloader = Downloader(
+        [("Song", "https://example.com/song", record)],
+        str(tmp_path),
+        session=ExtractorSession(cache_dir=str(tmp_path / "yt-dlp")),
+    )
+    downloader.transcoder = object()  # must not be used
+    downloader.audio_output_policy = "original"
+
+    downloader.run()
+
+    [ydl] = RecordingYoutubeDL.instances
+    assert ydl.params["postprocessors"] == [{"key": "FFmpegExtractAudio", "preferredcodec": "best"}]
+    assert ydl.downloaded == ["https://example.com/song"]
+
+
+def test_progress_hooks_are_coalesced_per_row(qt_app):
+    from Nobody.services.progress import ProgressAggregator
+
+    aggregator = ProgressAggregator()
+    emitted = []
+    aggregator.item_progress.connect(lambda *args: emitted.append(args))
+    overall = []
+    aggregator.overall_progress.connect(overall.append)
+
+    for chunk in range(1, 101):
+        for row in (0, 1):
+            aggregator.update(row, f"Song {row}", {
+                "status": "downloading",
+                "downloaded_bytes": chunk * 1024,
+                "total_bytes": 100 * 1024 * (row + 1),
+                "speed": 2 * 1024 * 1024,
+                "eta": 75,
+            })
+
+    assert aggregator.flush() == 2
+    assert emitted == [(0, 100.0, "2.0MiB/s", "01:15"), (1, 50.0, "2.0MiB/s", "01:15")]
+    assert round(overall[-1], 1) == 66.7
+    # Nothing new since the last tick: nothing is published
+    assert aggregator.flush() == 0
+
+
+def test_final_path_from_postprocessor_hook_feeds_archive(tmp_path, monkeypatch):
+    from Nobody.models.download_archive import DownloadArchive
+
+    final = tmp_path / "Song [merged].mp4"
+
+    class PostprocessingYoutubeDL(RecordingYoutubeDL):
+        def add_postprocessor_hook(self, hook):
+            self.pp_hook = hook
+
+        def download(self, urls):
+            final.write_bytes(b"x" * 10)
+            info = {"extractor_key": "Youtube", "id": "dQw4w9WgXcQ", "filepath": str(final)}
+            self.pp_hook({"status": "finished", "postprocessor": "MoveFiles", "info_dict": info})
+
+    monkeypatch.setattr(session_module.yt_dlp, "YoutubeDL", PostprocessingYoutubeDL)
+    url = "https://youtu.be/dQw4w9WgXcQ"
+    record = FormatRecord("22", "mp4", "Video")
+    downloader = Downloader(
+        [("Song", url, record)], str(tmp_path), session=ExtractorSession(cache_dir=str(tmp_path / "yt-dlp"))
+    )
+    downloader.archive = DownloadArchive(str(tmp_path / "archive.json"))
+    history = []
+    downloader.history_added.connect(lambda *args: history.append(args))
+
+    downloader.run()
+    assert not (tmp_path / "archive.json").exists()  # saved in the background
+    downloader.archive.flush()
+
+    assert history == [("Song", url, "22", str(final), 10)]
+    reloaded = DownloadArchive(str(tmp_path / "archive.json"))
+    assert reloaded.find("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "22")["path"] == str(final)
+    assert reloaded.find(url, "140") is None
+    final.unlink()
+    assert reloaded.find(url, "22") is None
+
+
+def test_archive_keeps_remuxed_audio_apart_from_mp3(tmp_path):
+    from Nobody.models.download_archive import DownloadArchive, archive_output
+
+    url = "https://youtu.be/dQw4w9WgXcQ"
+    remuxed = tmp_path / "Song.opus"
+    remuxed.write_bytes(b"x")
+    archive = DownloadArchive(str(tmp_path / "archive.json"))
+    key = "youtube dQw4w9WgXcQ"
+
+    archive.add(key, "bestaudio/best", str(remuxed), output=archive_output("mp3", "original"))
+    assert archive.find(url, "bestaudio/best", archive_output("mp3", "original"))
+    assert archive.find(url, "bestaudio/best", archive_output("mp3", "mp3")) is None
+
+    # Entries recorded under the MP3 key by older versions are not trusted
+    archive.add(key, "bestaudio/best", str(remuxed), output="mp3")
+    assert archive.find(url, "bestaudio/best", "mp3") is None
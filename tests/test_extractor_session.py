@@ -0,0 +1,35 @@
+from Nobody.services.extractor_session import ExtractorSession
+
+
+def test_clients_are_reused_per_profile(tmp_path):
+    session = ExtractorSession(cache_dir=str(tmp_path / "yt-dlp"))
+    options = {"quiet": True, "skip_download": True, "format": "best"}
+
+    with session.client(options) as first:
+        assert first.params["cachedir"] == str(tmp_path / "yt-dlp")
+    with session.client(options) as second:
+        assert second is first
+    with session.client({**options, "extract_flat": "in_playlist"}) as other:
+        assert other is not first
+
+    stats = session.stats()
+    assert stats["created"] == 2 and stats["reused"] == 1
+    session.close()
+
+
+def test_per_use_options_are_applied_to_reused_client(tmp_path):
+    session = ExtractorSession(cache_dir=str(tmp_path / "yt-dlp"))
+    seen = []
+    options = {"quiet": True, "format": "best", "outtmpl": str(tmp_path / "a.%(ext)s")}
+
+    with session.client({**options, "progress_hooks": [seen.append]}) as ydl:
+        ydl._progress_hooks[0]({"status": "downloading"})
+    with session.client({**options, "format": "bestaudio", "outtmpl": str(tmp_path / "b.%(ext)s")}) as ydl:
+        ydl._progress_hooks[0]({"status": "finished"})
+        assert ydl.params["format"] == "bestaudio"
+        assert ydl.params["outtmpl"]["default"] == str(tmp_path / "b.%(ext)s")
+
+    # Hooks belong to the borrower that registered them
+    assert seen == [{"status": "downloading"}]
+    assert session.stats()["created"] == 1
+    session.close()
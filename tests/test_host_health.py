@@ -0,0 +1,85 @@
+import time
+
+from Nobody.models.formats import FormatRecord
+from Nobody.models.queue import DownloadQueue, DownloadStatus
+from Nobody.services.download_engine import DownloadEngine
+from Nobody.services.extractor_session import ExtractorSession
+from Nobody.services.host_health import (
+    OUTCOME_OK,
+    OUTCOME_THROTTLED,
+    HostHealth,
+    classify_failure,
+    host_of,
+)
+
+
+def test_backoff_opens_circuit_and_trial_closes_it(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("Nobody.services.host_health.time.monotonic", lambda: clock[0])
+    health = HostHealth(
+        rate_per_second=1, burst=2, max_per_host=2, base_backoff=1, failure_threshold=2, cooldown_seconds=30
+    )
+    host = host_of("https://www.example.com/watch?v=1")
+    assert host == "example.com"
+
+    assert health.acquire(host) and health.acquire(host)
+    assert not health.acquire(host)  # concurrency cap
+    health.release(host, classify_failure("ERROR: HTTP Error 429: Too Many Requests"))
+    assert not health.acquire(host)  # backing off
+    health.release(host, OUTCOME_THROTTLED)
+    assert health.snapshot()[host]["state"] == "open"
+    assert health.paused_hosts() == [host]
+    assert health.acquire("other.org")  # other hosts unaffected
+
+    clock[0] += 31
+    assert health.acquire(host)  # half-open trial
+    assert not health.acquire(host)
+    health.release(host, OUTCOME_OK)
+    counters = health.snapshot()[host]
+    assert (counters["state"], counters["throttled"], counters["circuit_trips"]) == ("closed", 2, 1)
+
+
+def test_throttled_host_does_not_block_other_hosts(tmp_path, monkeypatch):
+    def fake_download(self, row_idx, title, url, record, directory):
+        if "slow.example" in url:
+            self._errors.message = "HTTP Error 429: Too Many Requests"
+            return False
+        time.sleep(0.02)
+        return True
+
+    monkeypatch.setattr(DownloadEngine, "download_video", fake_download)
+    queue = DownloadQueue()
+    health = HostHealth(rate_per_second=1000, burst=100, failure_threshold=1, cooldown_seconds=60)
+    engine = DownloadEngine(
+        queue, str(tmp_path), max_workers=2, session=ExtractorSession(str(tmp_path)), host_health=health
+    )
+    record = FormatRecord("18", "mp4", "Video")
+    throttled = engine.enqueue("Throttled", "https://slow.example/a", record, 0, priority=5)
+    engine.enqueue("Paused", "https://slow.example/b", record, 1, priority=5)
+    for i in range(4):
+        engine.enqueue(f"Fine {i}", f"https://fast.example/{i}", record, 2 + i)
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        done = [item for item in queue.items if item.status == DownloadStatus.COMPLETED]
+        if len(done) == 4:
+            break
+        time.sleep(0.01)
+
+    assert len(done) == 4
+    assert throttled.status == DownloadStatus.QUEUED and throttled.attempts == 1
+    assert health.paused_hosts() == ["slow.example"]
+    assert engine.is_busy()
+    engine.shutdown(timeout=1)
+
+
+
+def test_engine_per_host_cap_is_independent_of_worker_count(tmp_path):
+    engine = DownloadEngine(
+        DownloadQueue(), str(tmp_path), max_workers=8, session=ExtractorSession(str(tmp_path / "yt-dlp"))
+    )
+    engine.set_max_workers(12)
+
+    host = host_of("https://example.com/watch?v=1")
+    assert engine.host_health.acquire(host) and engine.host_health.acquire(host)
+    assert not engine.host_health.acquire(host)  # one host never takes every worker
@@ -0,0 +1,63 @@
+import http.server
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Nobody.utils.http_client import HttpClient
+
+BODY = b"thumbnail bytes"
+
+
+class ValidatingHandler(http.server.BaseHTTPRequestHandler):
+    """Serve BODY with an ETag; hold requests until ``release`` is set."""
+
+    protocol_version = "HTTP/1.1"
+    hits = []
+    release = threading.Event()
+
+    def do_GET(self):
+        self.hits.append(self.headers.get("If-None-Match"))
+        self.release.wait(5)
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_identical_requests_share_one_fetch_and_revalidate(tmp_path):
+    ValidatingHandler.hits = []
+    ValidatingHandler.release.clear()
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ValidatingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/thumb.jpg"
+    client = HttpClient()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(client.get, url) for _ in range(4)]
+        deadline = time.monotonic() + 5
+        while client.stats()["coalesced"] < 3 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        ValidatingHandler.release.set()
+        assert [future.result() for future in futures] == [BODY] * 4
+
+    assert client.get(url) == BODY
+    assert ValidatingHandler.hits == [None, '"v1"']
+    stats = client.stats()
+    assert (stats["requests"], stats["coalesced"], stats["not_modified"]) == (2, 3, 1)
+
+    target = tmp_path / "tool.zip"
+    assert client.download(url, str(target)) == len(BODY)
+    assert target.read_bytes() == BODY
+
+    client.close()
+    server.shutdown()
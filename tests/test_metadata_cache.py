@@ -0,0 +1,25 @@
+from Nobody.models.formats import FormatRecord
+from Nobody.utils.metadata_cache import MetadataCache, canonical_video_id
+
+
+def test_canonical_video_id_matches_across_url_forms():
+    short = canonical_video_id("https://youtu.be/dQw4w9WgXcQ")
+    full = canonical_video_id("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+    assert short == full == "youtube dQw4w9WgXcQ"
+
+
+def test_cache_round_trip_ttl_and_stats(tmp_path):
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite3"), ttl_seconds=60)
+    formats = [FormatRecord("140", "m4a", "Audio-only", acodec="mp4a.40.2", abr=128, filesize=3 * 1024 * 1024)]
+
+    assert cache.get("youtube abc") is None
+    cache.put("youtube abc", "Title", "thumb.jpg", "https://youtu.be/abc", 61.0, formats)
+    entry = cache.get("youtube abc")
+
+    assert entry["title"] == "Title"
+    assert entry["formats"] == formats
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    cache.ttl_seconds = -1
+    assert cache.get("youtube abc") is None
+    cache.close()
@@ -0,0 +1,92 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QProgressBar, QPushButton, QWidget
+
+from Nobody.models.settings import AppSettings
+from Nobody.utils.sanitize import parse_url_list
+from Nobody.views import presenter as presenter_module
+from Nobody.views.presenter import VideoPresenter
+
+
+class FakeSearcher(QObject):
+    results_ready = pyqtSignal(list)
+    search_progress = pyqtSignal(int, int)
+    finished = pyqtSignal()
+    started = []
+
+    def __init__(self, url, **kwargs):
+        super().__init__()
+        self.url = url
+
+    def start(self):
+        FakeSearcher.started.append(self.url)
+
+    def cancel(self):
+        pass
+
+
+class FakeView(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.app_settings = AppSettings()
+        self.app_settings.max_concurrent_searches = 2
+        self.video_info_list = [("Existing", "https://www.youtube.com/watch?v=aaaaaaaaaaa")]
+        self.search_button = QPushButton()
+        self.progress_bar = QProgressBar()
+        self.animation_timer = QTimer()
+        self.status = ""
+
+    def set_status(self, message):
+        self.status = message
+
+    def search_finished(self):
+        pass
+
+    def enable_search_button(self):
+        pass
+
+    def check_results(self):
+        pass
+
+
+class FakeTableManager:
+    def attach_format_resolver(self, resolver):
+        pass
+
+    def attach_thumbnail_loader(self, loader):
+        pass
+
+    def add_video_rows(self, rows):
+        pass
+
+
+def test_parse_url_list_splits_and_rejects():
+    urls, rejected = parse_url_list(
+        "https://youtu.be/abc\n\nyoutube.com/watch?v=def, not-a-url\nhttps://youtu.be/abc"
+    )
+    assert urls == ["https://youtu.be/abc", "https://youtube.com/watch?v=def"]
+    assert rejected == ["not-a-url"]
+
+
+def test_batch_search_dedupes_and_limits_concurrency(qt_app, monkeypatch):
+    monkeypatch.setattr(presenter_module, "Searcher", FakeSearcher)
+    monkeypatch.setattr(VideoPresenter, "_metadata_cache", lambda self: None)
+    FakeSearcher.started = []
+    view = FakeView()
+    presenter = VideoPresenter(view, FakeTableManager())
+
+    presenter.start_search(
+        "\n".join(
+            [
+                "https://youtu.be/aaaaaaaaaaa",  # already in the table
+                "https://youtu.be/bbbbbbbbbbb",
+                "https://www.youtube.com/watch?v=bbbbbbbbbbb",  # same video
+                "https://youtu.be/ccccccccccc",
+                "https://youtu.be/ddddddddddd",
+            ]
+        )
+    )
+
+    assert FakeSearcher.started == ["https://youtu.be/bbbbbbbbbbb", "https://youtu.be/ccccccccccc"]
+    presenter._active_searches[0].finished.emit()
+    assert FakeSearcher.started[-1] == "https://youtu.be/ddddddddddd"
+    assert view.status == "Searching... 1/3 URLs"
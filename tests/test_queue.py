@@ -0,0 +1,65 @@
+import json
+import os
+
+from Nobody.models.formats import FormatRecord
+from Nobody.models.queue import DownloadQueue, DownloadStatus
+
+
+def test_journal_restores_unfinished_items(tmp_path):
+    journal = str(tmp_path / "download_queue.json")
+    record = FormatRecord("137", "mp4", "Video", width=1920, height=1080)
+    queue = DownloadQueue(journal_path=journal, journal_delay=60)
+    done = queue.add_item("Done", "https://example.com/a", "18", 0)
+    running = queue.add_item("Running", "https://example.com/b", "137", 1, format_record=record)
+    queue.add_item("Waiting", "https://example.com/c", "18", 2, priority=5)
+    queue.update_item(done, status=DownloadStatus.COMPLETED)
+    queue.update_item(running, status=DownloadStatus.DOWNLOADING, partial_path="/tmp/b.mp4.part")
+    for _ in range(100):
+        queue.update_item_progress(1, 50.0)
+    assert not os.path.exists(journal)  # changes are batched until the flush
+
+    queue.flush_journal()
+    with open(journal, encoding="utf-8") as f:
+        assert len(json.load(f)["items"]) == 2  # finished items are not journaled
+
+    restored = DownloadQueue(journal_path=journal)
+    items = restored.load_journal()
+
+    assert [item.title for item in items] == ["Waiting", "Running"]
+    resumed = items[1]
+    assert resumed.status == DownloadStatus.QUEUED
+    assert resumed.partial_path == "/tmp/b.mp4.part"
+    assert resumed.format_record == record
+    assert resumed.row_index == -1
+    assert restored.get_pending_count() == 2
+
+
+def test_corrupt_journal_is_ignored(tmp_path):
+    journal = tmp_path / "download_queue.json"
+    journal.write_text("{not json", encoding="utf-8")
+
+    queue = DownloadQueue(journal_path=str(journal))
+
+    assert queue.load_journal() == []
+    assert queue.items == []
+
+
+def test_rows_follow_removals_and_finished_items_are_skipped():
+    queue = DownloadQueue()
+    old = queue.add_item("Old", "https://example.com/a", "18", 2)
+    queue.update_item(old, status=DownloadStatus.COMPLETED)
+    live = queue.add_item("Again", "https://example.com/a", "18", 2)
+    first = queue.add_item("First", "https://example.com/b", "18", 0)
+    removed = queue.add_item("Removed", "https://example.com/c", "18", 1)
+
+    assert queue.get_item(2) is live
+    assert queue.get_item_by_id(old.item_id) is old
+
+    queue.update_item(removed, status=DownloadStatus.CANCELLED)
+    queue.remove_rows([1])
+
+    assert queue.get_item(1) is live
+    assert first.row_index == 0
+    assert removed not in queue.items
+    assert queue.prune_finished() == 1  # the old completed item
+    assert {item.title for item in queue.items} == {"Again", "First"}
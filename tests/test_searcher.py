@@ -0,0 +1,202 @@
+import random
+import time
+
+import pytest
+
+from Nobody.services import searcher as searcher_module
+from Nobody.services.extractor_session import ExtractorSession
+from Nobody.services.searcher import Searcher
+
+
+def _video(index):
+    return {
+        "title": f"Track {index}",
+        "thumbnail": "",
+        "webpage_url": f"https://example.com/watch?v={index}",
+        "formats": [
+            {"format_id": "140", "ext": "m4a", "vcodec": "none", "acodec": "mp4a", "abr": 128, "filesize": 1024},
+        ],
+    }
+
+
+@pytest.fixture
+def session(tmp_path):
+    session = ExtractorSession(cache_dir=str(tmp_path / "yt-dlp"))
+    yield session
+    session.close()
+
+
+class FakeYoutubeDL:
+    def __init__(self, params=None):
+        self.params = params or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        pass
+
+    def add_progress_hook(self, hook):
+        pass
+
+    def add_postprocessor_hook(self, hook):
+        pass
+
+    @staticmethod
+    def _handle_extraction_exceptions(func):
+        return func
+
+    def process_ie_result(self, result, download=False):
+        if result.get("_type") == "url":
+            return self.extract_info(result["url"], download, result.get("ie_key"))
+        return result
+
+    def extract_info(self, url, download=False, ie_key=None, process=True):
+        if url == "https://example.com/playlist":
+            assert not process
+            return {
+                "_type": "playlist",
+                "entries": [
+                    {"_type": "url", "url": f"https://example.com/watch?v={i}", "ie_key": "Fake"}
+                    for i in range(12)
+                ],
+            }
+        time.sleep(random.uniform(0, 0.01))
+        return _video(int(url.rsplit("=", 1)[1]))
+
+
+def test_concurrent_search_keeps_playlist_order(monkeypatch, session):
+    monkeypatch.setattr(searcher_module.yt_dlp, "YoutubeDL", FakeYoutubeDL)
+    thread = Searcher("https://example.com/playlist", max_workers=4, session=session)
+    results = []
+    thread.results_ready.connect(lambda batch: results.extend(row.title for row in batch))
+
+    thread.run()
+
+    assert results == [f"Track {i}" for i in range(12)]
+
+
+def test_results_are_delivered_in_batches(monkeypatch, session):
+    monkeypatch.setattr(searcher_module.yt_dlp, "YoutubeDL", FakeYoutubeDL)
+    monkeypatch.setattr(Searcher, "RESULT_BATCH_INTERVAL", 60)
+    monkeypatch.setattr(Searcher, "RESULT_BATCH_SIZE", 5)
+    thread = Searcher("https://example.com/playlist", max_workers=4, session=session)
+    batches = []
+    thread.results_ready.connect(batches.append)
+
+    thread.run()
+
+    # First row alone, then full batches, then the remainder on completion
+    assert [len(batch) for batch in batches] == [1, 5, 5, 1]
+    assert [row.title for batch in batches for row in batch] == [f"Track {i}" for i in range(12)]
+
+
+def test_buffered_rows_are_not_held_back_by_a_slow_entry(monkeypatch, session):
+    class SlowEntryYoutubeDL(FakeYoutubeDL):
+        def extract_info(self, url, download=False, ie_key=None, process=True):
+            if url.endswith("v=3"):
+                time.sleep(1.0)
+            return super().extract_info(url, download, ie_key, process)
+
+    monkeypatch.setattr(searcher_module.yt_dlp, "YoutubeDL", SlowEntryYoutubeDL)
+    monkeypatch.setattr(Searcher, "RESULT_BATCH_INTERVAL", 0.1)
+    thread = Searcher("https://example.com/playlist", max_workers=4, session=session)
+    started = time.monotonic()
+    arrivals = []
+    thread.results_ready.connect(
+        lambda batch: arrivals.extend((row.title, time.monotonic() - started) for row in batch)
+    )
+
+    thread.run()
+
+    # Tracks 1 and 2 resolve quickly and must not wait for track 3
+    waited = dict(arrivals)
+    assert waited["Track 2"] < 0.5 <= waited["Track 3"]
+
+
+def test_cached_entries_skip_extraction(monkeypatch, tmp_path, session):
+    from Nobody.utils.metadata_cache import MetadataCache
+
+    extracted = []
+
+    class CountingYoutubeDL(FakeYoutubeDL):
+        def extract_info(self, url, download=False, ie_key=None, process=True):
+            extracted.append(url)
+            result = super().extract_info(url, download, ie_key, process)
+            if "entries" in result:
+                for index, entry in enumerate(result["entries"]):
+                    entry["id"] = str(index)
+            else:
+                result.update(id=url.rsplit("=", 1)[1], extractor_key="Fake")
+            return result
+
+    monkeypatch.setattr(searcher_module.yt_dlp, "YoutubeDL", CountingYoutubeDL)
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite3"))
+
+    Searcher("https://example.com/playlist", max_workers=4, cache=cache, session=session).run()
+    extracted.clear()
+    results = []
+    second = Searcher("https://example.com/playlist", max_workers=4, cache=cache, session=session)
+    second.results_ready.connect(lambda batch: results.extend(row.title for row in batch))
+    second.run()
+
+    assert extracted == ["https://example.com/playlist"]
+    assert results == [f"Track {i}" for i in range(12)]
+
+
+def test_first_row_is_emitted_before_playlist_is_exhausted(monkeypatch, session):
+    listed = []
+
+    def entries():
+        for i in range(50):
+            listed.append(i)
+            yield {"_type": "url", "url": f"https://example.com/watch?v={i}", "ie_key": "Fake"}
+
+    class StreamingYoutubeDL(FakeYoutubeDL):
+        def extract_info(self, url, download=False, ie_key=None, process=True):
+            if url == "https://example.com/playlist":
+                return {"_type": "playlist", "entries": entries(), "playlist_count": 50}
+            return super().extract_info(url, download, ie_key, process)
+
+    monkeypatch.setattr(searcher_module.yt_dlp, "YoutubeDL", StreamingYoutubeDL)
+    thread = Searcher("https://example.com/playlist", max_workers=2, session=session)
+    listed_at_first_row = []
+    progress = []
+    thread.results_ready.connect(lambda batch: listed_at_first_row.extend([len(listed)] * len(batch)))
+    thread.search_progress.connect(lambda done, total: progress.append((done, total)))
+
+    thread.run()
+
+    assert listed_at_first_row[0] < 50
+    assert len(listed_at_first_row) == 50
+    assert progress[0] == (0, 50) and progress[-1] == (50, 50)
+
+
+def test_cancel_stops_between_entries_and_keeps_partial_rows(monkeypatch, session):
+    thread = None
+
+    def entries():
+        for i in range(50):
+            if i == 5:
+                thread.cancel()
+            yield {"_type": "url", "url": f"https://example.com/watch?v={i}", "ie_key": "Fake"}
+
+    class StreamingYoutubeDL(FakeYoutubeDL):
+        def extract_info(self, url, download=False, ie_key=None, process=True):
+            if url == "https://example.com/playlist":
+                return {"_type": "playlist", "entries": entries()}
+            return super().extract_info(url, download, ie_key, process)
+
+    monkeypatch.setattr(searcher_module.yt_dlp, "YoutubeDL", StreamingYoutubeDL)
+    thread = Searcher("https://example.com/playlist", max_workers=1, session=session)
+    results = []
+    thread.results_ready.connect(lambda batch: results.extend(row.title for row in batch))
+
+    thread.run()
+
+    assert 0 < len(results) < 50
+    assert results == [f"Track {i}" for i in range(len(results))]
+    assert thread.cancel_token.is_cancelled
@@ -0,0 +1,92 @@
+import http.server
+import os
+import re
+import threading
+
+import pytest
+
+from Nobody.services.segmented_download import (
+    PART_SUFFIX,
+    RangeNotSupported,
+    SegmentedDownloader,
+)
+
+PAYLOAD = bytes(range(256)) * 300 + b"tail"
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    """Serve PAYLOAD with byte ranges; drop the first ranged response halfway."""
+
+    protocol_version = "HTTP/1.1"
+    ranges = []
+    honour_ranges = True
+    dropped = False
+    lock = threading.Lock()
+
+    def do_GET(self):
+        match = re.match(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if not match or not self.honour_ranges:
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(PAYLOAD)))
+            self.end_headers()
+            self.wfile.write(PAYLOAD)
+            return
+        start, end = int(match.group(1)), int(match.group(2))
+        with self.lock:
+            self.ranges.append((start, end))
+            drop = start > 0 and not RangeHandler.dropped
+            RangeHandler.dropped = RangeHandler.dropped or drop
+        body = PAYLOAD[start:end + 1]
+        self.send_response(206)
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(PAYLOAD)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if drop:
+            self.wfile.write(body[: len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    RangeHandler.ranges = []
+    RangeHandler.dropped = False
+    RangeHandler.honour_ranges = True
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/video.mp4"
+    httpd.shutdown()
+
+
+def test_segments_are_fetched_in_parallel_and_assembled(server, tmp_path):
+    target = str(tmp_path / "video.mp4")
+    events = []
+    downloader = SegmentedDownloader(connections=4, min_segment_size=4096, chunk_size=1024, retries=2)
+
+    size = downloader.download(server, target, progress_hook=events.append)
+
+    assert size == len(PAYLOAD)
+    with open(target, "rb") as f:
+        assert f.read() == PAYLOAD
+    assert not os.path.exists(target + PART_SUFFIX)
+    # four segments plus the resumed tail of the dropped one (the probe is 0-0)
+    segment_requests = [start for start, end in RangeHandler.ranges if end > 0]
+    assert len(set(segment_requests)) == 5
+    assert RangeHandler.dropped
+    assert events[-1]["status"] == "finished"
+
+
+def test_server_without_range_support_is_rejected(server, tmp_path):
+    RangeHandler.honour_ranges = False
+    target = str(tmp_path / "video.mp4")
+
+    with pytest.raises(RangeNotSupported):
+        SegmentedDownloader(connections=4, min_segment_size=4096).download(server, target)
+
+    assert not os.path.exists(target)
+    assert not os.path.exists(target + PART_SUFFIX)
@@ -0,0 +1,25 @@
+from Nobody.utils.thumbnail_cache import ThumbnailCache, thumbnail_cache_key
+
+
+def test_least_recently_used_entries_are_evicted_over_budget(tmp_path):
+    cache = ThumbnailCache(str(tmp_path), max_bytes=250)
+    for name in ("a", "b", "c"):
+        cache.put(name, name.encode() * 100)
+    # "a" fell out when "c" pushed the total to 300 bytes
+    assert cache.get("a") is None
+    assert cache.get("b") == b"b" * 100
+
+    cache.put("d", b"d" * 100)  # evicts "c", the least recently used now
+
+    assert cache.get("c") is None
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["b.png", "d.png"]
+    assert cache.stats() == {
+        "hits": 1, "misses": 2, "hit_rate": 1 / 3, "entries": 2, "bytes": 200, "evictions": 2,
+    }
+
+    reopened = ThumbnailCache(str(tmp_path), max_bytes=250)
+    assert len(reopened) == 2 and reopened.get("d") == b"d" * 100
+
+
+def test_cache_key_depends_on_size():
+    assert thumbnail_cache_key("youtube abc", 30, 30) != thumbnail_cache_key("youtube abc", 60, 60)
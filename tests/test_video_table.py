@@ -1,5 +1,6 @@
-from PyQt5.QtWidgets import QTableWidget, QComboBox
+from PyQt5.QtWidgets import QComboBox, QTableView
 
+from Nobody.models.formats import FormatRecord
 from Nobody.models.settings import AppSettings
 from Nobody.views.video_table import VideoTableManager
 
@@ -11,37 +12,265 @@ class DummyHost:
 
 def test_filter_formats_respects_settings(qt_app):
     host = DummyHost()
-    table = QTableWidget()
+    table = QTableView()
     manager = VideoTableManager(host, table)
 
     formats = [
-        ("[Video] MP4 1920x1080 60fps - 50MB", "video/mp4", "Video", 50),
-        ("[Video-only] WEBM 1920x1080 30fps - 40MB", "video/webm", "Video-only", 40),
-        ("[Audio-only] MP3 bestaudio - 10MB", "bestaudio/best", "Audio-only", 10),
+        FormatRecord("22", "mp4", "Video", width=1920, height=1080, fps=60, filesize=50),
+        FormatRecord("18", "mp4", "Video", width=854, height=480, fps=30, filesize=20),
+        FormatRecord("248", "webm", "Video-only", width=1920, height=1080, fps=30, filesize=40),
+        FormatRecord("bestaudio/best", "mp3", "Audio-only", filesize=10, conversion="mp3"),
     ]
 
     host.app_settings.show_video_formats = False
     filtered = manager._filter_formats(formats)
-    assert all(item[2] != "Video" and item[2] != "Video-only" for item in filtered)
+    assert all(not record.is_video for record in filtered)
 
     host.app_settings.show_video_formats = True
     host.app_settings.max_quality = 480
     filtered = manager._filter_formats(formats)
-    assert all("480" in item[0] or item[2] == "Audio-only" for item in filtered)
+    assert [record.format_id for record in filtered] == ["18", "bestaudio/best"]
 
 
-def test_select_default_format_prefers_app_setting(qt_app):
+def test_default_format_prefers_app_setting(qt_app):
     host = DummyHost()
-    table = QTableWidget()
+    table = QTableView()
     manager = VideoTableManager(host, table)
 
-    combo = QComboBox()
-    combo.addItem("--- Audio-only ---")
-    combo.model().item(0).setEnabled(False)
-    combo.addItem("[Audio-only] MP3 bestaudio - 10MB", userData="bestaudio/best")
-    combo.addItem("[Audio-only] M4A bestaudio - 12MB", userData="bestaudio/m4a")
+    m4a = FormatRecord("140", "m4a", "Audio-only", filesize=12)
+    mp3 = FormatRecord("bestaudio/best", "mp3", "Audio-only", filesize=10, conversion="mp3")
 
     host.app_settings.default_format = "mp3"
-    manager._select_default_format(combo)
+    assert manager._default_format([m4a, mp3]) is mp3
 
-    assert combo.currentData() == "bestaudio/best"
+    host.app_settings.default_format = "m4a"
+    assert manager._default_format([m4a, mp3]) is m4a
+
+
+def test_placeholder_row_resolves_formats_on_demand(qt_app):
+    from PyQt5.QtCore import QObject, Qt, pyqtSignal
+
+    class FakeResolver(QObject):
+        formats_resolved = pyqtSignal(str, list)
+        resolution_failed = pyqtSignal(str, str)
+
+        def __init__(self):
+            super().__init__()
+            self.requested = []
+
+        def request(self, url):
+            self.requested.append(url)
+
+    host = DummyHost()
+    host.video_info_list = []
+    table = QTableView()
+    manager = VideoTableManager(host, table)
+    manager.initialize()
+    resolver = FakeResolver()
+    manager.attach_format_resolver(resolver)
+
+    manager.add_placeholder_row("Track", "", "https://example.com/watch?v=1")
+    manager.model.setData(manager.model.index(0, 0), Qt.Checked, Qt.CheckStateRole)
+    assert resolver.requested == ["https://example.com/watch?v=1"]
+
+    ready = []
+    assert manager.resolve_pending_formats([0], lambda: ready.append(True))
+    resolver.formats_resolved.emit(
+        "https://example.com/watch?v=1",
+        [FormatRecord("bestaudio/best", "mp3", "Audio-only", filesize=10, conversion="mp3")],
+    )
+
+    assert ready == [True]
+    assert manager.selected_format(0).format_id == "bestaudio/best"
+    assert not manager.resolve_pending_formats([0], lambda: None)
+
+
+def test_apply_filters_restores_formats_hidden_earlier(qt_app):
+    host = DummyHost()
+    host.video_info_list = []
+    table = QTableView()
+    manager = VideoTableManager(host, table)
+    manager.initialize()
+    host.app_settings.max_quality = 480
+
+    manager.update_video_list(
+        "Clip",
+        "",
+        "https://example.com/watch?v=1",
+        [
+            FormatRecord("22", "mp4", "Video", width=1280, height=720, filesize=50),
+            FormatRecord("18", "mp4", "Video", width=854, height=480, filesize=20),
+        ],
+    )
+    video = manager.model.row(0)
+    assert [r.format_id for r in manager._filter_formats(video.formats)] == ["18"]
+    assert video.selected.format_id == "18"
+
+    host.app_settings.max_quality = 0
+    manager.apply_filters()
+
+    assert [r.format_id for r in manager._filter_formats(video.formats)] == ["22", "18"]
+    assert manager.selected_format(0).format_id == "18"
+
+    host.app_settings.max_quality = 0
+    mp3 = FormatRecord("bestaudio/best", "mp3", "Audio-only", filesize=10, conversion="mp3")
+    manager.update_video_list("Song", "", "https://example.com/watch?v=2", [mp3])
+    assert "MP3 Conversion" in manager.model.index(1, 3).data()
+    host.app_settings.audio_output_policy = "original"
+    manager.apply_filters()
+    assert "original codec" in manager.model.index(1, 3).data()
+
+
+def test_add_video_rows_inserts_batch(qt_app):
+    from Nobody.models.formats import SearchResult
+
+    host = DummyHost()
+    host.video_info_list = []
+    table = QTableView()
+    manager = VideoTableManager(host, table)
+    manager.initialize()
+    audio = FormatRecord("140", "m4a", "Audio-only", filesize=10)
+
+    manager.add_video_rows(
+        [SearchResult(f"Track {i}", "", f"https://example.com/watch?v={i}", [audio]) for i in range(3)]
+        + [SearchResult("Pending", "", "https://example.com/watch?v=9", None)]
+    )
+
+    assert manager.row_count() == 4
+    assert [manager.row_title(row) for row in range(4)] == ["Track 0", "Track 1", "Track 2", "Pending"]
+    assert manager.selected_format(1) is audio
+    assert manager.model.row(3).pending
+    assert host.video_info_list[3] == ("Pending", "https://example.com/watch?v=9")
+
+
+def test_thumbnails_load_in_background_and_reach_moved_rows(qt_app):
+    import threading
+    import time
+
+    from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, Qt
+    from PyQt5.QtGui import QColor, QImage
+
+    from Nobody.models.formats import SearchResult
+    from Nobody.services.thumbnail_loader import ThumbnailLoader
+
+    image = QImage(120, 90, QImage.Format_RGB32)
+    image.fill(QColor("red"))
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    release = threading.Event()
+    fetched = []
+
+    class FakeLoader(ThumbnailLoader):
+        def _fetch(self, url):
+            fetched.append(threading.current_thread().name)
+            release.wait(5)
+            return bytes(data)
+
+    host = DummyHost()
+    host.video_info_list = []
+    table = QTableView()
+    manager = VideoTableManager(host, table)
+    manager.initialize()
+    loader = FakeLoader()
+    manager.attach_thumbnail_loader(loader)
+    audio = FormatRecord("140", "m4a", "Audio-only", filesize=10)
+
+    started = time.monotonic()
+    manager.add_video_rows([
+        SearchResult(f"Track {i}", "https://i.example.com/same.jpg", f"https://example.com/watch?v={i}", [audio])
+        for i in range(3)
+    ])
+    manager._update_visible_thumbnails()
+    assert time.monotonic() - started < 1.0  # did not wait for the fetch
+    manager.remove_rows([0])
+    release.set()
+
+    deadline = time.monotonic() + 5
+    while manager.model.index(1, 1).data(Qt.DecorationRole) is None and time.monotonic() < deadline:
+        qt_app.processEvents()
+        time.sleep(0.01)
+    loader.shutdown()
+
+    assert len(fetched) == 1 and fetched[0].startswith("thumbnail")
+    for row in range(2):
+        pixmap = manager.model.index(row, 1).data(Qt.DecorationRole)
+        assert (pixmap.width(), pixmap.height()) == (30, 22)
+
+
+def test_thumbnails_follow_the_viewport(qt_app):
+    from PyQt5.QtCore import QObject, pyqtSignal
+    from PyQt5.QtGui import QImage
+
+    from Nobody.models.formats import SearchResult
+
+    class FakeLoader(QObject):
+        thumbnail_ready = pyqtSignal(str, QImage)
+        thumbnail_failed = pyqtSignal(str, str)
+
+        def __init__(self):
+            super().__init__()
+            self.requested = []
+            self.queued = set()
+
+        def request(self, url, video_url=""):
+            if url not in self.queued:
+                self.queued.add(url)
+                self.requested.append(url)
+
+        def cancel(self, url):
+            self.queued.discard(url)
+            return True
+
+    host = DummyHost()
+    host.video_info_list = []
+    table = QTableView()
+    table.resize(600, 400)
+    manager = VideoTableManager(host, table)
+    manager.initialize()
+    loader = FakeLoader()
+    manager.attach_thumbnail_loader(loader)
+    audio = FormatRecord("140", "m4a", "Audio-only", filesize=10)
+
+    manager.add_video_rows([
+        SearchResult(f"Track {i}", f"https://i.example.com/{i}.jpg", f"https://example.com/watch?v={i}", [audio])
+        for i in range(2000)
+    ])
+    manager._update_visible_thumbnails()
+
+    first, last = manager._visible_rows()
+    assert loader.requested[0] == f"https://i.example.com/{first}.jpg"
+    assert len(loader.requested) < 200  # under 10% of the rows
+
+    table.scrollToBottom()
+    manager._update_visible_thumbnails()
+
+    assert "https://i.example.com/1999.jpg" in loader.queued
+    assert "https://i.example.com/0.jpg" not in loader.queued  # cancelled
+    assert len(loader.requested) < 200
+    assert set(manager._thumbnail_cells) == loader.queued
+
+
+def test_large_result_sets_create_no_row_widgets(qt_app):
+    import time
+
+    from Nobody.models.formats import SearchResult
+
+    host = DummyHost()
+    host.video_info_list = []
+    table = QTableView()
+    table.resize(600, 400)
+    manager = VideoTableManager(host, table)
+    manager.initialize()
+    audio = FormatRecord("140", "m4a", "Audio-only", filesize=10)
+
+    started = time.monotonic()
+    manager.add_video_rows([
+        SearchResult(f"Track {i}", "", f"https://example.com/watch?v={i}", [audio]) for i in range(10000)
+    ])
+    assert time.monotonic() - started < 2.0
+
+    assert manager.row_count() == 10000
+    assert table.indexWidget(manager.model.index(0, 3)) is None
+    assert not table.findChildren(QComboBox)